@@ -0,0 +1,396 @@
+import argparse
+import csv
+import datetime
+import importlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+import main
+import transient_data
+
+
+def best_time(function, repeats=3, setup=None):
+    # setup runs untimed before every repeat, to empty whatever caches a cold run should not find filled
+    best = float("inf")
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start_time = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def synthetic_traces(samples, series, seed=0):
+    # Random walks on the time base of a transient log, long enough to stand in for high rate recordings
+    generator = np.random.default_rng(seed)
+    times = np.linspace(-40, 160, samples)
+    traces = np.cumsum(generator.normal(size=(series, samples)), axis=1)
+    return times, traces
+
+
+# (renderer name, fast_render, downsample_method) for each drawing path being compared
+render_paths = [("seaborn", False, None),
+                ("matplotlib", True, None),
+                ("matplotlib+lttb", True, "lttb"),
+                ("matplotlib+minmax", True, "minmax")]
+
+
+def benchmark_render_paths(sample_counts=(2000, 20000, 200000), series=5, repeats=3):
+    results = []
+    for renderer, fast, downsample in render_paths:
+        main.fast_render = fast
+        main.downsample_method = downsample
+
+        for samples in sample_counts:
+            times, traces = synthetic_traces(samples, series)
+
+            def render_lines():
+                fig, ax = plt.subplots()
+                for idx in range(series):
+                    main.draw_line(x=times, y=traces[idx], label=str(idx), ax=ax, legend=False)
+                fig.savefig(io.BytesIO(), format="png")
+                plt.close(fig)
+
+            results.append({"suite": "render-paths", "benchmark": "render_lines", "renderer": renderer,
+                            "samples": samples, "series": series, "seconds": best_time(render_lines, repeats)})
+
+        if downsample is not None:
+            continue
+
+        percent_complete = [0.0, 25.0, 50.0, 75.0, 100.0]
+        for series_count in (5, 50):
+            values = np.random.default_rng(0).normal(size=(series_count, len(percent_complete)))
+
+            def render_points():
+                fig, ax = plt.subplots()
+                for idx in range(series_count):
+                    main.draw_scatter(x=percent_complete, y=values[idx], label=str(idx), ax=ax, legend=False, s=100,
+                                      marker=main.common_marker_styles[idx % len(main.common_marker_styles)])
+                fig.savefig(io.BytesIO(), format="png")
+                plt.close(fig)
+
+            results.append({"suite": "render-paths", "benchmark": "render_points", "renderer": renderer,
+                            "samples": len(percent_complete), "series": series_count,
+                            "seconds": best_time(render_points, repeats)})
+
+    main.fast_render = False
+    main.downsample_method = None
+    return results
+
+
+# Row multipliers and policy counts of the scaled copies of the Load transient data the pipeline is timed on, besides
+# the shipped data itself. Rows are added by sampling the logs at a higher rate, so every stage still finds the same
+# transient at the same times, only with more rows to go through
+row_scales = [10, 100]
+policy_counts = [50, 500]
+
+
+def log_header(path):
+    # The column names as written, which pandas renames where they repeat
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        return next(csv.reader(file))
+
+
+def write_resampled_log(source, destination, row_scale):
+    # The log at row_scale times its sample rate, interpolated between the recorded rows and written the way the logs
+    # are, byte order mark, CRLF line endings and the trailing analyzer rows included
+    data = pd.read_csv(source)
+    recorded = ~data['TimeToEvent'].isna()
+    values = data[recorded].to_numpy(dtype=float)
+
+    rows = np.arange(len(values))
+    resampled_rows = np.linspace(0, len(values) - 1, (len(values) - 1) * row_scale + 1)
+    resampled = np.column_stack([np.interp(resampled_rows, rows, column) for column in values.T])
+
+    table = pd.DataFrame(np.vstack([resampled, data[~recorded].to_numpy(dtype=float)]), columns=log_header(source))
+    with open(destination, "w", encoding="utf-8-sig", newline="\r\n") as file:
+        table.to_csv(file, index=False)
+
+
+def write_scaled_data(directory, row_scale=1, policies=None, transient_type="Load"):
+    # A data and figures directory pair under directory holding the transient's steady states, baseline runs and
+    # policy runs. Without a policy count the shipped policies are copied as they are, otherwise policies 1 to policies
+    # repeat the shipped policy runs in turn
+    data_directory = os.path.join(directory, "data")
+    os.makedirs(data_directory)
+    os.makedirs(os.path.join(directory, "figures"))
+    shutil.copy(r"./data/" + transient_type + "Comparison_SteadyStates.csv", data_directory)
+
+    def copy_run(source, name):
+        destination = os.path.join(data_directory, name)
+        if row_scale == 1:
+            shutil.copy(source, destination)
+        else:
+            write_resampled_log(source, destination, row_scale)
+        shutil.copy(transient_data.load_point_table_path(source), transient_data.load_point_table_path(destination))
+
+    for path in transient_data.transient_logs(transient_type):
+        if "_with_BaselineControl" in path:
+            copy_run(path, os.path.basename(path))
+
+    shipped_policies = transient_data.available_policies(transient_type)
+    if policies is None:
+        copies = {policy: policy for policy in shipped_policies}
+    else:
+        copies = {idx + 1: shipped_policies[idx % len(shipped_policies)] for idx in range(policies)}
+    prefix = transient_type + "Comparison_2SecondTransient_with_Policy"
+    for number, source_policy in copies.items():
+        copy_run(r"./data/" + prefix + str(source_policy) + ".csv", prefix + str(number) + ".csv")
+
+
+def benchmark_pipeline(row_scale, transient_type="Load", repeats=3):
+    # Times each stage the figures go through on the data in the working directory, the stages before it having
+    # already run, so the times add up to a cold figure build
+    main.release_memory()
+    paths = transient_data.transient_logs(transient_type)
+    policy_numbers = transient_data.available_policies(transient_type)
+    metrics = list(transient_data.load_point_columns.values())
+    fractions = np.asarray(transient_data.load_point_percent_complete) / 100
+
+    parameters = {"suite": "pipeline", "transient_type": transient_type, "row_scale": row_scale,
+                  "policies": len(policy_numbers), "runs": len(paths)}
+    results = []
+
+    def record(benchmark, function, setup=None, **extra):
+        result = dict(parameters, benchmark=benchmark, **extra)
+        try:
+            result["seconds"] = best_time(function, repeats, setup)
+        except Exception as error:
+            result["seconds"] = None
+            result["error"] = type(error).__name__ + ": " + str(error)
+        results.append(result)
+
+    def load_all():
+        for path in paths:
+            transient_data.load_csv(path)
+
+    def parse_from_csv():
+        transient_data.use_data_cache = False
+        transient_data.clear_caches()
+
+    def read_from_disk_cache():
+        transient_data.use_data_cache = True
+        transient_data.clear_caches()
+
+    record("load_csv", load_all, setup=parse_from_csv, source="csv")
+    read_from_disk_cache()
+    load_all()
+    record("load_csv", load_all, setup=read_from_disk_cache, source="disk cache")
+    record("load_csv", load_all, source="memory")
+
+    def detect_completion():
+        for path in paths:
+            transient_data.transient_completion_time(path, transient_type)
+
+    record("completion_time", detect_completion, setup=transient_data._completion_time_cache.clear)
+
+    runs = [transient_data.load_run(path, columns=['TimeToEvent'] + metrics).frame(['TimeToEvent'] + metrics)
+            for path in paths]
+    completion_times = [transient_data.transient_completion_time(path, transient_type) for path in paths]
+    record("percent_complete", lambda: transient_data.sample_percent_complete(runs, metrics, completion_times,
+                                                                                fractions))
+
+    record("resample", lambda: transient_data.resample_to_progress(runs, metrics, completion_times), grid="progress")
+
+    record("load_point_times", lambda: [transient_data.load_point_times(path, transient_type) for path in paths])
+
+    recorded = [run[~run['TimeToEvent'].isna()] for run in runs]
+    times = [run['TimeToEvent'].to_numpy(dtype=float) for run in recorded]
+    values = [run[metrics].to_numpy(dtype=float) for run in recorded]
+    centres = [transient_data.load_point_times(path, transient_type) for path in paths]
+    record("load_point_averages", lambda: [transient_data.load_point_averages(times[idx], values[idx], centres[idx])
+                                           for idx in range(len(paths))])
+
+    record("rank_policies", lambda: transient_data.rank_policies(transient_type, policy_numbers),
+           setup=transient_data._policy_evaluation_cache.clear)
+
+    def render(function, *arguments):
+        def draw():
+            function(*arguments)
+            plt.close("all")
+        return draw
+
+    main.configure_plot_style()
+    record("render", render(main.plot_transient_time_comparison_bsfc, transient_type, "darkgrid"),
+           figure="transient_time_comparison_bsfc")
+    record("render", render(main.plot_policy_comparison_egr, policy_numbers, transient_type, "darkgrid"),
+           figure="policy_comparison_egr")
+
+    transient_data.use_data_cache = True
+    main.release_memory()
+    return results
+
+
+def benchmark_scaled_pipelines(scales=row_scales, counts=policy_counts, repeats=3):
+    # The shipped data as it is, then a copy of it for each row scale and each policy count. Every one is timed from a
+    # copy, so the figures drawn and the caches written do not touch the repository
+    datasets = [(1, None)] + [(row_scale, None) for row_scale in scales] + [(1, count) for count in counts]
+    results = []
+    for row_scale, policies in datasets:
+        with tempfile.TemporaryDirectory() as directory:
+            write_scaled_data(directory, row_scale, policies)
+            with transient_data.working_directory(directory):
+                results += benchmark_pipeline(row_scale, repeats=repeats)
+    return results
+
+
+# Row counts the Pareto front is timed at, each four times the last, so O(n log n) shows as a little over four times the
+# time at each step where O(n^2) would be sixteen
+pareto_row_counts = [2500, 10000, 40000, 160000]
+
+
+def pareto_objectives(rows, layout):
+    # Random rows, or a front every row is on with the second column falling and the third rising as the first rises,
+    # which puts each row at the low end of everything kept so far
+    if layout == "random":
+        return np.random.default_rng(0).random((rows, 3))
+    steps = np.arange(rows, dtype=float)
+    return np.column_stack([steps, -steps, steps])
+
+
+def benchmark_pareto_front(row_counts=pareto_row_counts, repeats=3):
+    results = []
+    for layout in ["random", "antichain"]:
+        for rows in row_counts:
+            objectives = pareto_objectives(rows, layout)
+            results.append({"suite": "pareto", "benchmark": "pareto_front", "layout": layout, "rows": rows,
+                            "seconds": best_time(lambda: transient_data.pareto_front(objectives), repeats)})
+    return results
+
+
+# Statements timed in a fresh interpreter each, with the bare interpreter start as the reference
+import_statements = ["pass", "import transient_data", "import main"]
+
+# Listing the figures, checking them and the data-only commands must start without these, which take seconds to import
+deferred_modules = ["numpy", "pandas", "matplotlib", "seaborn"]
+
+
+def benchmark_import_times(repeats=5):
+    results = []
+    for statement in import_statements:
+        def run_import():
+            subprocess.run([sys.executable, "-c", statement], check=True)
+
+        results.append({"suite": "imports", "benchmark": "import", "statement": statement,
+                        "seconds": best_time(run_import, repeats)})
+    return results
+
+
+def modules_imported_eagerly(module="main"):
+    # The deferred modules a bare import of the module pulls in, which should be none of them
+    check = ("import sys, " + module + "; print(' '.join(sorted({name.split('.')[0] for name in sys.modules} & " +
+             repr(set(deferred_modules)) + ")))")
+    output = subprocess.run([sys.executable, "-c", check], check=True, capture_output=True, text=True).stdout
+    return output.split()
+
+
+# Everything in a result that is not a measurement, which together identify the same benchmark across runs
+measurement_fields = ["seconds", "error"]
+
+
+def result_key(result):
+    return tuple(sorted((field, value) for field, value in result.items() if field not in measurement_fields))
+
+
+def describe_result(result):
+    return " ".join(field + "=" + str(value) for field, value in result.items()
+                    if field not in measurement_fields + ["suite", "benchmark"])
+
+
+def benchmark_environment():
+    # Recorded with the results so runs on different machines or library versions are not compared unawares
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], check=True, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": commit,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "packages": {name: importlib.import_module(name).__version__
+                         for name in ["numpy", "pandas", "matplotlib", "seaborn"]}}
+
+
+def print_results(results, previous=None):
+    # With the results of an earlier run, each time is followed by how many times slower it is now
+    previous_seconds = {}
+    if previous is not None:
+        previous_seconds = {result_key(result): result["seconds"] for result in previous["results"]}
+
+    for result in results:
+        if result["seconds"] is None:
+            measurement = "    failed, " + result["error"]
+        else:
+            measurement = "{:>10.4f} s".format(result["seconds"])
+            earlier = previous_seconds.get(result_key(result))
+            if earlier:
+                measurement += "{:>8.2f}x".format(result["seconds"] / earlier)
+        print("{:<14}{:<22}{:<88}{}".format(result["suite"], result["benchmark"], describe_result(result),
+                                            measurement))
+
+
+suites = ["imports", "render-paths", "pipeline", "pareto"]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Times the figure pipeline")
+    parser.add_argument("--suite", nargs="*", choices=suites, default=suites,
+                        help="the benchmarks to run (default: all of them)")
+    parser.add_argument("--row-scales", type=int, nargs="*", default=row_scales,
+                        help="row multipliers of the scaled data the pipeline is timed on (default: 10 100)")
+    parser.add_argument("--policy-counts", type=int, nargs="*", default=policy_counts,
+                        help="policy counts of the scaled data the pipeline is timed on (default: 50 500)")
+    parser.add_argument("--repeats", type=int, default=3, help="best of this many runs of each pipeline stage")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    parser.add_argument("--compare", help="show the change from the results in this JSON file of an earlier run")
+    parser.add_argument("--import-budget", type=float, default=None,
+                        help="fail when importing main takes longer than this many seconds")
+    arguments = parser.parse_args()
+
+    previous = None
+    if arguments.compare:
+        with open(arguments.compare) as file:
+            previous = json.load(file)
+
+    results = []
+    if "imports" in arguments.suite:
+        results += benchmark_import_times()
+    if "render-paths" in arguments.suite:
+        main.configure_plot_style()
+        results += benchmark_render_paths()
+    if "pipeline" in arguments.suite:
+        results += benchmark_scaled_pipelines(arguments.row_scales, arguments.policy_counts, arguments.repeats)
+    if "pareto" in arguments.suite:
+        results += benchmark_pareto_front(repeats=arguments.repeats)
+    print_results(results, previous)
+
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump({"environment": benchmark_environment(), "results": results}, file, indent=1)
+
+    failures = []
+    for module in ["transient_data", "main"]:
+        eager = modules_imported_eagerly(module)
+        if eager:
+            failures.append("importing " + module + " also imports " + ", ".join(eager))
+    import_seconds = next((result["seconds"] for result in results if result.get("statement") == "import main"), 0.0)
+    if arguments.import_budget is not None and import_seconds > arguments.import_budget:
+        failures.append("importing main took {:.3f} s, over the {:.3f} s budget".format(import_seconds,
+                                                                                    arguments.import_budget))
+    if failures:
+        sys.exit("\n".join(failures))
@@ -1,8 +1,32 @@
-import seaborn as sns
-import matplotlib.pyplot as plt
-import pandas as pd
-import numpy as np
-from scipy import interpolate
+import argparse
+import concurrent.futures
+import fnmatch
+import gc
+import json
+import os
+import sys
+import time
+import warnings
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import stage_timing
+import transient_data
+from transient_data import (LazyModule, lbft_to_Nm, brake_specific_metrics, clear_caches, evaluate_policies,
+                            file_hash, inputs_read, load_point_metrics, load_run, logged_policies, pareto_objectives,
+                            pareto_front, policy_objectives, preload_data, rank_policies, sample_percent_complete)
+
+
+# The plotting libraries take a couple of seconds to import, so they are only imported once a figure is drawn. Listing
+# the figures or finding that they are all up to date never needs them
+sns = LazyModule("seaborn", globals(), "sns")
+mpl = LazyModule("matplotlib", globals(), "mpl")
+plt = LazyModule("matplotlib.pyplot", globals(), "plt")
+pd = LazyModule("pandas", globals(), "pd")
+np = LazyModule("numpy", globals(), "np")
 
 
 common_label_font_size = 17
@@ -12,26 +36,220 @@ common_annotation_font_size = 15
 common_marker_styles = ["s", "^", "D", "h", "o"]
 
 
-def lbft_to_Nm(val):
-    return 1.3558179483 * val
+# Draws straight through matplotlib instead of seaborn's lineplot and scatterplot, which sort, group and aggregate
+# every series before drawing it even though each of ours is already one clean trace. The style still comes from the
+# seaborn theme
+fast_render = False
 
 
-def inv_hp_to_inv_kW(val):
-    return 1.3596216173 * val
+# Long recordings can be reduced to about two points per horizontal pixel before drawing, either with
+# Largest-Triangle-Three-Buckets ("lttb") or by keeping the first, last, lowest and highest sample of each pixel column
+# ("minmax"). Both keep peaks like boost overshoot and NOx spikes, and None draws every sample
+downsample_method = None
+
+
+def downsample_min_max(x, y, buckets):
+    if len(x) <= 4 * buckets:
+        return x, y
+
+    # Samples are bucketed by pixel column rather than by count, so uneven sampling still keeps every column's extremes
+    bucket = np.minimum(((x - x[0]) / (x[-1] - x[0]) * buckets).astype(int), buckets - 1)
+    bucket_starts = np.flatnonzero(np.r_[True, np.diff(bucket) != 0])
+    bucket_sizes = np.diff(np.r_[bucket_starts, len(x)])
+
+    keep = [bucket_starts, bucket_starts + bucket_sizes - 1]
+    for extreme in (np.minimum, np.maximum):
+        candidates = np.flatnonzero(y == np.repeat(extreme.reduceat(y, bucket_starts), bucket_sizes))
+        keep.append(candidates[np.r_[True, np.diff(bucket[candidates]) != 0]])
+
+    keep = np.unique(np.concatenate(keep))
+    return x[keep], y[keep]
+
+
+def downsample_lttb(x, y, points):
+    if len(x) <= points or points < 3:
+        return x, y
+
+    # Bucket i of the interior samples spans [edges[i], edges[i + 1]). The point kept from each bucket is the one making
+    # the largest triangle with the point kept before it and the average of the next bucket
+    edges = np.floor(np.linspace(1, len(x) - 1, points - 1)).astype(int)
+    keep = np.empty(points, dtype=int)
+    keep[0] = 0
+    keep[-1] = len(x) - 1
+
+    previous = 0
+    for idx in range(points - 2):
+        start, end = edges[idx], edges[idx + 1]
+        if idx + 2 < len(edges):
+            next_x = x[end:edges[idx + 2]].mean()
+            next_y = y[end:edges[idx + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous]) -
+                       (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + np.argmax(areas)
+        keep[idx + 1] = previous
+
+    return x[keep], y[keep]
+
+
+def _downsample_for_axes(x, y, ax, x_range):
+    x_values = np.asarray(x, dtype=float)
+    y_values = np.asarray(y, dtype=float)
+
+    recorded = ~(np.isnan(x_values) | np.isnan(y_values))
+    x_values = x_values[recorded]
+    y_values = y_values[recorded]
+
+    # Only the visible part of the trace, plus one sample either side so the line still runs off the edge, needs drawing
+    if x_range is not None:
+        first = max(np.searchsorted(x_values, x_range[0]) - 1, 0)
+        last = min(np.searchsorted(x_values, x_range[-1], side="right") + 1, len(x_values))
+        x_values = x_values[first:last]
+        y_values = y_values[first:last]
+
+    # Traces that already have only a few samples per pixel are cheaper to draw as they are
+    pixel_width = max(int(ax.get_window_extent().width), 1)
+    if len(x_values) > 4 * pixel_width and downsample_method == "lttb":
+        x_values, y_values = downsample_lttb(x_values, y_values, 2 * pixel_width)
+    elif len(x_values) > 4 * pixel_width:
+        x_values, y_values = downsample_min_max(x_values, y_values, pixel_width)
+
+    return (pd.Series(x_values, name=getattr(x, "name", None)),
+            pd.Series(y_values, name=getattr(y, "name", None)))
+
+
+def _label_axes_from_series(ax, x, y):
+    # Seaborn labels empty axes with the names of the series it was given, so the fast path does too
+    if not ax.get_xlabel() and getattr(x, "name", None) is not None:
+        ax.set_xlabel(x.name)
+    if not ax.get_ylabel() and getattr(y, "name", None) is not None:
+        ax.set_ylabel(y.name)
+
+
+def draw_line(x, y, ax, x_range=None, **kwargs):
+    # x_range is the part of the trace that will be visible once the axis limits are set, which downsampling uses to
+    # spend its points where they can be seen
+    if downsample_method is not None:
+        x, y = _downsample_for_axes(x, y, ax, x_range)
+
+    if not fast_render:
+        return sns.lineplot(x=x, y=y, ax=ax, **kwargs)
+
+    legend = kwargs.pop("legend", True)
+    ax.plot(np.asarray(x, dtype=float), np.asarray(y, dtype=float), **kwargs)
+    _label_axes_from_series(ax, x, y)
+    if legend and "label" in kwargs:
+        ax.legend()
+    return ax
+
+
+def draw_scatter(x, y, ax, **kwargs):
+    if not fast_render:
+        return sns.scatterplot(x=x, y=y, ax=ax, **kwargs)
+
+    legend = kwargs.pop("legend", True)
+    sizes = kwargs.pop("s", plt.rcParams["lines.markersize"] ** 2)
+    marker = kwargs.pop("marker", "o")
+    if mpl.markers.MarkerStyle(marker).is_filled():
+        kwargs.setdefault("edgecolor", "w")
+    kwargs.setdefault("linewidth", .08 * np.sqrt(np.percentile(np.atleast_1d(sizes), 10)))
+
+    ax.scatter(np.asarray(x, dtype=float), np.asarray(y, dtype=float), s=sizes, marker=marker, **kwargs)
+    _label_axes_from_series(ax, x, y)
+    if legend and "label" in kwargs:
+        ax.legend()
+    return ax
+
+
+# Figures with the percent complete layout, kept after saving so the next figure with the same layout only has to swap
+# in its data, y limits, y label and file name. A reused figure no longer shows what it showed before, so this is only
+# switched on where nothing is displayed (the --parallel workers)
+reuse_figures = False
+_percent_complete_templates = {}
+
+
+def _update_percent_complete_template(fig, x_values, steady_state_values, series_values, y_label, custom_y_limits):
+    ax = fig.axes[0]
+    for collection, values in zip(ax.collections, [steady_state_values] + list(series_values)):
+        collection.set_offsets(np.column_stack([x_values, np.asarray(values, dtype=float)]))
+
+    # Autoscale from the new points the way adding them would have, then apply the limits and label of this figure
+    ax.ignore_existing_data_limits = True
+    for collection in ax.collections:
+        ax.update_datalim(collection.get_offsets())
+    ax.set_autoscaley_on(True)
+    ax.autoscale_view()
+    if custom_y_limits is not None:
+        ax.set_ylim(custom_y_limits)
+    ax.set_ylabel(y_label, fontsize=common_label_font_size)
+
+    # tight_layout starts from wherever the last figure left the axes, so start it from the defaults again to end up
+    # with the same layout a new figure gets
+    fig.subplots_adjust(**{name: plt.rcParams["figure.subplot." + name]
+                           for name in ["left", "right", "bottom", "top", "wspace", "hspace"]})
+    fig.tight_layout()
+
+
+def plot_percent_complete_comparison(style, percent_complete, steady_state_values, series_values, series_labels,
+                                     y_label, figure_path, custom_y_limits=None, y_scale=None, number_legend_columns=1):
+    # The layout shared by the transient time, load point and policy comparisons: one series per run against the
+    # transient percent complete, with the steady state values as diamonds
+    x_values = [100 * x for x in percent_complete]
+    key = (style, tuple(percent_complete), tuple(series_labels), y_scale, number_legend_columns)
+    fig = _percent_complete_templates.get(key) if reuse_figures else None
+
+    if fig is not None:
+        _update_percent_complete_template(fig, x_values, steady_state_values, series_values, y_label, custom_y_limits)
+    else:
+        fig, ax = plt.subplots()
+        marker_styles = common_marker_styles
+        sizes = 100
+
+        draw_scatter(x=x_values, y=steady_state_values, label="Steady State", ax=ax, legend=False, s=sizes, marker="D")
+        for idx, values in enumerate(series_values):
+            draw_scatter(x=x_values, y=values, label=series_labels[idx], ax=ax, legend=False, s=sizes,
+                         marker=marker_styles[idx % len(marker_styles)])
+
+        if custom_y_limits is not None:
+            ax.set_ylim(custom_y_limits)
+        if y_scale is not None:
+            ax.set_yscale(y_scale)
+        ax.set_ylabel(y_label, fontsize=common_label_font_size)
+        ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
+        ax.set_xticks(x_values)  # <--- set the ticks first
+        ax.set_xticklabels(x_values)
+        ax.legend(fontsize=common_legend_font_size, ncol=number_legend_columns)
+
+        plt.tight_layout()
+        sns.despine()
+        if reuse_figures:
+            _percent_complete_templates[key] = fig
+
+    fig.savefig(figure_path)
+    if reuse_figures:
+        # Out of pyplot's hands, closing every figure after a job leaves the templates alone
+        plt.close(fig)
+    plt.show(block=False)
+
+
+def load_signals(path, columns):
+    # The columns of a data file in the units the figures report in, converted once as load_run reads them, so nothing
+    # is converted again when it is drawn. The figures share the runs the analysis reads, so forked workers find them
+    # already in memory
+    return load_run(path, columns=columns).frame(columns)
 
 
 def plot_torque_curve():
-    torque_curve = pd.read_csv(r"./data/C9TorqueCurve.csv",
-                               sep=r'\s*,\s*', header=0, encoding='ascii',
-                               engine='python')
+    torque_curve = load_signals(r"./data/C9TorqueCurve.csv", columns=['Speed', 'Torque'])
     speed = torque_curve['Speed']
-    torques_ftlb = torque_curve['Torque']
-    torques_nm = 1.3558179483 * torques_ftlb
+    torques_nm = torque_curve['Torque']
 
     fig = plt.figure()
     ax = fig.add_subplot(111, aspect='equal')
 
-    torque_graph = sns.lineplot(x=speed, y=torques_nm, alpha=0, ax=ax)
+    torque_graph = draw_line(x=speed, y=torques_nm, alpha=0, ax=ax)
     torque_graph.set_xlabel("Speed (rpm)", fontsize=common_label_font_size)
     torque_graph.set_ylabel("Torque (Nm)", fontsize=common_label_font_size)
 
@@ -46,20 +264,20 @@ def plot_torque_curve():
     arrow_head_widths = 35
     length_includes_head = True
     # Speed
-    torque_graph.arrow(x=1200, y=1.3558179483 * 100, dx=0, dy=1.3558179483 * 400, width=arrow_widths,
+    torque_graph.arrow(x=1200, y=lbft_to_Nm(100), dx=0, dy=lbft_to_Nm(400), width=arrow_widths,
                        head_width=arrow_head_widths, head_length=arrow_head_lengths,
                        length_includes_head=length_includes_head)
-    torque_graph.annotate(text='Load', xy=(1000, 1.3558179483 * 280), fontsize=common_annotation_font_size)
+    torque_graph.annotate(text='Load', xy=(1000, lbft_to_Nm(280)), fontsize=common_annotation_font_size)
     # Load
-    torque_graph.arrow(x=1200, y=1.3558179483 * 500, dx=800, dy=0, width=arrow_widths, head_width=arrow_head_widths,
+    torque_graph.arrow(x=1200, y=lbft_to_Nm(500), dx=800, dy=0, width=arrow_widths, head_width=arrow_head_widths,
                        head_length=arrow_head_lengths,
                        length_includes_head=length_includes_head)
-    torque_graph.annotate(text='Accel', xy=(1450, 1.3558179483 * 520), fontsize=common_annotation_font_size)
+    torque_graph.annotate(text='Accel', xy=(1450, lbft_to_Nm(520)), fontsize=common_annotation_font_size)
     # Speed and Load
-    torque_graph.arrow(x=1200, y=1.3558179483 * 100, dx=800, dy=1.3558179483 * 400, width=arrow_widths,
+    torque_graph.arrow(x=1200, y=lbft_to_Nm(100), dx=800, dy=lbft_to_Nm(400), width=arrow_widths,
                        head_width=arrow_head_widths, head_length=arrow_head_lengths,
                        length_includes_head=length_includes_head)
-    torque_graph.annotate(text='Accel and Load', xy=(1500, 1.3558179483 * 200), fontsize=common_annotation_font_size)
+    torque_graph.annotate(text='Accel and Load', xy=(1500, lbft_to_Nm(200)), fontsize=common_annotation_font_size)
 
     plt.ylim(0, 1400)
     plt.xlim(800, 2200)
@@ -74,20 +292,18 @@ def plot_torque_curve():
 def plot_optimal_vnt_and_egr_strategies_for_speed_transient(style):
     sns.set_style(style)
 
-    speed_transient_egr_pos = pd.read_csv(r"./data/SpeedTransient_EGRPositions.csv",
-                                         sep=r'\s*,\s*', header=0, encoding='ascii',
-                                         engine='python')
-    speed_transient_vnt_pos = pd.read_csv(r"./data/SpeedTransient_VNTPositions.csv",
-                                         sep=r'\s*,\s*', header=0, encoding='ascii',
-                                         engine='python')
     best_tests = [1, 5, 8, 9, 10]
+    position_columns = ['Time'] + [str(test_number) for test_number in best_tests]
+
+    speed_transient_egr_pos = load_signals(r"./data/SpeedTransient_EGRPositions.csv", columns=position_columns)
+    speed_transient_vnt_pos = load_signals(r"./data/SpeedTransient_VNTPositions.csv", columns=position_columns)
 
     fig = plt.figure(figsize=(7.5, 9))
     ax = fig.add_subplot(211)
 
     for test_number in best_tests:
-        sns.lineplot(x=speed_transient_vnt_pos['Time'], y=speed_transient_vnt_pos[str(test_number)]/100, ax=ax,
-                     label="Test " + str(test_number))
+        draw_line(x=speed_transient_vnt_pos['Time'], y=speed_transient_vnt_pos[str(test_number)]/100, ax=ax,
+                  label="Test " + str(test_number))
 
     ax.legend(fontsize=common_legend_font_size)
     ax.set_xlabel(None)
@@ -97,7 +313,7 @@ def plot_optimal_vnt_and_egr_strategies_for_speed_transient(style):
     ax = fig.add_subplot(212)
 
     for test_number in [1, 5, 8, 9, 10]:
-        sns.lineplot(x=speed_transient_egr_pos['Time'], y=speed_transient_egr_pos[str(test_number)]/100, ax=ax)
+        draw_line(x=speed_transient_egr_pos['Time'], y=speed_transient_egr_pos[str(test_number)]/100, ax=ax)
 
     ax.set_xlabel("Time (s)", fontsize=common_label_font_size)
     ax.set_ylabel("EGR Actuator Position (%)", fontsize=common_label_font_size)
@@ -113,20 +329,18 @@ def plot_optimal_vnt_and_egr_strategies_for_speed_transient(style):
 def plot_optimal_vnt_and_egr_strategies_for_load_transient(style):
     sns.set_style(style)
 
-    transient_egr_pos = pd.read_csv(r"./data/LoadTransient_EGRPositions.csv",
-                                    sep=r'\s*,\s*', header=0, encoding='ascii',
-                                    engine='python')
-    transient_vnt_pos = pd.read_csv(r"./data/LoadTransient_VNTPositions.csv",
-                                    sep=r'\s*,\s*', header=0, encoding='ascii',
-                                    engine='python')
     best_tests = [1, 5, 8, 9, 10]
+    position_columns = ['Time'] + [str(test_number) for test_number in best_tests]
+
+    transient_egr_pos = load_signals(r"./data/LoadTransient_EGRPositions.csv", columns=position_columns)
+    transient_vnt_pos = load_signals(r"./data/LoadTransient_VNTPositions.csv", columns=position_columns)
 
     fig = plt.figure(figsize=(7.5, 9))
     ax = fig.add_subplot(211)
 
     for test_number in best_tests:
-        sns.lineplot(x=transient_vnt_pos['Time'], y=transient_vnt_pos[str(test_number)]/100, ax=ax,
-                     label="Test " + str(test_number))
+        draw_line(x=transient_vnt_pos['Time'], y=transient_vnt_pos[str(test_number)]/100, ax=ax,
+                  label="Test " + str(test_number))
 
     ax.legend(fontsize=common_legend_font_size)
     ax.set_xlabel(None)
@@ -136,7 +350,7 @@ def plot_optimal_vnt_and_egr_strategies_for_load_transient(style):
     ax = fig.add_subplot(212)
 
     for test_number in [1, 5, 8, 9, 10]:
-        sns.lineplot(x=transient_egr_pos['Time'], y=transient_egr_pos[str(test_number)]/100, ax=ax)
+        draw_line(x=transient_egr_pos['Time'], y=transient_egr_pos[str(test_number)]/100, ax=ax)
 
     ax.set_xlabel("Time (s)", fontsize=common_label_font_size)
     ax.set_ylabel("EGR Actuator Position (%)", fontsize=common_label_font_size)
@@ -151,21 +365,21 @@ def plot_optimal_vnt_and_egr_strategies_for_load_transient(style):
 
 def plot_optimal_steady_state_vnt_and_egr_set_points_for_load_transient(style):
     sns.set_style(style)
-    load_transient_steady_state = pd.read_csv(r"./data/LoadTransient_OptimalSteadyStateSetPoints.csv",
-                                              sep=r'\s*,\s*', header=0, engine='python')
+    load_transient_steady_state = load_signals(r"./data/LoadTransient_OptimalSteadyStateSetPoints.csv",
+                                               columns=['Load', 'VGT_Position', 'Boost', 'EGR_Position', 'EGR_Mass'])
 
     fig, (subplot0, subplot1) = plt.subplots(2, 1, figsize=(7.5, 9))
-    line_0 = sns.lineplot(x=1.3558179483 * load_transient_steady_state['Load'],
-                          y=load_transient_steady_state["VGT_Position"]/100, color="red",
-                          label="VNT Position", ax=subplot0, legend=False)
+    line_0 = draw_line(x=load_transient_steady_state['Load'],
+                       y=load_transient_steady_state["VGT_Position"]/100, color="red",
+                       label="VNT Position", ax=subplot0, legend=False)
     line_0.set_ylabel("VNT Actuator Position (%)", fontsize=common_label_font_size)
     line_0.set_ylim([0.0, 1.0])
     line_0.set_xlabel(None)
 
     ax_01 = line_0.twinx()
-    line_1 = sns.lineplot(x=1.3558179483 * load_transient_steady_state['Load'],
-                          y=load_transient_steady_state["Boost"], ax=ax_01,
-                          label="Boost", legend=False)
+    line_1 = draw_line(x=load_transient_steady_state['Load'],
+                       y=load_transient_steady_state["Boost"], ax=ax_01,
+                       label="Boost", legend=False)
     ax_01.set_ylabel("Boost (kPa)", fontsize=common_label_font_size)
     ax_01.set_ylim([0, 50])
 
@@ -173,17 +387,17 @@ def plot_optimal_steady_state_vnt_and_egr_set_points_for_load_transient(style):
     h1, l1 = line_1.get_legend_handles_labels()
     ax_01.legend(h0 + h1, l0 + l1, loc=0, fontsize=common_legend_font_size)
 
-    line_2 = sns.lineplot(x=1.3558179483 * load_transient_steady_state['Load'],
-                         y=load_transient_steady_state["EGR_Position"] / 100, ax=subplot1, color="red",
-                         label="EGR Position", legend=False)
+    line_2 = draw_line(x=load_transient_steady_state['Load'],
+                      y=load_transient_steady_state["EGR_Position"] / 100, ax=subplot1, color="red",
+                      label="EGR Position", legend=False)
     subplot1.set_ylabel("EGR Actuator Position (%)", fontsize=common_label_font_size)
     subplot1.set_ylim([0.0, 1.0])
     subplot1.set_xlabel("Load (Nm)", fontsize=common_label_font_size)
 
     ax_11 = subplot1.twinx()
-    line_3 = sns.lineplot(x=1.3558179483 * load_transient_steady_state['Load'],
-                 y=load_transient_steady_state["EGR_Mass"] / 100, ax=ax_11,
-                 label="EGR", legend=False)
+    line_3 = draw_line(x=load_transient_steady_state['Load'],
+              y=load_transient_steady_state["EGR_Mass"] / 100, ax=ax_11,
+              label="EGR", legend=False)
     ax_11.set_ylabel("EGR (% Mass)", fontsize=common_label_font_size)
     ax_11.set_ylim([0.0, 1.0])
 
@@ -207,24 +421,26 @@ def plot_transient_time_comparison_of_boost_and_egr(transient_type, style, custo
     x_end = custom_x_lim[-1]
 
     time_data = []
-    for time in transient_times:
-        time_data.append(pd.read_csv(r"./data/" + transient_type + "Comparison_" + str(time) +
-                                                "SecondTransient_with_BaselineControl.csv",
-                                                sep=r'\s*,\s*', header=0, engine='python'))
+    for transient_time in transient_times:
+        time_data.append(load_signals(r"./data/" + transient_type + "Comparison_" + str(transient_time) +
+                                                 "SecondTransient_with_BaselineControl.csv",
+                                      columns=['TimeToEvent', 'Boost (kPa)', 'EGR Meter']))
 
     fig, (subplot0, subplot1) = plt.subplots(2, 1, figsize=(7.5, 9))
 
     for idx in range(len(transient_times)):
-        sns.lineplot(x=time_data[idx]['TimeToEvent'], y=time_data[idx]["Boost (kPa)"],
-                     label=str(transient_times[idx]) + "s", ax=subplot0, legend=False)
+        draw_line(x=time_data[idx]['TimeToEvent'], y=time_data[idx]["Boost (kPa)"],
+                  label=str(transient_times[idx]) + "s", ax=subplot0, legend=False,
+                  x_range=[x_start, x_end])
     subplot0.set_xlabel(None)
     subplot0.set_xlim([x_start, x_end])
     subplot0.set_ylabel("Boost Pressure (kPa)", fontsize=common_label_font_size)
     subplot0.set_ylim(custom_boost_y_lim)
 
     for idx in range(len(transient_times)):
-        sns.lineplot(x=time_data[idx]['TimeToEvent'], y=time_data[idx]["EGR Meter"],
-                     label=str(transient_times[idx]) + "s", ax=subplot1, legend=False)
+        draw_line(x=time_data[idx]['TimeToEvent'], y=time_data[idx]["EGR Meter"],
+                  label=str(transient_times[idx]) + "s", ax=subplot1, legend=False,
+                  x_range=[x_start, x_end])
     subplot1.set_xlim([x_start, x_end])
     subplot1.set_ylabel("EGR Rate (% Mass)", fontsize=common_label_font_size)
     subplot1.set_ylim(custom_egr_y_lim)
@@ -247,32 +463,35 @@ def plot_transient_time_comparison_of_boost_and_egr_and_load(transient_type, sty
     x_end = custom_x_lim[-1]
 
     time_data = []
-    for time in transient_times:
-        time_data.append(pd.read_csv(r"./data/" + transient_type + "Comparison_" + str(time) +
-                                                "SecondTransient_with_BaselineControl.csv",
-                                                sep=r'\s*,\s*', header=0, engine='python'))
+    for transient_time in transient_times:
+        time_data.append(load_signals(r"./data/" + transient_type + "Comparison_" + str(transient_time) +
+                                                 "SecondTransient_with_BaselineControl.csv",
+                                      columns=['TimeToEvent', 'Boost (kPa)', 'EGR Meter', 'Torque']))
 
     fig, (subplot0, subplot1, subplot2) = plt.subplots(3, 1, figsize=(7.5, 9))
 
     for idx in range(len(transient_times)):
-        sns.lineplot(x=time_data[idx]['TimeToEvent'], y=time_data[idx]["Boost (kPa)"],
-                     label=str(transient_times[idx]) + "s", ax=subplot0, legend=False)
+        draw_line(x=time_data[idx]['TimeToEvent'], y=time_data[idx]["Boost (kPa)"],
+                  label=str(transient_times[idx]) + "s", ax=subplot0, legend=False,
+                  x_range=[x_start, x_end])
     subplot0.set_xlabel(None)
     subplot0.set_xlim([x_start, x_end])
     subplot0.set_ylabel("Boost Pressure (kPa)", fontsize=common_label_font_size)
     subplot0.set_ylim(custom_boost_y_lim)
 
     for idx in range(len(transient_times)):
-        sns.lineplot(x=time_data[idx]['TimeToEvent'], y=time_data[idx]["EGR Meter"],
-                     label=str(transient_times[idx]) + "s", ax=subplot1, legend=False)
+        draw_line(x=time_data[idx]['TimeToEvent'], y=time_data[idx]["EGR Meter"],
+                  label=str(transient_times[idx]) + "s", ax=subplot1, legend=False,
+                  x_range=[x_start, x_end])
     subplot1.set_xlabel(None)
     subplot1.set_xlim([x_start, x_end])
     subplot1.set_ylabel("EGR Rate (% Mass)", fontsize=common_label_font_size)
     subplot1.set_ylim(custom_egr_y_lim)
 
     for idx in range(len(transient_times)):
-        sns.lineplot(x=time_data[idx]['TimeToEvent'], y=lbft_to_Nm(time_data[idx]["Torque"]),
-                     label=str(transient_times[idx]) + "s", ax=subplot2, legend=False)
+        draw_line(x=time_data[idx]['TimeToEvent'], y=time_data[idx]["Torque"],
+                  label=str(transient_times[idx]) + "s", ax=subplot2, legend=False,
+                  x_range=[x_start, x_end])
     subplot2.set_xlabel("Time from Event Start")
     subplot2.set_xlim([x_start, x_end])
     subplot2.set_ylabel("Torque (Nm)", fontsize=common_label_font_size)
@@ -293,43 +512,22 @@ def plot_transient_time_comparison_boost(transient_type, style):
     transient_times = [2, 4, 6, 8, 10]
 
     time_data = []
-    for time in transient_times:
-        time_data.append(pd.read_csv(r"./data/" + transient_type + "Comparison_" + str(time) +
-                                     "SecondTransient_with_BaselineControl.csv",
-                                     sep=r'\s*,\s*', header=0, engine='python'))
+    for transient_time in transient_times:
+        time_data.append(load_signals(r"./data/" + transient_type + "Comparison_" + str(transient_time) +
+                                      "SecondTransient_with_BaselineControl.csv",
+                                      columns=['TimeToEvent', 'Boost (kPa)']))
 
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
-
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['Boost'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=steady_state_data['Boost'], label="Steady State",
-                    ax=ax, legend=False, s=sizes, marker="D")
-
-    for idx in range(len(transient_times)):
-        interp = interpolate.interp1d(time_data[idx]['TimeToEvent'], time_data[idx]['Boost (kPa)'])
-        values = []
-        for percentage in percent_complete:
-            values.append(interp(transient_times[idx] * percentage).item(0))
-
-        sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label=str(transient_times[idx]) + "s",
-                        ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-
-    ax.set_ylabel("Boost Pressure (kPa)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size)
+    samples = sample_percent_complete(time_data, ['Boost (kPa)'], transient_times, percent_complete)
 
-    plt.tight_layout()
-    sns.despine()
+    series_values = [samples[idx, 0] for idx in range(len(transient_times))]
 
-    fig.savefig("figures/" + transient_type + "_transient_time_comparison_boost.png")
-    plt.show(block=False)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['Boost'], series_values,
+                                     [str(transient_time) + "s" for transient_time in transient_times], "Boost Pressure (kPa)",
+                                     "figures/" + transient_type + "_transient_time_comparison_boost.png")
 
 def plot_load_point_comparison_boost(transient_type, style):
     sns.set_style(style)
@@ -337,43 +535,26 @@ def plot_load_point_comparison_boost(transient_type, style):
     transient_times = [2, 4, 6, 8, 10]
 
     load_point_data = []
-    for time in transient_times:
-        load_point_data.append(pd.read_csv(r"./data/" + transient_type + "Comparison_" + str(time) +
-                                           "SecondTransient_with_BaselineControl_LoadPoints.csv",
-                                           sep=r'\s*,\s*', header=0, engine='python'))
+    for transient_time in transient_times:
+        load_point_data.append(load_signals(r"./data/" + transient_type + "Comparison_" + str(transient_time) +
+                                            "SecondTransient_with_BaselineControl_LoadPoints.csv", columns=['Boost']))
 
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
-
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['Boost'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
     print("Boost")
     print("Steady State: " + str(np.mean(steady_state_data['Boost'])) + "\t")
 
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=steady_state_data['Boost'], label="Steady State",
-                    ax=ax, legend=False, s=sizes, marker="D")
-
+    series_values = []
     for idx in range(len(transient_times)):
         values = load_point_data[idx]['Boost']
         print(str(transient_times[idx]) + ": " + str(np.mean(values)) + "\t")
-        sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label=str(transient_times[idx]) + "s",
-                        ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-
-    ax.set_ylabel("Boost Pressure (kPa)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size)
-
-    plt.tight_layout()
-    sns.despine()
+        series_values.append(values)
 
-    fig.savefig("figures/" + transient_type + "_load_point_comparison_boost.png")
-    plt.show(block=False)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['Boost'], series_values,
+                                     [str(transient_time) + "s" for transient_time in transient_times], "Boost Pressure (kPa)",
+                                     "figures/" + transient_type + "_load_point_comparison_boost.png")
 
 def plot_transient_time_comparison_egr(transient_type, style,  number_legend_columns=1, custom_y_limits=None):
     sns.set_style(style)
@@ -381,45 +562,22 @@ def plot_transient_time_comparison_egr(transient_type, style,  number_legend_col
     transient_times = [2, 4, 6, 8, 10]
 
     time_data = []
-    for time in transient_times:
-        time_data.append(pd.read_csv(r"./data/" + transient_type + "Comparison_" + str(time) +
-                                     "SecondTransient_with_BaselineControl.csv",
-                                     sep=r'\s*,\s*', header=0, engine='python'))
-
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
+    for transient_time in transient_times:
+        time_data.append(load_signals(r"./data/" + transient_type + "Comparison_" + str(transient_time) +
+                                      "SecondTransient_with_BaselineControl.csv", columns=['TimeToEvent', 'EGR Meter']))
 
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['EGRMass'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=steady_state_data['EGRMass'], label="Steady State",
-                    ax=ax, legend=False, s=sizes, marker="D")
+    samples = sample_percent_complete(time_data, ['EGR Meter'], transient_times, percent_complete)
 
-    for idx in range(len(transient_times)):
-        interp = interpolate.interp1d(time_data[idx]['TimeToEvent'], time_data[idx]['EGR Meter'])
-        values = []
-        for percentage in percent_complete:
-            values.append(interp(transient_times[idx] * percentage).item(0))
+    series_values = [samples[idx, 0] for idx in range(len(transient_times))]
 
-        sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label=str(transient_times[idx]) + "s",
-                        ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-
-    if custom_y_limits is not None:
-        ax.set_ylim(custom_y_limits)
-    ax.set_ylabel("EGR Rate (% mass)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size, ncol=number_legend_columns)
-
-    plt.tight_layout()
-    sns.despine()
-
-    fig.savefig("figures/" + transient_type + "_transient_time_comparison_egr_rate.png")
-    plt.show(block=False)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['EGRMass'], series_values,
+                                     [str(transient_time) + "s" for transient_time in transient_times], "EGR Rate (% mass)",
+                                     "figures/" + transient_type + "_transient_time_comparison_egr_rate.png",
+                                     custom_y_limits=custom_y_limits, number_legend_columns=number_legend_columns)
 
 def plot_load_point_comparison_egr(transient_type, style, number_legend_columns=1, custom_y_limits=None):
     sns.set_style(style)
@@ -427,45 +585,27 @@ def plot_load_point_comparison_egr(transient_type, style, number_legend_columns=
     transient_times = [2, 4, 6, 8, 10]
 
     load_point_data = []
-    for time in transient_times:
-        load_point_data.append(pd.read_csv(r"./data/" + transient_type + "Comparison_" + str(time) +
-                                           "SecondTransient_with_BaselineControl_LoadPoints.csv",
-                                           sep=r'\s*,\s*', header=0, engine='python'))
-
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
+    for transient_time in transient_times:
+        load_point_data.append(load_signals(r"./data/" + transient_type + "Comparison_" + str(transient_time) +
+                                            "SecondTransient_with_BaselineControl_LoadPoints.csv", columns=['EGRMass']))
 
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['EGRMass'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
     print("EGRMass")
     print("Steady State: " + str(np.mean(steady_state_data['EGRMass'])) + "\t")
 
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=steady_state_data['EGRMass'], label="Steady State",
-                    ax=ax, legend=False, s=sizes, marker="D")
-
+    series_values = []
     for idx in range(len(transient_times)):
         values = load_point_data[idx]['EGRMass']
         print(str(transient_times[idx]) + ": " + str(np.mean(values)) + "\t")
-        sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label=str(transient_times[idx]) + "s",
-                        ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
+        series_values.append(values)
 
-    if custom_y_limits is not None:
-        ax.set_ylim(custom_y_limits)
-    ax.set_ylabel("EGR Rate (% mass)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size, ncol=number_legend_columns)
-
-    plt.tight_layout()
-    sns.despine()
-
-    fig.savefig("figures/" + transient_type + "_load_point_comparison_egr.png")
-    plt.show(block=False)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['EGRMass'], series_values,
+                                     [str(transient_time) + "s" for transient_time in transient_times], "EGR Rate (% mass)",
+                                     "figures/" + transient_type + "_load_point_comparison_egr.png",
+                                     custom_y_limits=custom_y_limits, number_legend_columns=number_legend_columns)
 
 def plot_transient_time_comparison_bsfc(transient_type, style, number_legend_columns=1, custom_y_limits=None):
     sns.set_style(style)
@@ -473,45 +613,22 @@ def plot_transient_time_comparison_bsfc(transient_type, style, number_legend_col
     transient_times = [2, 4, 6, 8, 10]
 
     time_data = []
-    for time in transient_times:
-        time_data.append(pd.read_csv(r"./data/" + transient_type + "Comparison_" + str(time) +
-                                     "SecondTransient_with_BaselineControl.csv",
-                                     sep=r'\s*,\s*', header=0, engine='python'))
-
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
+    for transient_time in transient_times:
+        time_data.append(load_signals(r"./data/" + transient_type + "Comparison_" + str(transient_time) +
+                                      "SecondTransient_with_BaselineControl.csv", columns=['TimeToEvent', 'BSFC']))
 
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['BSFC'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=inv_hp_to_inv_kW(steady_state_data['BSFC']), label="Steady State",
-                    ax=ax, legend=False, s=sizes, marker="D")
-
-    for idx in range(len(transient_times)):
-        interp = interpolate.interp1d(time_data[idx]['TimeToEvent'], inv_hp_to_inv_kW(time_data[idx]['BSFC']))
-        values = []
-        for percentage in percent_complete:
-            values.append(interp(transient_times[idx] * percentage + 0.1).item(0))
-
-        sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label=str(transient_times[idx]) + "s",
-                        ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-
-    if custom_y_limits is not None:
-        ax.set_ylim(custom_y_limits)
-    ax.set_ylabel("BSFC (g/kWh)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size, ncol=number_legend_columns)
+    samples = sample_percent_complete(time_data, ['BSFC'], transient_times, percent_complete, time_offsets=[0.1])
 
-    plt.tight_layout()
-    sns.despine()
+    series_values = [samples[idx, 0] for idx in range(len(transient_times))]
 
-    fig.savefig("figures/" + transient_type + "_transient_time_comparison_bsfc.png")
-    plt.show(block=False)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['BSFC'],
+                                     series_values, [str(transient_time) + "s" for transient_time in transient_times], "BSFC (g/kWh)",
+                                     "figures/" + transient_type + "_transient_time_comparison_bsfc.png",
+                                     custom_y_limits=custom_y_limits, number_legend_columns=number_legend_columns)
 
 
 def plot_load_point_comparison_bsfc(transient_type, style, number_legend_columns=1, custom_y_limits=None):
@@ -520,45 +637,27 @@ def plot_load_point_comparison_bsfc(transient_type, style, number_legend_columns
     transient_times = [2, 4, 6, 8, 10]
 
     load_point_data = []
-    for time in transient_times:
-        load_point_data.append(pd.read_csv(r"./data/" + transient_type + "Comparison_" + str(time) +
-                                           "SecondTransient_with_BaselineControl_LoadPoints.csv",
-                                           sep=r'\s*,\s*', header=0, engine='python'))
+    for transient_time in transient_times:
+        load_point_data.append(load_signals(r"./data/" + transient_type + "Comparison_" + str(transient_time) +
+                                            "SecondTransient_with_BaselineControl_LoadPoints.csv", columns=['BSFC']))
 
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
-
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['BSFC'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
     print("BSFC")
-    print("Steady State: " + str(np.mean(inv_hp_to_inv_kW(steady_state_data['BSFC']))) + "\t")
-
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=inv_hp_to_inv_kW(steady_state_data['BSFC']),
-                    label="Steady State", ax=ax, legend=False, s=sizes, marker="D")
+    print("Steady State: " + str(np.mean(steady_state_data['BSFC'])) + "\t")
 
+    series_values = []
     for idx in range(len(transient_times)):
-        values = inv_hp_to_inv_kW(load_point_data[idx]['BSFC'])
+        values = load_point_data[idx]['BSFC']
         print(str(transient_times[idx]) + ": " + str(np.mean(values)) + "\t")
-        sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label=str(transient_times[idx]) + "s",
-                        ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
+        series_values.append(values)
 
-    if custom_y_limits is not None:
-        ax.set_ylim(custom_y_limits)
-    ax.set_ylabel("BSFC (g/kWh)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size, ncol=number_legend_columns)
-
-    plt.tight_layout()
-    sns.despine()
-
-    fig.savefig("figures/" + transient_type + "_load_point_comparison_bsfc.png")
-    plt.show(block=False)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['BSFC'],
+                                     series_values, [str(transient_time) + "s" for transient_time in transient_times], "BSFC (g/kWh)",
+                                     "figures/" + transient_type + "_load_point_comparison_bsfc.png",
+                                     custom_y_limits=custom_y_limits, number_legend_columns=number_legend_columns)
 
 
 def plot_transient_time_comparison_bspm(transient_type, style, custom_y_limits=None, number_legend_columns=1):
@@ -567,45 +666,23 @@ def plot_transient_time_comparison_bspm(transient_type, style, custom_y_limits=N
     transient_times = [2, 4, 6, 8, 10]
 
     time_data = []
-    for time in transient_times:
-        time_data.append(pd.read_csv(r"./data/" + transient_type + "Comparison_" + str(time) +
-                                     "SecondTransient_with_BaselineControl.csv",
-                                     sep=r'\s*,\s*', header=0, engine='python'))
-
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
+    for transient_time in transient_times:
+        time_data.append(load_signals(r"./data/" + transient_type + "Comparison_" + str(transient_time) +
+                                      "SecondTransient_with_BaselineControl.csv", columns=['TimeToEvent', 'BSPM']))
 
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['BSPM'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=inv_hp_to_inv_kW(steady_state_data['BSPM']), label="Steady State",
-                    ax=ax, legend=False, s=sizes, marker="D")
+    samples = sample_percent_complete(time_data, ['BSPM'], transient_times, percent_complete, time_offsets=[0.1])
 
-    for idx in range(len(transient_times)):
-        interp = interpolate.interp1d(time_data[idx]['TimeToEvent'], inv_hp_to_inv_kW(time_data[idx]['BSPM']))
-        values = []
-        for percentage in percent_complete:
-            values.append(interp(transient_times[idx] * percentage + 0.1).item(0))
+    series_values = [samples[idx, 0] for idx in range(len(transient_times))]
 
-        sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label=str(transient_times[idx]) + "s",
-                        ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-    if custom_y_limits is not None:
-        ax.set_ylim(custom_y_limits)
-    ax.set_yscale("log")
-    ax.set_ylabel("BSPM (g/kWh)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size, ncol=number_legend_columns)
-
-    plt.tight_layout()
-    sns.despine()
-
-    fig.savefig("figures/" + transient_type + "_transient_time_comparison_bspm.png")
-    plt.show(block=False)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['BSPM'],
+                                     series_values, [str(transient_time) + "s" for transient_time in transient_times], "BSPM (g/kWh)",
+                                     "figures/" + transient_type + "_transient_time_comparison_bspm.png",
+                                     custom_y_limits=custom_y_limits, y_scale="log",
+                                     number_legend_columns=number_legend_columns)
 
 
 def plot_load_point_comparison_bspm(transient_type, style, number_legend_columns=1, custom_y_limits=None):
@@ -614,46 +691,28 @@ def plot_load_point_comparison_bspm(transient_type, style, number_legend_columns
     transient_times = [2, 4, 6, 8, 10]
 
     load_point_data = []
-    for time in transient_times:
-        load_point_data.append(pd.read_csv(r"./data/" + transient_type + "Comparison_" + str(time) +
-                                           "SecondTransient_with_BaselineControl_LoadPoints.csv",
-                                           sep=r'\s*,\s*', header=0, engine='python'))
-
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
+    for transient_time in transient_times:
+        load_point_data.append(load_signals(r"./data/" + transient_type + "Comparison_" + str(transient_time) +
+                                            "SecondTransient_with_BaselineControl_LoadPoints.csv", columns=['BSPM']))
 
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['BSPM'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
     print("BSPM")
-    print("Steady State: " + str(np.mean(inv_hp_to_inv_kW(steady_state_data['BSPM']))) + "\t")
-
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=inv_hp_to_inv_kW(steady_state_data['BSPM']),
-                    label="Steady State", ax=ax, legend=False, s=sizes, marker="D")
+    print("Steady State: " + str(np.mean(steady_state_data['BSPM'])) + "\t")
 
+    series_values = []
     for idx in range(len(transient_times)):
-        values = inv_hp_to_inv_kW(load_point_data[idx]['BSPM'])
+        values = load_point_data[idx]['BSPM']
         print(str(transient_times[idx]) + ": " + str(np.mean(values)) + "\t")
-        sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label=str(transient_times[idx]) + "s",
-                        ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-
-    if custom_y_limits is not None:
-        ax.set_ylim(custom_y_limits)
-    ax.set_yscale("log")
-    ax.set_ylabel("BSPM (g/kWh)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size, ncol=number_legend_columns)
-
-    plt.tight_layout()
-    sns.despine()
+        series_values.append(values)
 
-    fig.savefig("figures/" + transient_type + "_load_point_comparison_bspm.png")
-    plt.show(block=False)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['BSPM'],
+                                     series_values, [str(transient_time) + "s" for transient_time in transient_times], "BSPM (g/kWh)",
+                                     "figures/" + transient_type + "_load_point_comparison_bspm.png",
+                                     custom_y_limits=custom_y_limits, y_scale="log",
+                                     number_legend_columns=number_legend_columns)
 
 
 def plot_transient_time_comparison_bsno(transient_type, style):
@@ -662,43 +721,21 @@ def plot_transient_time_comparison_bsno(transient_type, style):
     transient_times = [2, 4, 6, 8, 10]
 
     time_data = []
-    for time in transient_times:
-        time_data.append(pd.read_csv(r"./data/" + transient_type + "Comparison_" + str(time) +
-                                     "SecondTransient_with_BaselineControl.csv",
-                                     sep=r'\s*,\s*', header=0, engine='python'))
-
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
+    for transient_time in transient_times:
+        time_data.append(load_signals(r"./data/" + transient_type + "Comparison_" + str(transient_time) +
+                                      "SecondTransient_with_BaselineControl.csv", columns=['TimeToEvent', 'BSNO']))
 
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['BSNO'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=inv_hp_to_inv_kW(steady_state_data['BSNO']), label="Steady State",
-                    ax=ax, legend=False, s=sizes, marker="D")
-
-    for idx in range(len(transient_times)):
-        interp = interpolate.interp1d(time_data[idx]['TimeToEvent'], inv_hp_to_inv_kW(time_data[idx]['BSNO']))
-        values = []
-        for percentage in percent_complete:
-            values.append(interp(transient_times[idx] * percentage + 0.1).item(0))
-
-        sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label=str(transient_times[idx]) + "s",
-                        ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-
-    ax.set_ylabel("BSNO (g/kWh)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size)
+    samples = sample_percent_complete(time_data, ['BSNO'], transient_times, percent_complete, time_offsets=[0.1])
 
-    plt.tight_layout()
-    sns.despine()
+    series_values = [samples[idx, 0] for idx in range(len(transient_times))]
 
-    fig.savefig("figures/" + transient_type + "_transient_time_comparison_bsno.png")
-    plt.show(block=False)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['BSNO'],
+                                     series_values, [str(transient_time) + "s" for transient_time in transient_times], "BSNO (g/kWh)",
+                                     "figures/" + transient_type + "_transient_time_comparison_bsno.png")
 
 
 def plot_load_point_comparison_bsno(transient_type, style, number_legend_columns=1, custom_y_limits=None):
@@ -707,94 +744,50 @@ def plot_load_point_comparison_bsno(transient_type, style, number_legend_columns
     transient_times = [2, 4, 6, 8, 10]
 
     load_point_data = []
-    for time in transient_times:
-        load_point_data.append(pd.read_csv(r"./data/" + transient_type + "Comparison_" + str(time) +
-                                           "SecondTransient_with_BaselineControl_LoadPoints.csv",
-                                           sep=r'\s*,\s*', header=0, engine='python'))
+    for transient_time in transient_times:
+        load_point_data.append(load_signals(r"./data/" + transient_type + "Comparison_" + str(transient_time) +
+                                            "SecondTransient_with_BaselineControl_LoadPoints.csv", columns=['BSNO']))
 
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
-
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['BSNO'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
     print("BSNO")
-    print("Steady State: " + str(np.mean(inv_hp_to_inv_kW(steady_state_data['BSNO']))) + "\t")
-
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=inv_hp_to_inv_kW(steady_state_data['BSNO']),
-                    label="Steady State", ax=ax, legend=False, s=sizes, marker="D")
+    print("Steady State: " + str(np.mean(steady_state_data['BSNO'])) + "\t")
 
+    series_values = []
     for idx in range(len(transient_times)):
-        values = inv_hp_to_inv_kW(load_point_data[idx]['BSNO'])
+        values = load_point_data[idx]['BSNO']
         print(str(transient_times[idx]) + ": " + str(np.mean(values)) + "\t")
-        sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label=str(transient_times[idx]) + "s",
-                        ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
+        series_values.append(values)
 
-    if custom_y_limits is not None:
-        ax.set_ylim(custom_y_limits)
-    ax.set_ylabel("BSNO (g/kWh)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size, ncol=number_legend_columns)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['BSNO'],
+                                     series_values, [str(transient_time) + "s" for transient_time in transient_times], "BSNO (g/kWh)",
+                                     "figures/" + transient_type + "_load_point_comparison_bsno.png",
+                                     custom_y_limits=custom_y_limits, number_legend_columns=number_legend_columns)
 
-    plt.tight_layout()
-    sns.despine()
 
-    fig.savefig("figures/" + transient_type + "_load_point_comparison_bsno.png")
-    plt.show(block=False)
+def policy_samples(policies, transient_type, metric):
+    # The metric at each percent complete point, one row per policy, taken from the evaluation all the policy figures
+    # share so each log is read and interpolated once however many figures and policies there are
+    return evaluate_policies(transient_type, policies)[:, load_point_metrics.index(metric)]
 
 
 def plot_policy_comparison_boost(policies, transient_type, style):
     sns.set_style(style)
 
-    transient_complete_time = []
-    policy_data = []
-    for policy in policies:
-        data_set = pd.read_csv(r"./data/" + transient_type + "Comparison_2SecondTransient_with_Policy" +
-                               str(policy) + ".csv", sep=r'\s*,\s*', header=0, engine='python')
-        policy_data.append(data_set)
-        transient_completion_idx = data_set[data_set['Torque'].gt(490)].index[0]
-        transient_complete_time.append(data_set['TimeToEvent'][transient_completion_idx])
+    samples = policy_samples(policies, transient_type, 'Boost')
 
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
-
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['Boost'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=steady_state_data['Boost'], label="Steady State",
-                    ax=ax, legend=False, s=sizes, marker="D")
-
-    for idx in range(len(policies)):
-        interp = interpolate.interp1d(policy_data[idx]['TimeToEvent'], policy_data[idx]['Boost (kPa)'])
-        values = []
-        for percentage in percent_complete:
-            values.append(interp(transient_complete_time[idx] * percentage).item(0))
-        if idx == 0:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Baseline",
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-        else:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Policy " + str(policies[idx]),
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-
-    ax.set_ylabel("Boost Pressure (kPa)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size)
-
-    plt.tight_layout()
-    sns.despine()
+    series_values = list(samples)
 
-    fig.savefig("figures/" + transient_type + "_transient_policy_comparison_boost.png")
-    plt.show(block=False)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['Boost'], series_values,
+                                     ["Baseline"] + ["Policy " + str(policy) for policy in policies[1:]],
+                                     "Boost Pressure (kPa)",
+                                     "figures/" + transient_type + "_transient_policy_comparison_boost.png")
 
 
 def plot_load_point_policy_comparison_boost(policies, transient_type, style):
@@ -802,97 +795,45 @@ def plot_load_point_policy_comparison_boost(policies, transient_type, style):
 
     policy_data = []
     for policy in policies:
-        data_set = pd.read_csv(r"./data/" + transient_type + "Comparison_2SecondTransient_with_Policy" +
-                               str(policy) + "_LoadPoints.csv", sep=r'\s*,\s*', header=0, engine='python')
+        data_set = load_signals(r"./data/" + transient_type + "Comparison_2SecondTransient_with_Policy" +
+                                str(policy) + "_LoadPoints.csv", columns=['Boost'])
         policy_data.append(data_set)
 
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
-
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['Boost'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
     print("Boost")
     print("Steady State: " + str(np.mean(steady_state_data['Boost'])) + "\t")
 
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=steady_state_data['Boost'], label="Steady State",
-                    ax=ax, legend=False, s=sizes, marker="D")
-
+    series_values = []
     for idx in range(len(policies)):
         values = policy_data[idx]['Boost']
         print("Policy " + str(policies[idx]) + ": " + str(np.mean(values)) + "\t")
-        if idx == 0:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Baseline",
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-        else:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Policy " + str(policies[idx]),
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-
-    ax.set_ylabel("Boost Pressure (kPa)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size)
+        series_values.append(values)
 
-    plt.tight_layout()
-    sns.despine()
-
-    fig.savefig("figures/" + transient_type + "_transient_load_point_policy_comparison_boost.png")
-    plt.show(block=False)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['Boost'], series_values,
+                                     ["Baseline"] + ["Policy " + str(policy) for policy in policies[1:]],
+                                     "Boost Pressure (kPa)",
+                                     "figures/" + transient_type + "_transient_load_point_policy_comparison_boost.png")
 
 
 def plot_policy_comparison_egr(policies, transient_type, style, custom_y_limits=None, number_legend_columns=1):
     sns.set_style(style)
 
-    transient_complete_time = []
-    policy_data = []
-    for policy in policies:
-        data_set = pd.read_csv(r"./data/" + transient_type + "Comparison_2SecondTransient_with_Policy" +
-                               str(policy) + ".csv", sep=r'\s*,\s*', header=0, engine='python')
-        policy_data.append(data_set)
-        transient_completion_idx = data_set[data_set['Torque'].gt(490)].index[0]
-        transient_complete_time.append(data_set['TimeToEvent'][transient_completion_idx])
+    samples = policy_samples(policies, transient_type, 'EGRMass')
 
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
-
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['EGRMass'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=steady_state_data['EGRMass'], label="Steady State",
-                    ax=ax, legend=False, s=sizes, marker="D")
+    series_values = list(samples)
 
-    for idx in range(len(policies)):
-        interp = interpolate.interp1d(policy_data[idx]['TimeToEvent'], policy_data[idx]['EGR Meter'])
-        values = []
-        for percentage in percent_complete:
-            values.append(interp(transient_complete_time[idx] * percentage).item(0))
-        if idx == 0:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Baseline",
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-        else:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Policy " + str(policies[idx]),
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-
-    if custom_y_limits is not None:
-        ax.set_ylim(custom_y_limits)
-    ax.set_ylabel("EGR Rate (% mass)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size, ncol=number_legend_columns)
-
-    plt.tight_layout()
-    sns.despine()
-
-    fig.savefig("figures/" + transient_type + "_transient_policy_comparison_egr_rate.png")
-    plt.show(block=False)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['EGRMass'], series_values,
+                                     ["Baseline"] + ["Policy " + str(policy) for policy in policies[1:]],
+                                     "EGR Rate (% mass)",
+                                     "figures/" + transient_type + "_transient_policy_comparison_egr_rate.png",
+                                     custom_y_limits=custom_y_limits, number_legend_columns=number_legend_columns)
 
 
 def plot_load_point_policy_comparison_egr(policies, transient_type, style, custom_y_limits=None, number_legend_columns=1):
@@ -900,100 +841,48 @@ def plot_load_point_policy_comparison_egr(policies, transient_type, style, custo
 
     policy_data = []
     for policy in policies:
-        data_set = pd.read_csv(r"./data/" + transient_type + "Comparison_2SecondTransient_with_Policy" +
-                               str(policy) + "_LoadPoints.csv", sep=r'\s*,\s*', header=0, engine='python')
+        data_set = load_signals(r"./data/" + transient_type + "Comparison_2SecondTransient_with_Policy" +
+                                str(policy) + "_LoadPoints.csv", columns=['EGRMass'])
         policy_data.append(data_set)
 
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
-
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['EGRMass'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
     print("EGRMass")
     print("Steady State: " + str(np.mean(steady_state_data['EGRMass'])) + "\t")
 
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=steady_state_data['EGRMass'], label="Steady State",
-                    ax=ax, legend=False, s=sizes, marker="D")
-
+    series_values = []
     for idx in range(len(policies)):
         values = policy_data[idx]['EGRMass']
         print("Policy " + str(policies[idx]) + ": " + str(np.mean(values)) + "\t")
-        if idx == 0:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Baseline",
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-        else:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Policy " + str(policies[idx]),
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-
-    if custom_y_limits is not None:
-        ax.set_ylim(custom_y_limits)
-
-    ax.set_ylabel("EGR Rate (% mass)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size, ncol=number_legend_columns)
-
-    plt.tight_layout()
-    sns.despine()
+        series_values.append(values)
 
-    fig.savefig("figures/" + transient_type + "_transient_load_point_policy_comparison_egr_rate.png")
-    plt.show(block=False)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['EGRMass'], series_values,
+                                     ["Baseline"] + ["Policy " + str(policy) for policy in policies[1:]],
+                                     "EGR Rate (% mass)",
+                                     "figures/" + transient_type +
+                                     "_transient_load_point_policy_comparison_egr_rate.png",
+                                     custom_y_limits=custom_y_limits, number_legend_columns=number_legend_columns)
 
 
 def plot_policy_comparison_bsfc(policies, transient_type, style, custom_y_limits=None, number_legend_columns=1):
     sns.set_style(style)
 
-    transient_complete_time = []
-    policy_data = []
-    for policy in policies:
-        data_set = pd.read_csv(r"./data/" + transient_type + "Comparison_2SecondTransient_with_Policy" +
-                               str(policy) + ".csv", sep=r'\s*,\s*', header=0, engine='python')
-        policy_data.append(data_set)
-        transient_completion_idx = data_set[data_set['Torque'].gt(490)].index[0]
-        transient_complete_time.append(data_set['TimeToEvent'][transient_completion_idx])
-
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
+    samples = policy_samples(policies, transient_type, 'BSFC')
 
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['BSFC'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=inv_hp_to_inv_kW(steady_state_data['BSFC']),
-                    label="Steady State", ax=ax, legend=False, s=sizes, marker="D")
+    series_values = list(samples)
 
-    for idx in range(len(policies)):
-        interp = interpolate.interp1d(policy_data[idx]['TimeToEvent'], inv_hp_to_inv_kW(policy_data[idx]['BSFC']))
-        values = []
-        for percentage in percent_complete:
-            values.append(interp(transient_complete_time[idx] * percentage).item(0))
-        if idx == 0:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Baseline",
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-        else:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Policy " + str(policies[idx]),
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-
-    if custom_y_limits is not None:
-        ax.set_ylim(custom_y_limits)
-    ax.set_ylabel("BSFC (g/kWh)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size, ncol=number_legend_columns)
-
-    plt.tight_layout()
-    sns.despine()
-
-    fig.savefig("figures/" + transient_type + "_transient_policy_comparison_bsfc.png")
-    plt.show(block=False)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['BSFC'],
+                                     series_values,
+                                     ["Baseline"] + ["Policy " + str(policy) for policy in policies[1:]],
+                                     "BSFC (g/kWh)",
+                                     "figures/" + transient_type + "_transient_policy_comparison_bsfc.png",
+                                     custom_y_limits=custom_y_limits, number_legend_columns=number_legend_columns)
 
 
 def plot_load_point_policy_comparison_bsfc(policies, transient_type, style, custom_y_limits=None,
@@ -1002,99 +891,48 @@ def plot_load_point_policy_comparison_bsfc(policies, transient_type, style, cust
 
     policy_data = []
     for policy in policies:
-        data_set = pd.read_csv(r"./data/" + transient_type + "Comparison_2SecondTransient_with_Policy" +
-                               str(policy) + "_LoadPoints.csv", sep=r'\s*,\s*', header=0, engine='python')
+        data_set = load_signals(r"./data/" + transient_type + "Comparison_2SecondTransient_with_Policy" +
+                                str(policy) + "_LoadPoints.csv", columns=['BSFC'])
         policy_data.append(data_set)
 
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
-
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['BSFC'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
     print("BSFC")
-    print("Steady State: " + str(np.mean(inv_hp_to_inv_kW(steady_state_data['BSFC']))) + "\t")
-
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=inv_hp_to_inv_kW(steady_state_data['BSFC']),
-                    label="Steady State", ax=ax, legend=False, s=sizes, marker="D")
+    print("Steady State: " + str(np.mean(steady_state_data['BSFC'])) + "\t")
 
+    series_values = []
     for idx in range(len(policies)):
-        values = inv_hp_to_inv_kW(policy_data[idx]['BSFC'])
+        values = policy_data[idx]['BSFC']
         print("Policy " + str(policies[idx]) + ": " + str(np.mean(values)) + "\t")
-        if idx == 0:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Baseline",
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-        else:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Policy " + str(policies[idx]),
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
+        series_values.append(values)
 
-    if custom_y_limits is not None:
-        ax.set_ylim(custom_y_limits)
-
-    ax.set_ylabel("BSFC (g/kWh)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size, ncol=number_legend_columns)
-
-    plt.tight_layout()
-    sns.despine()
-
-    fig.savefig("figures/" + transient_type + "_transient_load_point_policy_comparison_bsfc.png")
-    plt.show(block=False)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['BSFC'],
+                                     series_values,
+                                     ["Baseline"] + ["Policy " + str(policy) for policy in policies[1:]],
+                                     "BSFC (g/kWh)",
+                                     "figures/" + transient_type + "_transient_load_point_policy_comparison_bsfc.png",
+                                     custom_y_limits=custom_y_limits, number_legend_columns=number_legend_columns)
 
 
 def plot_policy_comparison_bspm(policies, transient_type, style):
     sns.set_style(style)
 
-    transient_complete_time = []
-    policy_data = []
-    for policy in policies:
-        data_set = pd.read_csv(r"./data/" + transient_type + "Comparison_2SecondTransient_with_Policy" +
-                               str(policy) + ".csv", sep=r'\s*,\s*', header=0, engine='python')
-        policy_data.append(data_set)
-        transient_completion_idx = data_set[data_set['Torque'].gt(490)].index[0]
-        transient_complete_time.append(data_set['TimeToEvent'][transient_completion_idx])
-
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
+    samples = policy_samples(policies, transient_type, 'BSPM')
 
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['BSPM'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=inv_hp_to_inv_kW(steady_state_data['BSPM']),
-                    label="Steady State", ax=ax, legend=False, s=sizes, marker="D")
-
-    for idx in range(len(policies)):
-        interp = interpolate.interp1d(policy_data[idx]['TimeToEvent'], inv_hp_to_inv_kW(policy_data[idx]['BSPM']))
-        values = []
-        for percentage in percent_complete:
-            values.append(interp(transient_complete_time[idx] * percentage).item(0))
-        if idx == 0:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Baseline",
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-        else:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Policy " + str(policies[idx]),
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-
-    ax.set_yscale("log")
-    ax.set_ylabel("BSPM (g/kWh)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size)
-
-    plt.tight_layout()
-    sns.despine()
+    series_values = list(samples)
 
-    fig.savefig("figures/" + transient_type + "_transient_policy_comparison_bspm.png")
-    plt.show(block=False)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['BSPM'],
+                                     series_values,
+                                     ["Baseline"] + ["Policy " + str(policy) for policy in policies[1:]],
+                                     "BSPM (g/kWh)",
+                                     "figures/" + transient_type + "_transient_policy_comparison_bspm.png",
+                                     y_scale="log")
 
 
 def plot_load_point_policy_comparison_bspm(policies, transient_type, style, custom_y_limits=None,
@@ -1103,100 +941,49 @@ def plot_load_point_policy_comparison_bspm(policies, transient_type, style, cust
 
     policy_data = []
     for policy in policies:
-        data_set = pd.read_csv(r"./data/" + transient_type + "Comparison_2SecondTransient_with_Policy" +
-                               str(policy) + "_LoadPoints.csv", sep=r'\s*,\s*', header=0, engine='python')
+        data_set = load_signals(r"./data/" + transient_type + "Comparison_2SecondTransient_with_Policy" +
+                                str(policy) + "_LoadPoints.csv", columns=['BSPM'])
         policy_data.append(data_set)
 
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
-
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['BSPM'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
     print("BSPM")
-    print("Steady State: " + str(np.mean(inv_hp_to_inv_kW(steady_state_data['BSPM']))) + "\t")
-
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=inv_hp_to_inv_kW(steady_state_data['BSPM']),
-                    label="Steady State", ax=ax, legend=False, s=sizes, marker="D")
+    print("Steady State: " + str(np.mean(steady_state_data['BSPM'])) + "\t")
 
+    series_values = []
     for idx in range(len(policies)):
-        values = inv_hp_to_inv_kW(policy_data[idx]['BSPM'])
+        values = policy_data[idx]['BSPM']
         print("Policy " + str(policies[idx]) + ": " + str(np.mean(values)) + "\t")
-        if idx == 0:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Baseline",
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-        else:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Policy " + str(policies[idx]),
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
+        series_values.append(values)
 
-    if custom_y_limits is not None:
-        ax.set_ylim(custom_y_limits)
-
-    ax.set_yscale("log")
-    ax.set_ylabel("BSPM (g/kWh)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size, ncol=number_legend_columns)
-
-    plt.tight_layout()
-    sns.despine()
-
-    fig.savefig("figures/" + transient_type + "_transient_load_point_policy_comparison_bspm.png")
-    plt.show(block=False)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['BSPM'],
+                                     series_values,
+                                     ["Baseline"] + ["Policy " + str(policy) for policy in policies[1:]],
+                                     "BSPM (g/kWh)",
+                                     "figures/" + transient_type + "_transient_load_point_policy_comparison_bspm.png",
+                                     custom_y_limits=custom_y_limits, y_scale="log",
+                                     number_legend_columns=number_legend_columns)
 
 
 def plot_policy_comparison_bsno(policies, transient_type, style):
     sns.set_style(style)
 
-    transient_complete_time = []
-    policy_data = []
-    for policy in policies:
-        data_set = pd.read_csv(r"./data/" + transient_type + "Comparison_2SecondTransient_with_Policy" +
-                               str(policy) + ".csv", sep=r'\s*,\s*', header=0, engine='python')
-        policy_data.append(data_set)
-        transient_completion_idx = data_set[data_set['Torque'].gt(490)].index[0]
-        transient_complete_time.append(data_set['TimeToEvent'][transient_completion_idx])
-
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
+    samples = policy_samples(policies, transient_type, 'BSNO')
 
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['BSNO'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=inv_hp_to_inv_kW(steady_state_data['BSNO']),
-                    label="Steady State", ax=ax, legend=False, s=sizes, marker="D")
-
-    for idx in range(len(policies)):
-        interp = interpolate.interp1d(policy_data[idx]['TimeToEvent'], inv_hp_to_inv_kW(policy_data[idx]['BSNO']))
-        values = []
-        for percentage in percent_complete:
-            values.append(interp(transient_complete_time[idx] * percentage).item(0))
-        if idx == 0:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Baseline",
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-        else:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Policy " + str(policies[idx]),
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-
-    ax.set_yscale("log")
-    ax.set_ylabel("BSNO (g/kWh)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size)
-
-    plt.tight_layout()
-    sns.despine()
+    series_values = list(samples)
 
-    fig.savefig("figures/" + transient_type + "_transient_policy_comparison_bsno.png")
-    plt.show(block=False)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['BSNO'],
+                                     series_values,
+                                     ["Baseline"] + ["Policy " + str(policy) for policy in policies[1:]],
+                                     "BSNO (g/kWh)",
+                                     "figures/" + transient_type + "_transient_policy_comparison_bsno.png",
+                                     y_scale="log")
 
 
 def plot_load_point_policy_comparison_bsno(policies, transient_type, style, custom_y_limits=None,
@@ -1205,136 +992,529 @@ def plot_load_point_policy_comparison_bsno(policies, transient_type, style, cust
 
     policy_data = []
     for policy in policies:
-        data_set = pd.read_csv(r"./data/" + transient_type + "Comparison_2SecondTransient_with_Policy" +
-                               str(policy) + "_LoadPoints.csv", sep=r'\s*,\s*', header=0, engine='python')
+        data_set = load_signals(r"./data/" + transient_type + "Comparison_2SecondTransient_with_Policy" +
+                                str(policy) + "_LoadPoints.csv", columns=['BSNO'])
         policy_data.append(data_set)
 
-    steady_state_data = pd.read_csv(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
-                                    sep=r'\s*,\s*', header=0, engine='python')
-
-    fig, ax = plt.subplots()
-    marker_styles = common_marker_styles
-    sizes = 100
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['BSNO'])
 
     percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
 
     print("BSNO")
-    print("Steady State: " + str(np.mean(inv_hp_to_inv_kW(steady_state_data['BSNO']))) + "\t")
-
-    sns.scatterplot(x=[100 * x for x in percent_complete], y=inv_hp_to_inv_kW(steady_state_data['BSNO']),
-                    label="Steady State", ax=ax, legend=False, s=sizes, marker="D")
+    print("Steady State: " + str(np.mean(steady_state_data['BSNO'])) + "\t")
 
+    series_values = []
     for idx in range(len(policies)):
-        values = inv_hp_to_inv_kW(policy_data[idx]['BSNO'])
+        values = policy_data[idx]['BSNO']
         print("Policy " + str(policies[idx]) + ": " + str(np.mean(values)) + "\t")
-        if idx == 0:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Baseline",
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
-        else:
-            sns.scatterplot(x=[100 * x for x in percent_complete], y=values, label="Policy " + str(policies[idx]),
-                            ax=ax, legend=False, s=sizes, marker=marker_styles[idx])
+        series_values.append(values)
 
-    if custom_y_limits is not None:
-        ax.set_ylim(custom_y_limits)
+    plot_percent_complete_comparison(style, percent_complete, steady_state_data['BSNO'],
+                                     series_values,
+                                     ["Baseline"] + ["Policy " + str(policy) for policy in policies[1:]],
+                                     "BSNO (g/kWh)",
+                                     "figures/" + transient_type + "_transient_load_point_policy_comparison_bsno.png",
+                                     custom_y_limits=custom_y_limits, number_legend_columns=number_legend_columns)
 
-    ax.set_ylabel("BSNO (g/kWh)", fontsize=common_label_font_size)
-    ax.set_xlabel("Transient Percent Complete (%)", fontsize=common_label_font_size)
-    ax.set_xticks([100 * x for x in percent_complete])  # <--- set the ticks first
-    ax.set_xticklabels([100 * x for x in percent_complete])
-    ax.legend(fontsize=common_legend_font_size, ncol=number_legend_columns)
 
-    plt.tight_layout()
+# How each load point metric is drawn in the policy ranking figures: its y label, the file name suffix the policy
+# comparisons use for it and its y scale
+policy_metric_figures = {"Boost": ("Boost Pressure (kPa)", "boost", None),
+                         "EGRMass": ("EGR Rate (% mass)", "egr_rate", None),
+                         "BSFC": ("BSFC (g/kWh)", "bsfc", None),
+                         "BSPM": ("BSPM (g/kWh)", "bspm", "log"),
+                         "BSNO": ("BSNO (g/kWh)", "bsno", "log")}
+
+
+def plot_policy_ranking(policies, transient_type, style, metric, top=5, rank_by=brake_specific_metrics):
+    # The policy comparison of the best few of any number of policies, ranked on how close they keep the brake specific
+    # metrics to steady state, so hundreds of policies still give a figure that can be read
+    sns.set_style(style)
+
+    best_policies = rank_policies(transient_type, policies, rank_by)[0][:top]
+    samples = policy_samples(best_policies, transient_type, metric)
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=[metric])
+    steady_state_values = steady_state_data[metric]
+
+    y_label, suffix, y_scale = policy_metric_figures[metric]
+    plot_percent_complete_comparison(style, [0.0, 0.25, 0.5, 0.75, 1.0], steady_state_values, list(samples),
+                                     ["Policy " + str(policy) for policy in best_policies], y_label,
+                                     "figures/" + transient_type + "_transient_policy_ranking_" + suffix + ".png",
+                                     y_scale=y_scale)
+
+
+def plot_policy_ranking_small_multiples(policies, transient_type, style, top=None, number_columns=6,
+                                        rank_by=brake_specific_metrics):
+    # One small panel per policy, best first, with each ranked metric as its ratio to steady state at the same load.
+    # With this many axes seaborn's per call overhead adds up, so the panels are drawn with matplotlib directly
+    sns.set_style(style)
+
+    ranked_policies, scores = rank_policies(transient_type, policies, rank_by)
+    ranked_policies, scores = ranked_policies[:top], scores[:top]
+    steady_state_data = load_signals(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=list(rank_by))
+    samples = evaluate_policies(transient_type, ranked_policies)
+    ratios = samples[:, [load_point_metrics.index(metric) for metric in rank_by]] / steady_state_data.to_numpy().T
+
+    x_values = [0.0, 25.0, 50.0, 75.0, 100.0]
+    number_rows = -(-len(ranked_policies) // number_columns)
+    fig, axes = plt.subplots(number_rows, number_columns, figsize=(2.5 * number_columns, 2.2 * number_rows + 0.6),
+                             sharex=True, sharey=True, squeeze=False)
+    for idx, ax in enumerate(axes.flat):
+        if idx >= len(ranked_policies):
+            ax.set_visible(False)
+            continue
+        ax.axhline(1.0, color="k", linestyle="--", linewidth=1)
+        for metric_idx, metric in enumerate(rank_by):
+            ax.plot(x_values, ratios[idx, metric_idx], label=metric,
+                    marker=common_marker_styles[metric_idx % len(common_marker_styles)])
+        ax.set_title("{}. Policy {} ({:.2f})".format(idx + 1, ranked_policies[idx], scores[idx]),
+                     fontsize=common_legend_font_size)
+    axes.flat[0].set_yscale("log")
+    axes.flat[0].yaxis.set_major_formatter(mpl.ticker.FormatStrFormatter("%g"))
+    axes.flat[0].yaxis.set_minor_formatter(mpl.ticker.FormatStrFormatter("%g"))
+    axes.flat[0].set_xticks(x_values)
+
+    # The shared labels are figure text rather than supxlabel and supylabel, which matplotlib 3.3 does not have, with
+    # room kept for them around the panels
+    label_width, label_height = 0.4 / fig.get_figwidth(), 0.4 / fig.get_figheight()
+    fig.text(0.5, 0.0, "Transient Percent Complete (%)", ha="center", va="bottom", fontsize=common_label_font_size)
+    fig.text(0.0, 0.5, "Ratio to Steady State", ha="left", va="center", rotation="vertical",
+             fontsize=common_label_font_size)
+    fig.legend(*axes.flat[0].get_legend_handles_labels(), loc="upper center", ncol=len(rank_by),
+               fontsize=common_legend_font_size)
+    fig.tight_layout(rect=(label_width, label_height, 1, 1 - 0.6 / fig.get_figheight()))
     sns.despine()
 
-    fig.savefig("figures/" + transient_type + "_transient_load_point_policy_comparison_bsno.png")
+    fig.savefig("figures/" + transient_type + "_transient_policy_ranking_small_multiples.png")
     plt.show(block=False)
 
 
-if __name__ == '__main__':
-    sns.set_theme()
-    sns.set_palette(sns.color_palette("muted"))
-    plt.rcParams["font.family"] = "Times New Roman"
-    sns.set_style("white")
+def plot_policy_pareto_front(policies, transient_type, style, measure="average", labelled_policies=20):
+    # Fuel against NO for every policy, coloured by PM, with the policies no other policy beats on all three drawn
+    # large. Those on the front are labelled unless there are more than labelled_policies of them. Thousands of points
+    # are one scatter call each way, drawn with matplotlib directly so the colour bar can follow PM
+    sns.set_style(style)
 
-    plot_style = "darkgrid"     # "ticks" is a good alternative
+    objectives = policy_objectives(transient_type, policies, measure)
+    # A policy that did no work over the transient has no brake specific values to draw
+    measured = ~np.isnan(objectives).any(axis=1)
+    policies, objectives = np.asarray(policies)[measured], objectives[measured]
+    on_front = pareto_front(objectives)
+    fuel_label, no_label, pm_label = pareto_objectives[measure]
 
-    # plot_torque_curve()
-    #
-    # plot_optimal_vnt_and_egr_strategies_for_speed_transient(plot_style)
-    #
-    # plot_optimal_vnt_and_egr_strategies_for_load_transient(plot_style)
-    #
-    # plot_optimal_steady_state_vnt_and_egr_set_points_for_load_transient(plot_style)
-    #
-    # plot_transient_time_comparison_of_boost_and_egr("SpeedLoad", plot_style, [-2, 12], [0, 120], [3, 35])
-    #
-    # plot_transient_time_comparison_of_boost_and_egr("Load", plot_style, [-2, 15], [0, 50], [28, 44])
-    # plot_transient_time_comparison_of_boost_and_egr_and_load("Load", plot_style, [-2, 15], [0, 50], [28, 44])
-    #
-    # plot_transient_time_comparison_boost("Load", plot_style)
-    #
-    # plot_transient_time_comparison_egr("Load", plot_style, custom_y_limits=[26, 42], number_legend_columns=2)
-    #
-    # plot_transient_time_comparison_bsfc("Load", plot_style, custom_y_limits=[160, 340], number_legend_columns=3)
-    #
-    # plot_transient_time_comparison_bspm("Load", plot_style, custom_y_limits=[0.01, 10])
-    #
-    # plot_transient_time_comparison_bsno("Load", plot_style)
-    #
-    # plot_load_point_comparison_boost("Load", plot_style)
-    #
-    # plot_load_point_comparison_egr("Load", plot_style, number_legend_columns=3, custom_y_limits=[26, 40])
-    #
-    # plot_load_point_comparison_bsfc("Load", plot_style, custom_y_limits=[180, 360], number_legend_columns=3)
-    #
-    # plot_load_point_comparison_bspm("Load", plot_style, custom_y_limits=[0.01, 50])
-    #
-    # plot_load_point_comparison_bsno("Load", plot_style)
-
-    plot_transient_time_comparison_boost("Speed", plot_style)
-
-    plot_transient_time_comparison_egr("Speed", plot_style)
-
-    plot_transient_time_comparison_bsfc("Speed", plot_style, custom_y_limits=[250, 550])
-
-    plot_transient_time_comparison_bspm("Speed", plot_style, custom_y_limits=[0.01, 10], number_legend_columns=3)
-
-    plot_transient_time_comparison_bsno("Speed", plot_style)
-
-    plot_transient_time_comparison_boost("SpeedLoad", plot_style)
-
-    plot_transient_time_comparison_egr("SpeedLoad", plot_style, custom_y_limits=[10, 34])
-
-    plot_transient_time_comparison_bsfc("SpeedLoad", plot_style, custom_y_limits=[250, 1000])
-
-    plot_transient_time_comparison_bspm("SpeedLoad", plot_style, custom_y_limits=[0.01, 100], number_legend_columns=3)
-
-    plot_transient_time_comparison_bsno("SpeedLoad", plot_style)
+    fig, ax = plt.subplots()
+    norm = mpl.colors.LogNorm(vmin=objectives[:, 2].min(), vmax=objectives[:, 2].max())
+    ax.scatter(objectives[~on_front, 0], objectives[~on_front, 1], s=15, c=objectives[~on_front, 2], norm=norm,
+               cmap="viridis", alpha=0.4, linewidth=0, label="Dominated")
+    points = ax.scatter(objectives[on_front, 0], objectives[on_front, 1], s=100, c=objectives[on_front, 2], norm=norm,
+                        cmap="viridis", marker=common_marker_styles[2], edgecolor="k", label="Pareto Front")
+    if on_front.sum() <= labelled_policies:
+        for policy, x, y in zip(policies[on_front], objectives[on_front, 0], objectives[on_front, 1]):
+            ax.annotate(str(policy), xy=(x, y), xytext=(5, 5), textcoords="offset points",
+                        fontsize=common_legend_font_size)
+
+    fig.colorbar(points, ax=ax).set_label(pm_label, fontsize=common_label_font_size)
+    ax.set_xlabel(fuel_label, fontsize=common_label_font_size)
+    ax.set_ylabel(no_label, fontsize=common_label_font_size)
+    ax.legend(fontsize=common_legend_font_size)
 
-    best_load_policies = [1, 5, 8, 9, 10]
-    plot_policy_comparison_boost(best_load_policies, "Load", plot_style)
+    plt.tight_layout()
+    sns.despine()
 
-    plot_policy_comparison_egr(best_load_policies, "Load", plot_style, custom_y_limits=[25, 42], number_legend_columns=3)
+    fig.savefig("figures/" + transient_type + "_transient_policy_pareto_front_" + measure + ".png")
+    plt.show(block=False)
 
-    plot_policy_comparison_bsfc(best_load_policies, "Load", plot_style, custom_y_limits=[100, 500], number_legend_columns=3)
 
-    plot_policy_comparison_bspm(best_load_policies, "Load", plot_style)
+def configure_plot_style():
+    sns.set_theme()
+    sns.set_palette(sns.color_palette("muted"))
+    plt.rcParams["font.family"] = "Times New Roman"
+    sns.set_style("white")
 
-    plot_policy_comparison_bsno(best_load_policies, "Load", plot_style)
 
-    plot_load_point_policy_comparison_boost(best_load_policies, "Load", plot_style)
+figures_directory = "figures/"
 
-    plot_load_point_policy_comparison_egr(best_load_policies, "Load", plot_style, custom_y_limits=[25, 42],
-                                          number_legend_columns=3)
+# What each figure in figures/ was last built from: the call that built it and the size, modification time and hash of
+# every data file it read. A figure is only built again when one of those changes
+build_manifest_path = os.path.join(figures_directory, ".build_manifest.json")
 
-    plot_load_point_policy_comparison_bsfc(best_load_policies, "Load", plot_style, custom_y_limits=[100, 550],
-                                           number_legend_columns=3)
 
-    plot_load_point_policy_comparison_bspm(best_load_policies, "Load", plot_style, custom_y_limits=[0.01, 20],
-                                           number_legend_columns=2)
+def figure_registry(plot_style, ranked_policies=None, small_multiples=None, pareto=False):
+    # Every figure the batch can build, keyed by the name of the PNG it saves in figures/, as (plot function, args,
+    # kwargs). ranked_policies and small_multiples add figures of that many of the best of every logged Load policy,
+    # and pareto adds the fuel and emissions trade-off of all of them
+    best_load_policies = [1, 5, 8, 9, 10]
+    registry = {
+        "torque_curve_and_transients": (plot_torque_curve, (), {}),
+        "speed_transient_ad_hoc_positions":
+            (plot_optimal_vnt_and_egr_strategies_for_speed_transient, (plot_style,), {}),
+        "load_transient_ad_hoc_positions":
+            (plot_optimal_vnt_and_egr_strategies_for_load_transient, (plot_style,), {}),
+        "load_transient_steady_state_optimal_positions":
+            (plot_optimal_steady_state_vnt_and_egr_set_points_for_load_transient, (plot_style,), {}),
+        "SpeedLoad_transient_time_comparison":
+            (plot_transient_time_comparison_of_boost_and_egr,
+             ("SpeedLoad", plot_style, [-2, 12], [0, 120], [3, 35]), {}),
+        "Load_transient_time_comparison":
+            (plot_transient_time_comparison_of_boost_and_egr_and_load,
+             ("Load", plot_style, [-2, 15], [0, 50], [28, 44]), {}),
+
+        "Load_transient_time_comparison_boost": (plot_transient_time_comparison_boost, ("Load", plot_style), {}),
+        "Load_transient_time_comparison_egr_rate":
+            (plot_transient_time_comparison_egr, ("Load", plot_style),
+             dict(custom_y_limits=[26, 42], number_legend_columns=2)),
+        "Load_transient_time_comparison_bsfc":
+            (plot_transient_time_comparison_bsfc, ("Load", plot_style),
+             dict(custom_y_limits=[160, 340], number_legend_columns=3)),
+        "Load_transient_time_comparison_bspm":
+            (plot_transient_time_comparison_bspm, ("Load", plot_style), dict(custom_y_limits=[0.01, 10])),
+        "Load_transient_time_comparison_bsno": (plot_transient_time_comparison_bsno, ("Load", plot_style), {}),
+
+        "Load_load_point_comparison_boost": (plot_load_point_comparison_boost, ("Load", plot_style), {}),
+        "Load_load_point_comparison_egr":
+            (plot_load_point_comparison_egr, ("Load", plot_style),
+             dict(number_legend_columns=3, custom_y_limits=[26, 40])),
+        "Load_load_point_comparison_bsfc":
+            (plot_load_point_comparison_bsfc, ("Load", plot_style),
+             dict(custom_y_limits=[180, 360], number_legend_columns=3)),
+        "Load_load_point_comparison_bspm":
+            (plot_load_point_comparison_bspm, ("Load", plot_style), dict(custom_y_limits=[0.01, 50])),
+        "Load_load_point_comparison_bsno": (plot_load_point_comparison_bsno, ("Load", plot_style), {}),
+
+        "Speed_transient_time_comparison_boost": (plot_transient_time_comparison_boost, ("Speed", plot_style), {}),
+        "Speed_transient_time_comparison_egr_rate": (plot_transient_time_comparison_egr, ("Speed", plot_style), {}),
+        "Speed_transient_time_comparison_bsfc":
+            (plot_transient_time_comparison_bsfc, ("Speed", plot_style), dict(custom_y_limits=[250, 550])),
+        "Speed_transient_time_comparison_bspm":
+            (plot_transient_time_comparison_bspm, ("Speed", plot_style),
+             dict(custom_y_limits=[0.01, 10], number_legend_columns=3)),
+        "Speed_transient_time_comparison_bsno": (plot_transient_time_comparison_bsno, ("Speed", plot_style), {}),
+
+        "SpeedLoad_transient_time_comparison_boost":
+            (plot_transient_time_comparison_boost, ("SpeedLoad", plot_style), {}),
+        "SpeedLoad_transient_time_comparison_egr_rate":
+            (plot_transient_time_comparison_egr, ("SpeedLoad", plot_style), dict(custom_y_limits=[10, 34])),
+        "SpeedLoad_transient_time_comparison_bsfc":
+            (plot_transient_time_comparison_bsfc, ("SpeedLoad", plot_style), dict(custom_y_limits=[250, 1000])),
+        "SpeedLoad_transient_time_comparison_bspm":
+            (plot_transient_time_comparison_bspm, ("SpeedLoad", plot_style),
+             dict(custom_y_limits=[0.01, 100], number_legend_columns=3)),
+        "SpeedLoad_transient_time_comparison_bsno":
+            (plot_transient_time_comparison_bsno, ("SpeedLoad", plot_style), {}),
+
+        "Load_transient_policy_comparison_boost":
+            (plot_policy_comparison_boost, (best_load_policies, "Load", plot_style), {}),
+        "Load_transient_policy_comparison_egr_rate":
+            (plot_policy_comparison_egr, (best_load_policies, "Load", plot_style),
+             dict(custom_y_limits=[25, 42], number_legend_columns=3)),
+        "Load_transient_policy_comparison_bsfc":
+            (plot_policy_comparison_bsfc, (best_load_policies, "Load", plot_style),
+             dict(custom_y_limits=[100, 500], number_legend_columns=3)),
+        "Load_transient_policy_comparison_bspm":
+            (plot_policy_comparison_bspm, (best_load_policies, "Load", plot_style), {}),
+        "Load_transient_policy_comparison_bsno":
+            (plot_policy_comparison_bsno, (best_load_policies, "Load", plot_style), {}),
+
+        "Load_transient_load_point_policy_comparison_boost":
+            (plot_load_point_policy_comparison_boost, (best_load_policies, "Load", plot_style), {}),
+        "Load_transient_load_point_policy_comparison_egr_rate":
+            (plot_load_point_policy_comparison_egr, (best_load_policies, "Load", plot_style),
+             dict(custom_y_limits=[25, 42], number_legend_columns=3)),
+        "Load_transient_load_point_policy_comparison_bsfc":
+            (plot_load_point_policy_comparison_bsfc, (best_load_policies, "Load", plot_style),
+             dict(custom_y_limits=[100, 550], number_legend_columns=3)),
+        "Load_transient_load_point_policy_comparison_bspm":
+            (plot_load_point_policy_comparison_bspm, (best_load_policies, "Load", plot_style),
+             dict(custom_y_limits=[0.01, 20], number_legend_columns=2)),
+        "Load_transient_load_point_policy_comparison_bsno":
+            (plot_load_point_policy_comparison_bsno, (best_load_policies, "Load", plot_style), {}),
+    }
+
+    # The policies are part of the arguments, so a new policy log makes these figures out of date
+    if ranked_policies:
+        for metric, (_, suffix, _) in policy_metric_figures.items():
+            registry["Load_transient_policy_ranking_" + suffix] = \
+                (plot_policy_ranking, (logged_policies("Load"), "Load", plot_style, metric), dict(top=ranked_policies))
+    if small_multiples:
+        registry["Load_transient_policy_ranking_small_multiples"] = \
+            (plot_policy_ranking_small_multiples, (logged_policies("Load"), "Load", plot_style),
+             dict(top=small_multiples))
+    if pareto:
+        for measure in pareto_objectives:
+            registry["Load_transient_policy_pareto_front_" + measure] = \
+                (plot_policy_pareto_front, (logged_policies("Load"), "Load", plot_style), dict(measure=measure))
+    return registry
+
+
+def select_figures(registry, patterns=None):
+    if not patterns:
+        return dict(registry)
+    return {name: job for name, job in registry.items()
+            if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)}
+
+
+def describe_figure_job(job):
+    function, args, kwargs = job
+    parameters = [repr(arg) for arg in args] + [key + "=" + repr(value) for key, value in kwargs.items()]
+    return function.__name__ + "(" + ", ".join(parameters) + ")"
+
+
+def render_figure(job, name=None):
+    function, args, kwargs = job
+    inputs_read.clear()
+
+    start_time = time.perf_counter()
+    with stage_timing.Span(name or function.__name__, "figure"):
+        function(*args, **kwargs)
+    return time.perf_counter() - start_time, sorted(inputs_read)
+
+
+def enable_stage_timing():
+    # Wraps the stages a slow build could be spending its time in with timers. They are left alone unless timing is
+    # asked for, so an ordinary build runs them as they are. The ones main calls directly are wrapped here as well as
+    # in transient_data, since it holds its own references to them
+    if stage_timing.enabled:
+        return
+    stage_timing.enable()
+
+    this_module = sys.modules[__name__]
+    stage_timing.instrument(transient_data, "transient_completion_time", "completion time")
+    for owner in [transient_data, this_module]:
+        stage_timing.instrument(owner, "sample_percent_complete", "interpolation")
+        stage_timing.instrument(owner, "evaluate_policies", "policy evaluation")
+    stage_timing.instrument(transient_data, "_read_csv", "read_csv")
+    stage_timing.instrument(transient_data, "_load_cached_columns", "read cache")
+    stage_timing.instrument(transient_data, "_write_cached_columns", "write cache")
+
+    draw_stage = "matplotlib" if fast_render else "seaborn"
+    stage_timing.instrument(this_module, "draw_line", draw_stage)
+    stage_timing.instrument(this_module, "draw_scatter", draw_stage)
+    stage_timing.instrument(plt.Figure, "tight_layout", "tight_layout")
+    stage_timing.instrument(plt.Figure, "savefig", "savefig")
+
+
+def load_build_manifest():
+    try:
+        with open(build_manifest_path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_build_manifest(manifest):
+    with open(build_manifest_path + ".tmp", "w") as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+    os.replace(build_manifest_path + ".tmp", build_manifest_path)
+
+
+def render_settings():
+    # Module level switches that change what a figure looks like, so flipping one rebuilds the figures
+    return {"fast_render": fast_render, "downsample_method": downsample_method}
+
+
+def record_figure_build(manifest, name, job, inputs):
+    manifest[name] = {"parameters": describe_figure_job(job),
+                      "settings": render_settings(),
+                      "inputs": {path: [os.path.getsize(path), os.path.getmtime(path), file_hash(path)]
+                                 for path in inputs}}
+
+
+def figure_is_current(manifest, name, job):
+    record = manifest.get(name)
+    if record is None or record["parameters"] != describe_figure_job(job):
+        return False
+    if record.get("settings") != render_settings():
+        return False
+    if not os.path.exists(os.path.join(figures_directory, name + ".png")):
+        return False
+
+    for path, (size, modified_time, digest) in record["inputs"].items():
+        if not os.path.exists(path) or os.path.getsize(path) != size:
+            return False
+        # Same as make, an input that still has the modification time it was built from has not changed. One that was
+        # touched is only out of date if its contents changed
+        if os.path.getmtime(path) != modified_time and file_hash(path) != digest:
+            return False
+    return True
+
+
+def report_figure_time(name, seconds, peak_memory=None):
+    line = "{:<55}{:>8.2f} s".format(name, seconds)
+    if peak_memory is not None:
+        line += "{:>9.0f} MB".format(peak_memory / 2 ** 20)
+    print(line)
+
+
+# Resident memory in MB that headless rendering tries to stay under. When a figure leaves the process above it, the
+# parsed data and the reusable layouts are dropped, to be read and built again when they are needed. None never drops
+# them
+memory_ceiling = None
+
+
+def resident_memory():
+    # The current and peak resident set size in bytes. Linux lets the peak be reset between figures; elsewhere it is
+    # the peak since the process started and also stands in for the current size
+    try:
+        with open("/proc/self/status") as file:
+            fields = dict(line.split(":", 1) for line in file if ":" in line)
+        return int(fields["VmRSS"].split()[0]) * 1024, int(fields["VmHWM"].split()[0]) * 1024
+    except (OSError, KeyError, ValueError):
+        pass
+    if resource is None:
+        return None, None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    return peak, peak
+
+
+def reset_peak_memory():
+    try:
+        with open("/proc/self/clear_refs", "w") as file:
+            file.write("5")
+    except OSError:
+        pass
+
+
+def release_memory():
+    plt.close("all")
+    _percent_complete_templates.clear()
+    clear_caches()
+    gc.collect()
+
+
+def render_figure_headless(job, name=None):
+    # Renders a figure, closes it once it is saved and reports the peak resident memory while it was being rendered
+    reset_peak_memory()
+    seconds, inputs = render_figure(job, name)
+    plt.close("all")
+
+    current_memory, peak_memory = resident_memory()
+    if memory_ceiling is not None and current_memory is not None and current_memory > memory_ceiling * 2 ** 20:
+        release_memory()
+    return seconds, inputs, peak_memory
 
-    plot_load_point_policy_comparison_bsno(best_load_policies, "Load", plot_style)
 
-    plt.show(block=True)
+def _initialize_headless_rendering(settings, ceiling, timing=False):
+    global reuse_figures, memory_ceiling
+    globals().update(settings)
+    reuse_figures = True
+    memory_ceiling = ceiling
+    plt.switch_backend("Agg")
+    warnings.filterwarnings("ignore", message=".*(non-GUI|non-interactive).*")
+    configure_plot_style()
+
+    if timing:
+        enable_stage_timing()
+        # Forked workers start with a copy of the parent's events, which the parent already has
+        stage_timing.take_events()
+
+
+def _render_job(name, job):
+    return (name,) + render_figure_headless(job, name) + (stage_timing.take_events(),)
+
+
+def render_figures_in_parallel(figures, manifest, workers=None):
+    preload_data()
+    # Importing the plotting libraries here rather than in each worker lets forked workers inherit them
+    plt.switch_backend("Agg")
+
+    workers = min(workers or os.cpu_count() or 1, len(figures))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_initialize_headless_rendering,
+                                                initargs=(render_settings(), memory_ceiling,
+                                                          stage_timing.enabled)) as executor:
+        for name, seconds, inputs, peak_memory, events in executor.map(_render_job, figures.keys(),
+                                                                        figures.values()):
+            stage_timing.add_events(events)
+            report_figure_time(name, seconds, peak_memory)
+            record_figure_build(manifest, name, figures[name], inputs)
+            save_build_manifest(manifest)
+
 
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Builds the dissertation figures into figures/")
+    parser.add_argument("--list", action="store_true",
+                        help="list the registered figures and their parameters instead of building them")
+    parser.add_argument("--only", action="append", metavar="PATTERN",
+                        help="only build figures whose name matches this name or glob, e.g. 'Load_*bspm*' (repeatable)")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild figures even when their inputs and parameters have not changed")
+    parser.add_argument("--fast", action="store_true",
+                        help="draw lines and points directly with matplotlib instead of through seaborn")
+    parser.add_argument("--downsample", choices=["lttb", "minmax"], default=None,
+                        help="reduce long traces to about two points per pixel before drawing them")
+    parser.add_argument("--parallel", action="store_true",
+                        help="render headless on a process pool instead of opening the plot windows")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes for --parallel (defaults to the number of cores)")
+    parser.add_argument("--batch", action="store_true",
+                        help="render headless one figure at a time, closing each figure once it is saved")
+    parser.add_argument("--memory-ceiling", type=float, default=None, metavar="MB",
+                        help="with --batch or --parallel, drop cached data whenever a figure leaves a process above "
+                             "this much resident memory")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="time the stages of every figure, write them to this Chrome trace JSON file and print "
+                             "the slowest ones at the end")
+    parser.add_argument("--trace-top", type=int, default=10, metavar="N",
+                        help="number of the slowest stages and figure stages to print with --trace (default: 10)")
+    parser.add_argument("--rank-policies", type=int, default=None, metavar="K",
+                        help="also build a policy comparison of each metric for the K best of every logged Load "
+                             "policy, ranked on their brake specific fuel and emissions relative to steady state")
+    parser.add_argument("--small-multiples", type=int, default=None, metavar="N",
+                        help="also build one figure of small panels for the N best logged Load policies")
+    parser.add_argument("--pareto", action="store_true",
+                        help="also build the fuel, NO and PM trade-off of every logged Load policy, brake specific and "
+                             "accumulated over the transient, with the Pareto front picked out")
+    arguments = parser.parse_args()
 
+    plot_style = "darkgrid"     # "ticks" is a good alternative
+    fast_render = arguments.fast
+    downsample_method = arguments.downsample
+    memory_ceiling = arguments.memory_ceiling
+
+    figures = select_figures(figure_registry(plot_style, arguments.rank_policies, arguments.small_multiples,
+                                             arguments.pareto), arguments.only)
+    if not figures:
+        parser.error("no registered figure matches " + ", ".join(arguments.only))
+
+    if arguments.list:
+        for name, job in figures.items():
+            print(name)
+            print("    " + describe_figure_job(job))
+        sys.exit()
+
+    manifest = load_build_manifest()
+    if not arguments.force:
+        for name, job in list(figures.items()):
+            if figure_is_current(manifest, name, job):
+                print("{:<55}{:>10}".format(name, "up to date"))
+                del figures[name]
+
+    if arguments.trace:
+        enable_stage_timing()
+
+    batch_start_time = time.perf_counter()
+    if figures and arguments.parallel:
+        render_figures_in_parallel(figures, manifest, arguments.workers)
+    elif figures and arguments.batch:
+        _initialize_headless_rendering(render_settings(), memory_ceiling)
+
+        for name, job in figures.items():
+            seconds, inputs, peak_memory = render_figure_headless(job, name)
+            report_figure_time(name, seconds, peak_memory)
+            record_figure_build(manifest, name, job, inputs)
+            save_build_manifest(manifest)
+    elif figures:
+        configure_plot_style()
+
+        for name, job in figures.items():
+            seconds, inputs = render_figure(job, name)
+            report_figure_time(name, seconds)
+            record_figure_build(manifest, name, job, inputs)
+            save_build_manifest(manifest)
+    report_figure_time("Total", time.perf_counter() - batch_start_time)
+
+    if arguments.trace:
+        stage_timing.write_trace(arguments.trace)
+        stage_timing.print_summary(arguments.trace_top)
+
+    if figures and not (arguments.parallel or arguments.batch):
+        plt.show(block=True)
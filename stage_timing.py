@@ -0,0 +1,124 @@
+import functools
+import json
+import os
+import time
+
+
+# Off until enable() is called. The stages are only wrapped with timers when it is turned on, so with it off they run
+# as they are and the one remaining check per figure is all it costs
+enabled = False
+
+_events = []
+
+# Time spent in the spans nested inside each open span, so every span also knows its own time without them
+_open_spans = []
+
+# The figure being rendered, which every stage timed meanwhile is attributed to
+_figure = None
+
+
+class Span:
+    # Times the code inside a with block as one event. Figures are spans too, and the stages inside them are counted
+    # against the figure
+    def __init__(self, name, category="stage"):
+        self.name = name
+        self.category = category
+        self.active = False
+
+    def __enter__(self):
+        global _figure
+        self.active = enabled
+        if self.active:
+            if self.category == "figure":
+                _figure = self.name
+            _open_spans.append(0.0)
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exception):
+        global _figure
+        if not self.active:
+            return
+        end = time.perf_counter()
+        duration = end - self.start
+        nested = _open_spans.pop()
+        if _open_spans:
+            _open_spans[-1] += duration
+
+        # Chrome's trace format: complete events with microsecond timestamps. perf_counter runs on the same clock in
+        # every process, so the workers' events line up with the parent's
+        _events.append({"name": self.name, "cat": self.category, "ph": "X", "ts": self.start * 1e6,
+                        "dur": duration * 1e6, "pid": os.getpid(), "tid": 0,
+                        "args": {"figure": _figure, "self_seconds": duration - nested}})
+        if self.category == "figure":
+            _figure = None
+
+
+def timed(function, stage):
+    @functools.wraps(function)
+    def timed_function(*args, **kwargs):
+        with Span(stage):
+            return function(*args, **kwargs)
+
+    timed_function.timed_stage = stage
+    return timed_function
+
+
+def instrument(owner, attribute, stage):
+    # Replaces a function of a module, or a method of a class, with one that times every call as the stage
+    function = getattr(owner, attribute)
+    if not hasattr(function, "timed_stage"):
+        setattr(owner, attribute, timed(function, stage))
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def take_events():
+    # Hands over the events recorded so far and forgets them, which is how workers pass theirs back after each figure
+    events = list(_events)
+    _events.clear()
+    return events
+
+
+def add_events(events):
+    _events.extend(events)
+
+
+def write_trace(path):
+    # Opens in chrome://tracing or https://ui.perfetto.dev, one row per process with the stages nested in the figures
+    with open(path, "w") as file:
+        json.dump({"traceEvents": _events, "displayTimeUnit": "ms"}, file)
+
+
+def summarize():
+    # Calls and seconds of each stage over the whole batch and within each figure, counting only the time not spent in
+    # a nested stage. A figure's time outside all of its stages is counted as its "other" stage
+    stages = {}
+    figure_stages = {}
+    for event in _events:
+        stage = event["name"] if event["cat"] != "figure" else "other"
+        figure = event["args"]["figure"] or "-"
+        for totals, key in [(stages, stage), (figure_stages, (figure, stage))]:
+            calls, seconds = totals.get(key, (0, 0.0))
+            totals[key] = (calls + 1, seconds + event["args"]["self_seconds"])
+
+    def slowest_first(totals):
+        return sorted(((key, calls, seconds) for key, (calls, seconds) in totals.items()), key=lambda row: -row[2])
+    return slowest_first(stages), slowest_first(figure_stages)
+
+
+def print_summary(top=10):
+    stages, figure_stages = summarize()
+    total_seconds = sum(seconds for _, _, seconds in stages) or 1.0
+
+    print("{:<55}{:>8}{:>10}{:>8}".format("Stage", "Calls", "Seconds", "Share"))
+    for stage, calls, seconds in stages[:top]:
+        print("{:<55}{:>8}{:>10.3f}{:>7.1f}%".format(stage, calls, seconds, 100 * seconds / total_seconds))
+
+    print("{:<80}{:>8}{:>10}{:>8}".format("Figure / stage", "Calls", "Seconds", "Share"))
+    for (figure, stage), calls, seconds in figure_stages[:top]:
+        print("{:<80}{:>8}{:>10.3f}{:>7.1f}%".format(figure + " / " + stage, calls, seconds,
+                                                     100 * seconds / total_seconds))
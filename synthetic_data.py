@@ -0,0 +1,310 @@
+import argparse
+import glob
+import io
+import os
+import shutil
+
+from transient_data import LazyModule, derive_load_points, load_csv, working_directory
+
+pd = LazyModule("pandas", globals(), "pd")
+np = LazyModule("numpy", globals(), "np")
+
+
+# The columns of the transient logs exactly as they are written, repeated Speed and trailing space included
+transient_log_columns = ["TimeToEvent", "BSFC", "BSNO", "BSPM", "Corrected Exhaust", "Test Time (100ms)", "Speed (rpm)",
+                         "Torque (lb-ft)", "Power (hp)", "Position", "Control", "Cylinder 1", "Cylinder 2",
+                         "Cylinder 3", "Cylinder 4", "Cylinder 5", "Cylinder 6", "Exhaust Temp", "Pre Turbo Temp",
+                         "Post Turbo Temp", "Intake Temp", "Cart Fuel Flow (kg/hr)", "PM Raw (ug/m^3)",
+                         "Turbo Position", "Turbo Position Request", "Turbo Boost ", "Exhaust (kg/hr)", "LFE (kg/hr)",
+                         "NO Raw (ppm)", "EGR Meter", "EGR Mass Flow (kg/hr)", "EGR Temp (K)", "EGR Venturi Guess",
+                         "EGR Valve Raw", "Speed", "Torque", "Time", "Speed", "Fuel Estimate (kg/hr)", "Boost (kPa)",
+                         "TurboSpeed", "SSM", "SOI Press Mpa", "SOI Timing"]
+
+# The same names as pandas reads them back, which tells the two Speed columns apart
+signal_names = transient_log_columns[:37] + ["Speed.1"] + transient_log_columns[38:]
+
+steady_state_columns = ["Speed", "Load", "BSFC", "BSNO", "BSPM", "Boost", "VGTPosition", "EGRMass", "EGRPosition",
+                        "Fuel", "RawNO", "RawPM", "LFE"]
+
+# The logs join several recorders that were started together but stopped at different times, so each group of columns
+# runs on for its own number of seconds past the last TimeToEvent row (or stops short of it), as in the shipped logs
+dyno_columns = ["Test Time (100ms)", "Speed (rpm)", "Torque (lb-ft)", "Power (hp)", "Position", "Control",
+                "Cylinder 1", "Cylinder 2", "Cylinder 3", "Cylinder 4", "Cylinder 5", "Cylinder 6", "Exhaust Temp",
+                "Pre Turbo Temp", "Post Turbo Temp", "Intake Temp", "Cart Fuel Flow (kg/hr)"]
+recorder_overruns = dict({"TimeToEvent": 0.0, "BSFC": 16.5, "BSNO": 3.3, "BSPM": -0.8, "Corrected Exhaust": -4.0,
+                          "PM Raw (ug/m^3)": 29.1},
+                         **{column: 0.1 for column in dyno_columns},
+                         **{name: 27.2 for name in signal_names[23:37]},
+                         **{name: 26.0 for name in signal_names[37:]})
+
+# Columns that carry no measurement noise
+noiseless_columns = ["TimeToEvent", "Test Time (100ms)", "Position", "Control", "Time", "SSM"]
+
+# Speed (rpm) and torque (lb-ft) at idle and at the start and end of each transient, the steps run in the test cell
+idle_operating_point = (700.0, 1.0)
+transient_operating_points = {"Load": ((1200.0, 100.0), (1200.0, 500.0)),
+                              "Speed": ((1200.0, 500.0), (2000.0, 500.0)),
+                              "SpeedLoad": ((1200.0, 100.0), (2000.0, 500.0))}
+
+# Response of the baseline controller: how slowly the turbo spools up (s), how far boost, EGR and the speed lag the
+# demand (s), and how much the EGR rate (% mass) and VGT position (% closed) are moved from their steady state values
+# while the transient lasts
+baseline_control = {"spool_time": 5.5, "boost_delay": 1.0, "egr_delay": 0.5, "speed_delay": 0.2, "egr_offset": 0.0,
+                    "vgt_offset": 0.0}
+
+
+def policy_control(policy):
+    # Each policy moves the EGR and VGT away from the baseline during the transient, which changes how fast the turbo
+    # spools up. The settings are drawn from the policy number, so a policy is the same in every archive
+    generator = np.random.default_rng(policy)
+    vgt_offset = generator.uniform(-10.0, 15.0)
+    return dict(baseline_control,
+                spool_time=baseline_control["spool_time"] * (1 - vgt_offset / 40) * generator.uniform(0.8, 1.2),
+                boost_delay=baseline_control["boost_delay"] * generator.uniform(0.6, 1.2),
+                egr_delay=baseline_control["egr_delay"] * generator.uniform(0.6, 1.4),
+                egr_offset=generator.uniform(-12.0, 4.0), vgt_offset=vgt_offset)
+
+
+def steady_state_values(speed, torque):
+    # A smooth stand in for the engine maps, tuned to land near the measured steady state points. Brake specific values
+    # are per hp and rise steeply towards idle, where the engine makes almost no power
+    speed = np.asarray(speed, dtype=float)
+    torque = np.asarray(torque, dtype=float)
+    power = np.maximum(torque * speed / 5252, 0.05)
+    light_load = 1 + 3 / power
+
+    bsfc = (130 + 9000 / np.maximum(torque, 1) + 0.085 * (speed - 1200)) * light_load
+    return {"Speed": speed,
+            "Load": torque,
+            "BSFC": bsfc,
+            "BSNO": (2.2 - 0.002 * (torque - 100) + 0.001 * (speed - 1200)) * light_load,
+            "BSPM": (0.03 + 0.00002 * (torque - 100)) * light_load,
+            "Boost": 56 * (torque / 500) ** 2 * (speed / 1200) ** 1.3,
+            "VGTPosition": np.clip(25 + 0.05 * (torque - 100) - 0.045 * (speed - 1200), 5, 90),
+            "EGRMass": np.clip(30 + 0.005 * (torque - 300) - 0.012 * (speed - 1200), 0, 50),
+            "EGRPosition": np.clip(90 - 0.2 * np.maximum(torque - 300, 0) - 0.05 * (speed - 1200), 10, 90),
+            "Fuel": bsfc * power / 1000,
+            "RawNO": 180 + 0.35 * (torque - 100) - 0.06 * (speed - 1200),
+            "RawPM": 1.5 + 0.008 * (torque - 100),
+            "LFE": (285 + 0.5 * (torque - 100)) * (speed / 1200) ** 1.6}
+
+
+def torque_limit(speed, torque_curve):
+    return np.interp(speed, torque_curve['Speed'].to_numpy(dtype=float), torque_curve['Torque'].to_numpy(dtype=float))
+
+
+class SyntheticRun:
+    # One transient log: the engine idles, comes up to the starting operating point, holds it until the event, is
+    # asked to ramp to the target over transient_time seconds, holds the target and returns to idle before the end.
+    # The torque it delivers is held under a limit that rises from the starting torque to the full load torque curve
+    # as the turbo spools up, which gives the lagging, curve shaped torque rise of the real transients
+    def __init__(self, transient_type, transient_time, control, torque_curve, duration=90.0, event_time=40.0,
+                 sample_rate=10.0, noise=0.01, seed=0):
+        if duration - event_time <= transient_time:
+            raise ValueError("The log has to run on for longer than the " + str(transient_time) + " s transient")
+        self.transient_type = transient_type
+        self.transient_time = transient_time
+        self.control = control
+        self.torque_curve = torque_curve
+        self.sample_rate = sample_rate
+        self.noise = noise
+        self.seed = seed
+
+        self.event_row = int(round(event_time * sample_rate))
+        self.recorded_rows = int(round(duration * sample_rate)) + 1
+        self.column_rows = {column: self.recorded_rows + int(round(overrun * sample_rate))
+                            for column, overrun in recorder_overruns.items()}
+        self.total_rows = max(self.column_rows.values())
+
+        start, end = -self.event_row / sample_rate, (self.recorded_rows - 1 - self.event_row) / sample_rate
+        lead = min(5.0, event_time / 2, (end - transient_time) / 2)
+        initial, target = transient_operating_points[transient_type]
+        self.schedule_times = [start, start + 0.6 * lead, start + lead, 0.0, transient_time, end - lead,
+                               end - 0.4 * lead, end]
+        self.schedule_points = np.array([idle_operating_point, idle_operating_point, initial, initial, target, target,
+                                         idle_operating_point, idle_operating_point])
+        self.control_window = (start + lead, end - lead)
+
+    def demand(self, times):
+        return (np.interp(times, self.schedule_times, self.schedule_points[:, 0]),
+                np.interp(times, self.schedule_times, self.schedule_points[:, 1]))
+
+    def operating_point(self, times):
+        speed = self.demand(times - self.control["speed_delay"])[0]
+        torque_demand = self.demand(times)[1]
+        initial_torque = transient_operating_points[self.transient_type][0][1]
+        spooled = 1 - np.exp(-np.maximum(times, 0) / self.control["spool_time"])
+        limit = initial_torque + (torque_limit(speed, self.torque_curve) - initial_torque) * spooled
+        return speed, np.minimum(torque_demand, np.maximum(limit, initial_torque))
+
+    def signals(self, times):
+        # Every column at the given times, without noise. Each signal is a function of time alone, so any block of
+        # rows can be generated without the rows before it
+        speed, torque = self.operating_point(times)
+        steady = steady_state_values(speed, torque)
+        boost = steady_state_values(*self.operating_point(times - self.control["boost_delay"]))["Boost"]
+        lagged = steady_state_values(*self.operating_point(times - self.control["egr_delay"]))
+
+        # The controller's moves fade in at the event and out again once the transient has settled
+        since_event = np.maximum(times, 0)
+        transient = (1 - np.exp(-since_event / 0.5)) * np.exp(-since_event / (self.transient_time + 4))
+        egr = np.clip(lagged["EGRMass"] + self.control["egr_offset"] * transient, 0, 60)
+        vgt_request = np.clip(steady["VGTPosition"] + self.control["vgt_offset"] * transient, 0, 100)
+        vgt = np.clip(lagged["VGTPosition"] + self.control["vgt_offset"] * transient, 0, 100)
+
+        # Fuel injected ahead of the air is burned less completely, and the EGR trades NO against PM
+        air_shortfall = np.clip(1 - (boost + 5) / (steady["Boost"] + 5), 0, 1)
+        extra_egr = egr - steady["EGRMass"]
+        power = torque * speed / 5252
+        fuel = steady["Fuel"] * (1 + 0.1 * air_shortfall)
+        lfe = steady_state_values(*self.operating_point(times - self.control["boost_delay"]))["LFE"]
+        egr_flow = lfe * egr / (100 - egr)
+        pm_factor = np.exp(5 * air_shortfall + 0.08 * extra_egr)
+        no_factor = np.exp(-0.05 * extra_egr)
+
+        rows = np.round((times - self.schedule_times[0]) * self.sample_rate)
+        controlled = (times >= self.control_window[0]) & (times <= self.control_window[1])
+        signals = {"TimeToEvent": times,
+                   "BSFC": steady["BSFC"] * (1 + 0.1 * air_shortfall),
+                   "BSNO": steady["BSNO"] * no_factor,
+                   "BSPM": steady["BSPM"] * pm_factor,
+                   "Corrected Exhaust": 190 + 0.5 * torque,
+                   "Test Time (100ms)": np.round(rows * 10 / self.sample_rate) + 1,
+                   "Speed (rpm)": speed,
+                   "Torque (lb-ft)": torque,
+                   "Power (hp)": power,
+                   "Position": np.zeros_like(times),
+                   "Control": controlled.astype(float)}
+        for cylinder in range(1, 7):
+            signals["Cylinder " + str(cylinder)] = 80 + 0.45 * torque * (1 + 0.03 * (cylinder - 3.5))
+        signals.update({"Exhaust Temp": 95 + 0.25 * torque,
+                        "Pre Turbo Temp": np.full_like(times, 24.45),
+                        "Post Turbo Temp": 28 + 0.05 * torque,
+                        "Intake Temp": 25 + 0.0015 * torque,
+                        "Cart Fuel Flow (kg/hr)": fuel,
+                        "PM Raw (ug/m^3)": steady["RawPM"] * pm_factor,
+                        "Turbo Position": vgt,
+                        "Turbo Position Request": vgt_request,
+                        "Turbo Boost ": 1 + boost / 101.325,
+                        "Exhaust (kg/hr)": lfe + fuel + 40,
+                        "LFE (kg/hr)": lfe,
+                        "NO Raw (ppm)": steady["RawNO"] * no_factor,
+                        "EGR Meter": egr,
+                        "EGR Mass Flow (kg/hr)": egr_flow,
+                        "EGR Temp (K)": 317 + 0.008 * torque,
+                        "EGR Venturi Guess": 0.25 * egr_flow,
+                        "EGR Valve Raw": lagged["EGRPosition"],
+                        "Speed": speed,
+                        "Torque": torque,
+                        "Time": times - self.schedule_times[0],
+                        "Speed.1": speed,
+                        "Fuel Estimate (kg/hr)": 1.03 * fuel,
+                        "Boost (kPa)": boost,
+                        "TurboSpeed": 13000 + 830 * boost,
+                        "SSM": np.ones_like(times),
+                        "SOI Press Mpa": 42 + 0.17 * torque,
+                        "SOI Timing": 10.1 - 0.009 * (torque - 100)})
+        return signals
+
+    def chunks(self, chunk_rows=100000):
+        # The log a block of rows at a time, noise included. The noise is drawn row by row from one generator, so the
+        # log comes out the same whatever the block size
+        generator = np.random.default_rng(self.seed)
+        noisy = np.array([name not in noiseless_columns for name in signal_names])
+        lengths = np.array([self.column_rows[name] for name in signal_names])
+
+        for first_row in range(0, self.total_rows, chunk_rows):
+            rows = np.arange(first_row, min(first_row + chunk_rows, self.total_rows))
+            times = (rows - self.event_row) / self.sample_rate
+            signals = self.signals(times)
+            values = np.column_stack([signals[name] for name in signal_names])
+            values *= 1 + self.noise * generator.standard_normal(values.shape) * noisy
+            values[rows[:, np.newaxis] >= lengths[np.newaxis, :]] = np.nan
+
+            chunk = pd.DataFrame(values, columns=signal_names)
+            for name in ["Test Time (100ms)", "Speed (rpm)", "Torque (lb-ft)", "Power (hp)"]:
+                chunk[name] = chunk[name].round()
+            yield chunk
+
+    def write(self, path, chunk_rows=100000):
+        # numpy formats the rows several times faster than DataFrame.to_csv, and the missing values are then left empty
+        # the way the logs have them
+        with open(path, "w", encoding="utf-8-sig", newline="\r\n") as file:
+            file.write(",".join(transient_log_columns) + "\n")
+            for chunk in self.chunks(chunk_rows):
+                text = io.StringIO()
+                np.savetxt(text, chunk.to_numpy(), fmt="%.10g", delimiter=",")
+                file.write(text.getvalue().replace("nan", ""))
+
+
+def write_steady_states(path, transient_type, points=5):
+    initial, target = transient_operating_points[transient_type]
+    speed = np.linspace(initial[0], target[0], points)
+    torque = np.linspace(initial[1], target[1], points)
+    table = pd.DataFrame(steady_state_values(speed, torque), columns=steady_state_columns)
+    with open(path, "w", encoding="utf-8-sig", newline="\r\n") as file:
+        table.to_csv(file, index=False, float_format="%.7g")
+
+
+def write_synthetic_data(directory, transient_types=("Load", "Speed", "SpeedLoad"), transient_times=(2, 4, 6, 8, 10),
+                         policies=10, duration=90.0, event_time=40.0, sample_rate=10.0, noise=0.01, seed=0,
+                         chunk_rows=100000):
+    # Writes an archive laid out like this repository, data/ and figures/, that main.py and transient_data.py can be
+    # run from: the steady states and baseline runs of every transient, policies 1 to policies of the 2 s Load
+    # transient, their load point tables, and a copy of the torque curve and the other tables that are not runs
+    data_directory = os.path.join(directory, "data")
+    os.makedirs(data_directory, exist_ok=True)
+    os.makedirs(os.path.join(directory, "figures"), exist_ok=True)
+
+    torque_curve = load_csv(r"./data/C9TorqueCurve.csv")
+    for path in glob.glob(r"./data/*.csv"):
+        if "Comparison_" not in os.path.basename(path):
+            shutil.copy(path, data_directory)
+
+    run_settings = {"torque_curve": torque_curve, "duration": duration, "event_time": event_time,
+                    "sample_rate": sample_rate, "noise": noise}
+    written = []
+    for type_idx, transient_type in enumerate(transient_types):
+        prefix = os.path.join(data_directory, transient_type + "Comparison_")
+        write_steady_states(prefix + "SteadyStates.csv", transient_type)
+
+        runs = [(str(time) + "SecondTransient_with_BaselineControl.csv", time, baseline_control, 0)
+                for time in transient_times]
+        if transient_type == "Load":
+            runs += [("2SecondTransient_with_Policy" + str(policy) + ".csv", 2, policy_control(policy), policy)
+                     for policy in range(1, policies + 1)]
+        for name, time, control, policy in runs:
+            run = SyntheticRun(transient_type, time, control, seed=[seed, type_idx, time, policy], **run_settings)
+            run.write(prefix + name, chunk_rows)
+            written.append(prefix + name)
+
+    with working_directory(directory):
+        if "Load" in transient_types:
+            derive_load_points("Load")
+    return written
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Writes synthetic transient logs in the layout and formats of data/")
+    parser.add_argument("directory", help="where to write the archive (its data/ and figures/ directories)")
+    parser.add_argument("--transient-types", nargs="*", default=["Load", "Speed", "SpeedLoad"],
+                        choices=list(transient_operating_points), help="transients to write (default: all three)")
+    parser.add_argument("--transient-times", type=int, nargs="*", default=[2, 4, 6, 8, 10],
+                        help="baseline control transient times in seconds (default: 2 4 6 8 10)")
+    parser.add_argument("--policies", type=int, default=10,
+                        help="number of 2 s Load transient policy runs (default: 10)")
+    parser.add_argument("--duration", type=float, default=90.0, help="seconds recorded per log (default: 90)")
+    parser.add_argument("--event-time", type=float, default=40.0,
+                        help="seconds recorded before the transient starts (default: 40)")
+    parser.add_argument("--sample-rate", type=float, default=10.0, help="rows per second (default: 10)")
+    parser.add_argument("--noise", type=float, default=0.01,
+                        help="standard deviation of the measurement noise, relative to each value (default: 0.01)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the measurement noise (default: 0)")
+    parser.add_argument("--chunk-rows", type=int, default=100000,
+                        help="rows generated and written at a time, which bounds the memory used (default: 100000)")
+    arguments = parser.parse_args()
+
+    written = write_synthetic_data(arguments.directory, arguments.transient_types, arguments.transient_times,
+                                   arguments.policies, arguments.duration, arguments.event_time,
+                                   arguments.sample_rate, arguments.noise, arguments.seed, arguments.chunk_rows)
+    print("Wrote " + str(len(written)) + " logs to " + os.path.join(arguments.directory, "data"))
@@ -0,0 +1,10 @@
+import pytest
+
+import transient_data
+
+
+@pytest.fixture(autouse=True)
+def data_cache_directory(tmp_path, monkeypatch):
+    # The tests read through the on-disk cache like everything else, into a directory of their own rather than the
+    # working tree's data/.cache
+    monkeypatch.setattr(transient_data, "data_cache_directory", str(tmp_path / ".cache"))
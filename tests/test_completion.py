@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+import transient_data
+
+
+def write_comparison(directory, transient_type, ramp_start=0.0):
+    # Speed ramps from 1200 to 2000 rpm and torque from 100 to 500 lb-ft, both offset a little so no sample sits exactly
+    # on a threshold. Before the event the speed sits at its target, which must not count as completing the transient
+    data_directory = os.path.join(directory, "data")
+    os.makedirs(data_directory, exist_ok=True)
+    with open(os.path.join(data_directory, transient_type + "Comparison_SteadyStates.csv"), "w") as file:
+        file.write("Speed,Load\n1200,100\n2000,500\n")
+
+    path = os.path.join("data", transient_type + "Comparison_2SecondTransient_with_BaselineControl.csv")
+    with open(os.path.join(directory, path), "w") as file:
+        file.write("TimeToEvent, Speed, Torque\n")
+        for row in range(-100, 150):
+            time = row / 10
+            progress = time - ramp_start
+            speed = 2000.0 if time < -5 else min(2000.0, 1205.0 + 100 * max(progress, 0.0))
+            torque = min(500.0, 105.0 + 100 * max(progress, 0.0))
+            file.write("{:.1f}, {}, {}\n".format(time, speed, torque))
+    return path
+
+
+def test_completion_is_when_every_driven_signal_passes_its_threshold(tmp_path):
+    with transient_data.working_directory(str(tmp_path)):
+        transient_data.clear_caches()
+        speed_path = write_comparison(".", "Speed")
+        speed_load_path = write_comparison(".", "SpeedLoad")
+        load_path = write_comparison(".", "Load")
+
+        # 98% of 2000 rpm is passed at 7.6 s and 98% of 500 lb-ft at 3.9 s, so the SpeedLoad transient waits for speed
+        assert transient_data.transient_completion_time(speed_path, "Speed") == 7.6
+        assert transient_data.transient_completion_time(load_path, "Load") == 3.9
+        assert transient_data.transient_completion_time(speed_load_path, "SpeedLoad") == 7.6
+        assert transient_data.transient_completion_time(speed_path, "Speed", completion_percent=90) == 6.0
+        assert transient_data.stream_completion_time(speed_load_path, "SpeedLoad", chunk_rows=7) == 7.6
+
+        with pytest.raises(ValueError):
+            transient_data.transient_completion_time(speed_path, "Speed", completion_percent=101)
+        transient_data.clear_caches()
+
+
+def test_completion_times_are_found_again_once_the_log_changes(tmp_path):
+    with transient_data.working_directory(str(tmp_path)):
+        transient_data.clear_caches()
+        path = write_comparison(".", "Load")
+        os.utime(path, (0, 0))
+        assert transient_data.transient_completion_time(path, "Load") == 3.9
+
+        write_comparison(".", "Load", ramp_start=2.0)
+        os.utime(path, (1, 1))
+        assert transient_data.transient_completion_time(path, "Load") == 5.9
+        transient_data.clear_caches()
@@ -0,0 +1,42 @@
+import os
+
+import numpy as np
+import pytest
+
+import transient_data
+
+
+def write_run(directory):
+    # An hour of log at one row a second, with the torque ramping to its target over the first ten seconds after the
+    # event and a constant exhaust flow of 1000 m^3/hr carrying 2 mg/m^3 of PM
+    data_directory = directory / "data"
+    data_directory.mkdir()
+    with open(data_directory / "LoadComparison_SteadyStates.csv", "w") as file:
+        file.write("Speed,Load\n1200,100\n1200,500\n")
+
+    times = np.arange(-10.0, 3590.0 + 0.5, 1.0)
+    torques = np.interp(times, [0.0, 10.0], [100.0, 500.0])
+    with open(data_directory / "LoadComparison_2SecondTransient_with_BaselineControl.csv", "w") as file:
+        file.write("TimeToEvent, Torque, Torque (lb-ft), Speed (rpm), Cart Fuel Flow (kg/hr), NO Raw (ppm), "
+                   "PM Raw (ug/m^3), Exhaust (kg/hr)\n")
+        for time, torque in zip(times, torques):
+            file.write(", ".join(str(value) for value in [time, torque, torque, 1200, 10.0, 0.0, 2.0,
+                                                          1000 * transient_data.exhaust_density]) + "\n")
+    return os.path.join("data", "LoadComparison_2SecondTransient_with_BaselineControl.csv")
+
+
+def test_pm_is_read_as_mg_per_cubic_metre(tmp_path):
+    path = write_run(tmp_path)
+    with transient_data.working_directory(str(tmp_path)):
+        transient_data.clear_caches()
+        completion_time = transient_data.transient_completion_time(path, "Load")
+        transient_totals, log_totals = transient_data.integrate_runs([path], "Load")
+        transient_data.clear_caches()
+
+    totals = dict(zip(transient_data.cycle_rates, log_totals[0]))
+    # 2 mg/m^3 in 1000 m^3/hr for an hour is 2 g, and 10 kg/hr of fuel for an hour is 10 kg
+    assert totals["PM (g)"] == pytest.approx(2.0, rel=1e-6)
+    assert totals["Fuel (g)"] == pytest.approx(10000.0, rel=1e-6)
+    assert totals["NO (g)"] == 0.0
+    transient_pm = dict(zip(transient_data.cycle_rates, transient_totals[0]))["PM (g)"]
+    assert transient_pm == pytest.approx(2.0 * completion_time / 3600, rel=1e-6)
@@ -0,0 +1,54 @@
+import os
+
+import numpy as np
+
+import transient_data
+
+
+def cached_blocks(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".npy"))
+
+
+def test_rewrites_leave_only_the_blocks_in_use(tmp_path):
+    # Every edit of the source throws the cached columns away, and their blocks should go with them
+    path = str(tmp_path / "log.csv")
+    for edit in range(5):
+        with open(path, "w") as file:
+            file.write("TimeToEvent, Boost (kPa), Label\n")
+            file.writelines(str(row) + ", " + str(row * edit) + ", a\n" for row in range(10))
+        os.utime(path, (edit, edit))
+
+        transient_data.clear_caches()
+        assert (transient_data.load_csv(path, columns=["Boost (kPa)"])["Boost (kPa)"] ==
+                np.arange(10) * edit).all()
+        transient_data.clear_caches()
+        transient_data.load_csv(path)
+
+    metadata = transient_data._cache_metadata(path)
+    used = {os.path.basename(transient_data._block_path(path, block)) for _, block, _ in metadata["columns"]}
+    assert cached_blocks(transient_data.data_cache_directory) == sorted(used)
+    transient_data.clear_caches()
+    assert (transient_data.load_csv(path)["Boost (kPa)"] == np.arange(10) * 4).all()
+
+
+def test_columns_come_back_from_the_cache_with_the_dtypes_they_were_parsed_with(tmp_path):
+    path = str(tmp_path / "log.csv")
+    with open(path, "w") as file:
+        file.write("TimeToEvent, Test Time (100ms), Boost (kPa), Label, Comment\n")
+        file.writelines(str(row / 10) + ", " + str(row) + ", " + str(row * 1.5) + ", a" + str(row) + ", " +
+                        ("" if row % 3 else "late") + "\n" for row in range(10))
+
+    transient_data.clear_caches()
+    parsed = transient_data.load_csv(path)
+    transient_data.clear_caches()
+    cached = transient_data.load_csv(path)
+    transient_data.clear_caches()
+
+    # Only the numeric columns are in the block cache, the others are parsed again with their missing values intact
+    metadata = transient_data._cache_metadata(path)
+    assert ({column for column, _, _ in metadata["columns"]} ==
+            {"TimeToEvent", "Test Time (100ms)", "Boost (kPa)"})
+    assert list(cached.dtypes) == list(parsed.dtypes)
+    assert cached["Label"].tolist() == ["a" + str(row) for row in range(10)]
+    assert cached["Comment"].isna().sum() == 6
+    assert cached.equals(parsed)
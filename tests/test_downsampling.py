@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+import main
+
+
+def noisy_trace(seed, samples=20000):
+    # Unevenly sampled noise with an overshoot and a spike, like boost and NOx
+    rng = np.random.default_rng(seed)
+    x = np.cumsum(rng.uniform(0.001, 0.02, samples))
+    y = rng.normal(size=samples)
+    y[samples // 3] = 25.0
+    y[2 * samples // 3] = -30.0
+    return x, y
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_min_max_keeps_the_endpoints_and_every_column_extreme(seed):
+    x, y = noisy_trace(seed)
+    buckets = 500
+    kept_x, kept_y = main.downsample_min_max(x, y, buckets)
+
+    assert len(kept_x) <= 4 * buckets
+    assert (kept_x[[0, -1]] == x[[0, -1]]).all() and (kept_y[[0, -1]] == y[[0, -1]]).all()
+    assert (np.diff(kept_x) > 0).all()
+    bucket = np.minimum(((x - x[0]) / (x[-1] - x[0]) * buckets).astype(int), buckets - 1)
+    kept_bucket = np.minimum(((kept_x - x[0]) / (x[-1] - x[0]) * buckets).astype(int), buckets - 1)
+    for column in np.unique(bucket):
+        assert kept_y[kept_bucket == column].min() == y[bucket == column].min()
+        assert kept_y[kept_bucket == column].max() == y[bucket == column].max()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_lttb_keeps_the_endpoints_and_the_peaks(seed):
+    x, y = noisy_trace(seed)
+    kept_x, kept_y = main.downsample_lttb(x, y, 1000)
+
+    assert len(kept_x) == 1000
+    assert (kept_x[[0, -1]] == x[[0, -1]]).all() and (kept_y[[0, -1]] == y[[0, -1]]).all()
+    assert (np.diff(kept_x) > 0).all()
+    assert np.isin(kept_x, x).all()
+    assert kept_y.max() == y.max() and kept_y.min() == y.min()
+
+
+def test_short_traces_are_drawn_as_they_are():
+    x, y = noisy_trace(0, samples=100)
+    for kept_x, kept_y in [main.downsample_min_max(x, y, 500), main.downsample_lttb(x, y, 1000)]:
+        assert kept_x is x and kept_y is y
@@ -0,0 +1,71 @@
+import glob
+import os
+
+import pandas as pd
+import pytest
+
+import transient_data
+
+repository = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def transient_logs():
+    logs = []
+    for path in sorted(glob.glob(os.path.join(repository, "data", "*SecondTransient_with_*.csv"))):
+        match = transient_data._run_name_pattern.search(os.path.basename(path))
+        if match and match.group(4) is None:
+            logs.append((os.path.relpath(path, repository), match.group(1)))
+    return logs
+
+
+@pytest.mark.parametrize("path, transient_type", transient_logs())
+def test_last_load_point_is_the_completion_time(path, transient_type):
+    # Both only count the transient as complete once every driven signal passes 98% of its target
+    with transient_data.working_directory(repository):
+        completion_time = transient_data.transient_completion_time(path, transient_type)
+        assert transient_data.load_point_times(path, transient_type)[-1] == completion_time
+        assert transient_data.stream_completion_time(path, transient_type, chunk_rows=500) == completion_time
+        assert (transient_data.stream_load_point_times(path, transient_type, chunk_rows=500) ==
+                transient_data.load_point_times(path, transient_type)).all()
+
+
+def shipped_and_derived(path):
+    with transient_data.working_directory(repository):
+        shipped = pd.read_csv(transient_data.load_point_table_path(path), encoding="utf-8-sig")
+        derived = transient_data.extract_load_points(path, "Load")
+    assert list(derived.columns) == list(shipped.columns)
+    # The steady state loads are held in Nm and come back to lb-ft to within rounding
+    assert derived["Load"].to_numpy() == pytest.approx(shipped["Load"].to_numpy(), rel=1e-12)
+    return shipped, derived
+
+
+# How far a derived baseline control table may be from the one made by hand, relative to it. The hand-made rows in
+# between were single samples picked within a tenth of a second of where the load is reached, and BSPM and BSNO move
+# by up to 15% between neighbouring samples there. Their settled rows were taken at the same time after the event
+# whatever the transient time, rather than a fixed time after completion
+baseline_tolerances = {"Boost": 0.1, "EGRMass": 0.05, "BSFC": 0.05, "BSPM": 0.2, "BSNO": 0.15}
+
+# The policy tables sample the logs at policy_load_point_times, so they come back to how the hand-made ones were
+# rounded: Boost to 0.1 kPa, and BSPM and BSNO to within the last of the three decimals the logs carry. EGR and BSFC
+# were pasted as logged, and come back to within the float32 the logs are held in. Policies 9 and 10 have their BSPM
+# pasted one sample late, each value being the one logged at the next of the sampled times, so it is not compared
+policy_tolerances = {"Boost": 0.05, "EGRMass": 1e-5, "BSFC": 1e-4, "BSPM": 1e-3, "BSNO": 1e-3}
+misaligned_policy_columns = {"Policy9": ["BSPM"], "Policy10": ["BSPM"]}
+
+
+@pytest.mark.parametrize("path", [path for path, transient_type in transient_logs()
+                                  if transient_type == "Load" and path.endswith("_BaselineControl.csv")])
+def test_derived_baseline_tables_match_the_shipped_ones(path):
+    shipped, derived = shipped_and_derived(path)
+    for metric, tolerance in baseline_tolerances.items():
+        assert derived[metric].to_numpy() == pytest.approx(shipped[metric].to_numpy(), rel=tolerance), metric
+
+
+@pytest.mark.parametrize("path", [path for path, transient_type in transient_logs()
+                                  if transient_type == "Load" and "_with_Policy" in path])
+def test_derived_policy_tables_match_the_shipped_ones(path):
+    shipped, derived = shipped_and_derived(path)
+    policy = transient_data._run_name_pattern.search(os.path.basename(path)).group(3)
+    for metric, tolerance in policy_tolerances.items():
+        if metric not in misaligned_policy_columns.get(policy, []):
+            assert derived[metric].to_numpy() == pytest.approx(shipped[metric].to_numpy(), abs=tolerance), metric
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+import transient_data
+
+
+def brute_force_front(objectives):
+    # A row is dominated when another is at least as low in every column and lower in one
+    at_least_as_low = (objectives[:, np.newaxis, :] <= objectives[np.newaxis, :, :]).all(axis=2)
+    lower_in_one = (objectives[:, np.newaxis, :] < objectives[np.newaxis, :, :]).any(axis=2)
+    return ~(at_least_as_low & lower_in_one).any(axis=0)
+
+
+@pytest.mark.parametrize("columns", [2, 3])
+@pytest.mark.parametrize("seed", range(20))
+def test_front_matches_brute_force(columns, seed):
+    # Few distinct values, so there are plenty of ties and repeated rows
+    objectives = np.random.default_rng(seed).integers(0, 6, size=(200, columns)).astype(float)
+    assert (transient_data.pareto_front(objectives) == brute_force_front(objectives)).all()
+
+
+def test_every_row_of_an_antichain_is_on_the_front():
+    # Each row lands below everything kept before it, which a list kept in order has to shift every time
+    steps = np.arange(5000, dtype=float)
+    assert transient_data.pareto_front(np.column_stack([steps, -steps, steps])).all()
+    assert transient_data.pareto_front(np.column_stack([steps, -steps])).all()
+
+
+def test_ranks_peel_the_fronts_and_put_missing_objectives_last():
+    objectives = np.random.default_rng(0).random((100, 3))
+    objectives[[3, 40], 1] = np.nan
+    ranks = transient_data.pareto_ranks(objectives)
+
+    assert (ranks[[3, 40]] == ranks.max()).all()
+    assert (np.delete(ranks, [3, 40]) < ranks.max()).all()
+    remaining = ~np.isnan(objectives).any(axis=1)
+    for front in range(1, ranks.max()):
+        on_front = np.zeros(len(objectives), dtype=bool)
+        on_front[remaining] = brute_force_front(objectives[remaining])
+        assert (on_front == (ranks == front)).all()
+        remaining &= ~on_front
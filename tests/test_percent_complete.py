@@ -0,0 +1,71 @@
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.image
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+import transient_data
+
+
+def make_runs(seed):
+    # Unevenly sampled runs from before the event to well after it, each ending with a few rows that carry no time
+    rng = np.random.default_rng(seed)
+    runs = []
+    for length in [80, 120, 200]:
+        times = -5.0 + np.cumsum(rng.uniform(0.05, 0.2, length))
+        runs.append(pd.DataFrame({"TimeToEvent": np.concatenate([times, [np.nan, np.nan]]),
+                                  "Boost": rng.normal(size=length + 2), "BSNO": rng.normal(size=length + 2)}))
+    return runs
+
+
+def test_samples_match_np_interp_with_time_offsets():
+    runs = make_runs(0)
+    completion_times = [2.0, 4.0, 6.0]
+    fractions = np.array([0.0, 0.25, 0.5, 0.75, 1.0])
+    offsets = [0.0, 0.1]
+    samples = transient_data.sample_percent_complete(runs, ["Boost", "BSNO"], completion_times, fractions, offsets)
+
+    assert samples.shape == (3, 2, 5)
+    for run_idx, run in enumerate(runs):
+        recorded = run[~run["TimeToEvent"].isna()]
+        for metric_idx, metric in enumerate(["Boost", "BSNO"]):
+            expected = np.interp(completion_times[run_idx] * fractions + offsets[metric_idx],
+                                 recorded["TimeToEvent"], recorded[metric])
+            np.testing.assert_allclose(samples[run_idx, metric_idx], expected, rtol=1e-12, atol=1e-12)
+
+
+def test_samples_outside_the_recorded_time_are_refused():
+    runs = make_runs(1)
+    with pytest.raises(ValueError):
+        transient_data.sample_percent_complete(runs, ["Boost"], [2.0, 4.0, 1000.0], [0.0, 1.0])
+
+
+def test_a_reused_template_renders_the_same_figure_as_a_new_one(tmp_path, monkeypatch):
+    # The second figure of a layout is drawn into the first one's template, and should come out pixel for pixel the
+    # same as when it is drawn from scratch
+    main.configure_plot_style()
+    rng = np.random.default_rng(2)
+    percent_complete = [0.0, 0.25, 0.5, 0.75, 1.0]
+    labels = ["2s", "4s", "6s"]
+    figures = [(rng.uniform(0, 5, 5), rng.uniform(0, 5, (3, 5)), "Boost Pressure (kPa)", None),
+               (rng.uniform(200, 400, 5), rng.uniform(180, 420, (3, 5)), "BSFC (g/kWh)", [150, 450])]
+
+    monkeypatch.setattr(main, "reuse_figures", True)
+    monkeypatch.setattr(main, "_percent_complete_templates", {})
+    for idx, (steady_states, series, y_label, y_limits) in enumerate(figures):
+        main.plot_percent_complete_comparison("darkgrid", percent_complete, steady_states, series, labels, y_label,
+                                              str(tmp_path / ("reused_" + str(idx) + ".png")), y_limits)
+    assert len(main._percent_complete_templates) == 1
+
+    monkeypatch.setattr(main, "reuse_figures", False)
+    steady_states, series, y_label, y_limits = figures[1]
+    main.plot_percent_complete_comparison("darkgrid", percent_complete, steady_states, series, labels, y_label,
+                                          str(tmp_path / "new.png"), y_limits)
+    main.plt.close("all")
+
+    reused = matplotlib.image.imread(str(tmp_path / "reused_1.png"))
+    new = matplotlib.image.imread(str(tmp_path / "new.png"))
+    assert reused.shape == new.shape
+    assert (reused == new).all()
@@ -0,0 +1,49 @@
+import os
+import shutil
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.image
+
+import main
+import transient_data
+
+repository = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_headless_render_writes_the_figure_the_serial_build_does(tmp_path, monkeypatch):
+    # Built from the shipped data into a figures directory of the test's own, first the way the serial build draws it
+    # and then the way a headless worker does, into a layout it keeps for the next figure
+    os.symlink(os.path.join(repository, "data"), str(tmp_path / "data"))
+    os.mkdir(str(tmp_path / "figures"))
+    name = "Load_load_point_comparison_boost"
+    job = main.figure_registry("darkgrid")[name]
+    figure_path = os.path.join("figures", name + ".png")
+    main.configure_plot_style()
+
+    with transient_data.working_directory(str(tmp_path)):
+        main.render_figure(job, name)
+        main.plt.close("all")
+        shutil.move(figure_path, "serial.png")
+
+        monkeypatch.setattr(main, "reuse_figures", True)
+        monkeypatch.setattr(main, "_percent_complete_templates", {})
+        seconds, inputs, peak_memory = main.render_figure_headless(job, name)
+        main.plt.close("all")
+        transient_data.clear_caches()
+
+        assert main.plt.get_backend().lower() == "agg"
+        assert not main.plt.get_fignums()
+        assert seconds > 0 and (peak_memory is None or peak_memory > 0)
+        assert os.path.normpath("data/LoadComparison_2SecondTransient_with_BaselineControl_LoadPoints.csv") in inputs
+
+        with open(figure_path, "rb") as file:
+            assert file.read(8) == b"\x89PNG\r\n\x1a\n"
+        headless = matplotlib.image.imread(figure_path)
+        serial = matplotlib.image.imread("serial.png")
+
+    width, height = main.plt.rcParams["figure.figsize"]
+    dpi = main.plt.rcParams["savefig.dpi"]
+    dpi = main.plt.rcParams["figure.dpi"] if dpi == "figure" else dpi
+    assert headless.shape[:2] == (round(height * dpi), round(width * dpi))
+    assert (headless == serial).all()
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+import transient_data
+
+
+def make_runs(seed):
+    # Runs of different lengths, sampled unevenly, each ending with a few rows that carry no time, like the logs
+    rng = np.random.default_rng(seed)
+    runs = []
+    for start, length in [(-5.0, 40), (-2.0, 25), (0.5, 60)]:
+        times = start + np.cumsum(rng.uniform(0.05, 0.3, length))
+        runs.append(pd.DataFrame({"TimeToEvent": np.concatenate([times, [np.nan, np.nan]]),
+                                  "Boost": rng.normal(size=length + 2), "EGR": rng.normal(size=length + 2)}))
+    return runs
+
+
+def expected_samples(run, signal, sample_times):
+    recorded = ~run["TimeToEvent"].isna()
+    times, values = run["TimeToEvent"][recorded].to_numpy(), run[signal][recorded].to_numpy()
+    return np.interp(sample_times, times, values, left=np.nan, right=np.nan)
+
+
+def test_shared_grid_matches_np_interp():
+    runs = make_runs(0)
+    grid = np.linspace(-6.0, 12.0, 500)
+    samples = transient_data.resample_runs(runs, ["Boost", "EGR"], grid)
+    assert samples.shape == (len(runs), 2, len(grid))
+    for run_idx, run in enumerate(runs):
+        for signal_idx, signal in enumerate(["Boost", "EGR"]):
+            np.testing.assert_allclose(samples[run_idx, signal_idx], expected_samples(run, signal, grid),
+                                       rtol=1e-12, atol=1e-12)
+
+
+def test_grid_per_run_matches_np_interp():
+    runs = make_runs(1)
+    completion_times = [3.0, 2.0, 9.0]
+    grid, samples = transient_data.resample_to_progress(runs, ["Boost"], completion_times, samples=101)
+    for run_idx, run in enumerate(runs):
+        np.testing.assert_allclose(samples[run_idx, 0],
+                                   expected_samples(run, "Boost", completion_times[run_idx] * grid / 100),
+                                   rtol=1e-12, atol=1e-12)
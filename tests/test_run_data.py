@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pytest
+
+import main
+import transient_data
+
+repository = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_signals_are_converted_to_the_units_of_the_figures(tmp_path):
+    path = str(tmp_path / "LoadComparison_2SecondTransient_with_Policy3.csv")
+    with open(path, "w") as file:
+        file.write("TimeToEvent, Speed (rpm), Torque (lb-ft), Power (hp), BSFC, Torque, Boost (kPa)\n")
+        file.write("-0.1, 1200, 100, 22.8, 0.35, 100.5, 4.2\n")
+        file.write("0.0, 1200, 400, 91.4, 0.32, 399.5, 36.0\n")
+
+    transient_data.clear_caches()
+    run = transient_data.load_run(path)
+    assert run.transient_type == "Load" and run.transient_time == 2 and run.policy == 3
+    assert set(run.signals) == {"TimeToEvent", "Speed (rpm)", "Torque (Nm)", "Power (kW)", "BSFC", "Torque",
+                                "Boost (kPa)"}
+    expected = {"TimeToEvent": [-0.1, 0.0],
+                "Speed (rpm)": [1200, 1200],
+                "Torque (Nm)": [135.58179483, 542.32717932],
+                "Power (kW)": [22.8 / 1.3596216173, 91.4 / 1.3596216173],
+                "BSFC": [0.35 * 1.3596216173, 0.32 * 1.3596216173],
+                "Torque": [100.5 * 1.3558179483, 399.5 * 1.3558179483],
+                "Boost (kPa)": [4.2, 36.0]}
+    for name, values in expected.items():
+        assert run[name] == pytest.approx(values, rel=1e-7), name
+
+    # Power is converted with the same horsepower the brake specific values are per, so the fuel flow they come to is
+    # the same in either unit
+    assert run["Power (kW)"] * run["BSFC"] == pytest.approx([22.8 * 0.35, 91.4 * 0.32], rel=1e-6)
+
+    # A transient log is held in float32, all but the time base the windows and completion times are found on
+    assert run["TimeToEvent"].dtype == np.float64
+    assert all(values.dtype == np.float32 for name, values in run.signals.items() if name != "TimeToEvent")
+
+    # Columns can be asked for by either name, and come back under the name they are kept under
+    assert list(run.frame(["Torque (lb-ft)", "Power (kW)"]).columns) == ["Torque (Nm)", "Power (kW)"]
+
+
+def test_column_names_are_read_once_per_run(tmp_path, monkeypatch):
+    path = str(tmp_path / "table.csv")
+    with open(path, "w") as file:
+        file.write("Load, Boost\n100, 2.6\n200, 3.5\n")
+
+    calls = []
+    read_column_names = transient_data.read_column_names
+    monkeypatch.setattr(transient_data, "read_column_names",
+                        lambda path: calls.append(path) or read_column_names(path))
+    transient_data.clear_caches()
+    for columns in [["Load"], ["Boost"], None, ["Load", "Boost"]]:
+        transient_data.load_run(path, columns=columns)
+    assert len(calls) == 1
+
+
+def test_each_log_is_held_once_at_half_the_memory():
+    path = os.path.normpath("data/LoadComparison_2SecondTransient_with_Policy5.csv")
+    metrics = list(transient_data.load_point_columns.values())
+    with transient_data.working_directory(repository):
+        transient_data.clear_caches()
+        transient_data.transient_statistics(path, "Load", metrics)
+        transient_data.extract_load_points(path, "Load")
+        transient_data.integrate_runs([path], "Load")
+        transient_data.steady_state_deviation(path, "Load")
+        transient_data.evaluate_policies("Load", [5])
+        main.load_signals(path, ["TimeToEvent", "Torque (lb-ft)", "Speed (rpm)"] + metrics)
+
+        # The analysis and the figures share one run of the log, and nothing else keeps its parsed columns
+        assert [key for key in transient_data._run_cache if key[0] == path] == [(path, np.dtype("float32").str)]
+        assert path not in transient_data._csv_cache
+
+        run = transient_data.load_run(path)
+        signals = [name for name in run.signals if name != "TimeToEvent"]
+        parsed = transient_data.load_csv(path, columns=[column for column in run.names
+                                                        if run.names[column] != "TimeToEvent"])
+        assert path not in transient_data._csv_cache
+        transient_data.clear_caches()
+
+    assert sum(run[name].nbytes for name in signals) * 2 == parsed.to_numpy(dtype=np.float64).nbytes
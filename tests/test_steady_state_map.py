@@ -0,0 +1,65 @@
+import os
+
+import numpy as np
+import pytest
+
+import transient_data
+
+
+def test_points_along_a_path_are_interpolated_along_it():
+    # A Load comparison: every point at 1200 rpm, so the tolerance across the path is 5% of 1200 rpm
+    torques = [100.0, 200.0, 300.0, 400.0, 500.0]
+    values = np.column_stack([[2.0, 4.0, 8.0, 16.0, 32.0], [1.0, 2.0, 3.0, 4.0, 5.0]])
+    steady_states = transient_data.SteadyStateMap([1200] * 5, torques, values, ["Boost", "BSFC"])
+
+    result = steady_states([1200, 1200, 1250, 1200, 1200], [300.0, 250.0, 450.0, 100.0, 500.0])
+    assert result.shape == (2, 5)
+    np.testing.assert_allclose(result[0], [8.0, 6.0, 24.0, 2.0, 32.0])
+    np.testing.assert_allclose(result[1], [3.0, 2.5, 4.5, 1.0, 5.0])
+
+
+def test_points_out_of_tolerance_of_a_path_are_nan():
+    steady_states = transient_data.SteadyStateMap([1200] * 5, [100, 200, 300, 400, 500], np.arange(5.0)[:, np.newaxis],
+                                                  ["Boost"])
+    # Idle, motoring, 100 rpm off the path, and past either end by more than 5% of the 400 lb-ft it spans
+    result = steady_states([700, 1200, 1300, 1200, 1200], [50, -20, 300, 70, 530])[0]
+    assert np.isnan(result).all()
+    # While within tolerance of the ends the nearest end is taken
+    np.testing.assert_allclose(steady_states([1200, 1200], [90, 515])[0], [0.0, 4.0])
+
+
+def test_points_covering_an_area_are_interpolated_over_it():
+    # Over a triangulation a linear field comes back exactly, and anything outside the points is NaN
+    speeds = np.array([1200, 2000, 1200, 2000, 1600])
+    torques = np.array([100, 100, 500, 500, 300])
+    values = np.column_stack([0.01 * speeds + 2 * torques, speeds - torques])
+    steady_states = transient_data.SteadyStateMap(speeds, torques, values, ["BSFC", "BSNO"])
+
+    speed, torque = np.meshgrid([1300, 1500, 1900], [150, 250, 450])
+    result = steady_states(speed, torque)
+    assert result.shape == (2, 3, 3)
+    np.testing.assert_allclose(result[0], 0.01 * speed + 2 * torque)
+    np.testing.assert_allclose(result[1], speed - torque)
+    assert np.isnan(steady_states([2100, 1600], [300, 600])).all()
+
+
+def test_a_map_needs_two_points():
+    with pytest.raises(ValueError):
+        transient_data.SteadyStateMap([1200], [100], [[1.0]], ["Boost"])
+
+
+def test_maps_are_built_once_until_the_steady_states_change(tmp_path):
+    os.mkdir(str(tmp_path / "data"))
+    path = str(tmp_path / "data" / "LoadComparison_SteadyStates.csv")
+    with transient_data.working_directory(str(tmp_path)):
+        transient_data.clear_caches()
+        for edit, boost in enumerate([2.0, 3.0]):
+            with open(path, "w") as file:
+                file.write("Speed,Load,Boost\n1200,100," + str(boost) + "\n1200,500,36\n")
+            os.utime(path, (edit, edit))
+
+            steady_states = transient_data.steady_state_map("Load", ["Boost"])
+            assert transient_data.steady_state_map("Load", ["Boost"]) is steady_states
+            # The map is over torque in Nm, so 100 lb-ft is found at 135.6 Nm
+            assert steady_states(1200, transient_data.lbft_to_Nm(100.0))[0] == pytest.approx(boost)
+        transient_data.clear_caches()
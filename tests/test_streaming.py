@@ -0,0 +1,27 @@
+import os
+
+import numpy as np
+import pytest
+
+import transient_data
+
+repository = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+logs = [("data/LoadComparison_2SecondTransient_with_Policy5.csv", "Load"),
+        ("data/SpeedLoadComparison_10SecondTransient_with_BaselineControl.csv", "SpeedLoad")]
+
+
+@pytest.mark.parametrize("path, transient_type", logs)
+@pytest.mark.parametrize("chunk_rows", [2, 3, 7, 64, 100000])
+def test_streamed_statistics_equal_the_loaded_ones(path, transient_type, chunk_rows):
+    # However the log is split into chunks, the rows are added up in the same order, so the numbers are exactly equal
+    metrics = list(transient_data.load_point_columns.values())
+    offsets = [0.1 if name in transient_data.brake_specific_metrics else 0.0
+               for name in transient_data.load_point_columns]
+    with transient_data.working_directory(repository):
+        loaded = transient_data.transient_statistics(path, transient_type, metrics, time_offsets=offsets)
+        streamed = transient_data.stream_transient_statistics(path, transient_type, metrics, time_offsets=offsets,
+                                                              chunk_rows=chunk_rows)
+    assert loaded.keys() == streamed.keys()
+    for name in loaded:
+        assert np.array_equal(loaded[name], streamed[name]), name
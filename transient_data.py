@@ -0,0 +1,1541 @@
+import argparse
+import contextlib
+import csv
+import glob
+import hashlib
+import importlib
+import json
+import math
+import os
+import re
+import signal
+import sys
+import uuid
+import warnings
+
+
+class LazyModule:
+    # Stands in for a module until one of its attributes is first used. Only then is the module imported, and it
+    # replaces this stand-in in the namespace it was bound in so every later lookup goes straight to the module.
+    # Commands that never touch pandas or the plotting libraries start without paying to import them
+    def __init__(self, name, namespace, alias):
+        self._name = name
+        self._namespace = namespace
+        self._alias = alias
+
+    def __getattr__(self, attribute):
+        module = importlib.import_module(self._name)
+        self._namespace[self._alias] = module
+        return getattr(module, attribute)
+
+
+pd = LazyModule("pandas", globals(), "pd")
+np = LazyModule("numpy", globals(), "np")
+mtri = LazyModule("matplotlib.tri", globals(), "mtri")
+
+
+def lbft_to_Nm(val):
+    return 1.3558179483 * val
+
+
+def inv_hp_to_inv_kW(val):
+    return 1.3596216173 * val
+
+
+# Parsed columns of each data file keyed by path, stored with the modification time they were read at so a file that
+# changes on disk during a session is parsed again. Files held as runs (see load_run) are not kept here as well
+_csv_cache = {}
+
+# Binary columnar copies of the data files live here so later runs can skip parsing the CSVs altogether
+data_cache_directory = "./data/.cache/"
+use_data_cache = True
+
+
+# Hashes of files already hashed this session, stored with the size and modification time they were hashed at
+_file_hash_cache = {}
+
+# Every data file read since the set was last cleared, which is how a figure build finds out what its inputs were
+inputs_read = set()
+
+
+def file_hash(path):
+    state = (os.path.getsize(path), os.path.getmtime(path))
+    cached = _file_hash_cache.get(path)
+    if cached is not None and cached[0] == state:
+        return cached[1]
+
+    digest = hashlib.sha1()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+
+    _file_hash_cache[path] = (state, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def read_column_names(path):
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        header = next(csv.reader(file, skipinitialspace=True), [])
+
+    # Headers are stripped ("Turbo Boost " becomes "Turbo Boost") and repeated headers get the same ".1", ".2" suffixes
+    # pandas uses, so the second "Speed" in the transient logs is always "Speed.1"
+    names = []
+    for name in header:
+        name = name.strip()
+        unique_name = name
+        count = 1
+        while unique_name in names:
+            unique_name = name + "." + str(count)
+            count += 1
+        names.append(unique_name)
+    return names
+
+
+def _read_csv(path, columns, names=None):
+    if names is None:
+        names = read_column_names(path)
+    for column in columns:
+        if column not in names:
+            raise KeyError(column + " is not a column of " + path)
+
+    # The C engine with skipinitialspace handles the ", " separators without the regex separator the python engine
+    # needed, and usecols keeps it from materializing columns nobody asked for
+    positions = sorted(names.index(column) for column in columns)
+    data = pd.read_csv(path, header=0, skipinitialspace=True, usecols=positions)
+    data.columns = [names[position] for position in positions]
+    return data
+
+
+def _cache_path(path, suffix):
+    # Entries are keyed on a hash of the absolute path as well as the file name, so files of the same name in
+    # different directories never share one
+    key = hashlib.sha1(os.path.normcase(os.path.abspath(path)).encode()).hexdigest()[:16]
+    return os.path.join(data_cache_directory, os.path.basename(path) + "." + key + suffix)
+
+
+def _block_path(path, block):
+    return _cache_path(path, "." + str(block) + ".npy")
+
+
+def _cache_metadata(path):
+    try:
+        with open(_cache_path(path, ".json")) as file:
+            metadata = json.load(file)
+    except (OSError, ValueError):
+        return None
+
+    if metadata["source_size"] != os.path.getsize(path):
+        return None
+    # Touching a file without changing it should not throw the cached copy away, so only hash the source when its
+    # modification time no longer matches
+    if metadata["source_mtime"] != os.path.getmtime(path) and metadata["source_hash"] != file_hash(path):
+        return None
+    return metadata
+
+
+def _load_cached_columns(path, columns):
+    metadata = _cache_metadata(path)
+    if metadata is None:
+        return {}
+
+    # Columns are stored as one row per column in each block, so a column is a contiguous slice of a memory map and
+    # only the requested ones are ever read from disk
+    locations = {column: (block, row) for column, block, row in metadata["columns"]}
+    blocks = {}
+    data = {}
+    try:
+        for column in columns:
+            if column not in locations:
+                continue
+            block, row = locations[column]
+            if block not in blocks:
+                blocks[block] = np.load(_block_path(path, block), mmap_mode="r")
+            data[column] = np.array(blocks[block][row])
+    except (OSError, ValueError):
+        return {}
+    return data
+
+
+def _write_cached_columns(path, data):
+    os.makedirs(data_cache_directory, exist_ok=True)
+
+    # Columns read later in a session are added to the cache as new blocks rather than rewriting what is there. Blocks
+    # get names no other writer can pick, so workers or processes caching the same file at once never overwrite each
+    # other's blocks
+    blocks = {}
+    block_names = {}
+    columns = []
+    for column in data.columns:
+        values = data[column].to_numpy()
+        # Columns pandas did not read as numbers hold Python objects, which np.load only gives back with pickling
+        # allowed and np.save as fixed width strings would turn into another dtype, with missing values as "nan". They
+        # are left out and parsed from the CSV whenever they are asked for
+        if values.dtype == object:
+            continue
+        block = blocks.setdefault(values.dtype.str, [])
+        block_name = block_names.setdefault(values.dtype.str, uuid.uuid4().hex)
+        columns.append((column, block_name, len(block)))
+        block.append(values)
+    if not columns:
+        return
+
+    # Everything is written to a temporary file of its own and moved into place, so an interrupted run never leaves a
+    # truncated file behind. The metadata goes last since it is what marks the new blocks as valid
+    for dtype, block in blocks.items():
+        block_path = _block_path(path, block_names[dtype])
+        with open(block_path + ".tmp", "wb") as file:
+            np.save(file, np.stack(block))
+        os.replace(block_path + ".tmp", block_path)
+
+    # Another writer may have added columns since this one started, so the metadata is read again just before it is
+    # replaced. Two writers finishing at the same moment can still drop each other's new columns, which are then just
+    # parsed and cached again, but never point a column at another column's data. Nor at a block another writer has
+    # since removed as unused: columns whose block is gone are dropped here and cached again by whoever reads them next
+    metadata = _cache_metadata(path)
+    if metadata is None:
+        metadata = {"source_size": os.path.getsize(path),
+                    "source_mtime": os.path.getmtime(path),
+                    "source_hash": file_hash(path),
+                    "columns": []}
+    cached_columns = {column for column, _, _ in metadata["columns"]}
+    metadata["columns"] += [entry for entry in columns if entry[0] not in cached_columns]
+    metadata["columns"] = [entry for entry in metadata["columns"] if os.path.exists(_block_path(path, entry[1]))]
+
+    metadata_path = _cache_path(path, ".json")
+    temporary_path = metadata_path + "." + uuid.uuid4().hex + ".tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(metadata, file)
+    os.replace(temporary_path, metadata_path)
+    _remove_unused_blocks(path, metadata)
+
+
+def _remove_unused_blocks(path, metadata):
+    # Every rewrite adds blocks, so the ones the metadata no longer points to are deleted: all of the old blocks once
+    # the source has changed, and any new block whose columns another writer cached first. Otherwise the cache would
+    # grow with every edit of the source
+    prefix = os.path.basename(_cache_path(path, "."))
+    used = {block for _, block, _ in metadata["columns"]}
+    for name in os.listdir(data_cache_directory):
+        if name.startswith(prefix) and name.endswith(".npy") and name[len(prefix):-len(".npy")] not in used:
+            with contextlib.suppress(OSError):
+                os.remove(os.path.join(data_cache_directory, name))
+
+
+def load_csv(path, columns=None):
+    # The columns as they are in the file, unconverted and in float64. The analysis reads its files through load_run,
+    # and a file already held as a run is read for this call only rather than being kept twice in two units
+    path = os.path.normpath(path)
+    modified_time = os.path.getmtime(path)
+    inputs_read.add(path)
+
+    cached = _csv_cache.get(path)
+    if cached is None or cached[0] != modified_time:
+        cached = (modified_time, read_column_names(path), {})
+        if not any(run_path == path for run_path, _ in _run_cache):
+            _csv_cache[path] = cached
+    _, names, loaded = cached
+
+    if columns is None:
+        columns = names
+    missing = [column for column in columns if column not in loaded]
+
+    if missing:
+        loaded.update(_read_columns(path, missing, names))
+
+    return pd.DataFrame({column: loaded[column] for column in columns}, columns=columns)
+
+
+def _read_columns(path, columns, names=None):
+    # The columns as arrays, from the on-disk cache where it has them and parsed from the CSV (and cached) otherwise.
+    # names are the column names of the file where the caller already has them
+    loaded = {}
+    if use_data_cache:
+        loaded.update(_load_cached_columns(path, columns))
+        columns = [column for column in columns if column not in loaded]
+    if columns:
+        data = _read_csv(path, columns, names)
+        if use_data_cache:
+            _write_cached_columns(path, data)
+        loaded.update((column, data[column].to_numpy()) for column in data.columns)
+    return loaded
+
+
+# How each column is brought to the units the figures report in, as the name it is kept under and the factor it is
+# multiplied by. Torques go from lb-ft to Nm, power from hp to kW and the brake specific values from per hp-hour to per
+# kWh. The PM analyzer logs mg/m^3 under a ug/m^3 header (see exhaust_density), so its readings keep their values and
+# are kept under the unit they are in. Speeds stay in rpm, and columns not listed here are kept as they are
+si_conversions = {"Torque (lb-ft)": ("Torque (Nm)", lbft_to_Nm(1.0)),
+                  "Torque": ("Torque", lbft_to_Nm(1.0)),
+                  "Load": ("Load", lbft_to_Nm(1.0)),
+                  "Power (hp)": ("Power (kW)", 1 / inv_hp_to_inv_kW(1.0)),
+                  "BSFC": ("BSFC", inv_hp_to_inv_kW(1.0)),
+                  "BSNO": ("BSNO", inv_hp_to_inv_kW(1.0)),
+                  "BSPM": ("BSPM", inv_hp_to_inv_kW(1.0)),
+                  "PM Raw (ug/m^3)": ("PM Raw (mg/m^3)", 1.0)}
+
+# Transient logs are named after their transient, how long it took and what controlled the air handling, and their
+# load point tables after the log
+_run_name_pattern = re.compile(r"(Load|Speed|SpeedLoad)Comparison_(\d+)SecondTransient_with_(.+?)(_LoadPoints)?\.csv$")
+
+
+def run_dtype(path):
+    # The dtype a file is held in. The transient logs, nearly all of the data, are held in float32, far finer than the
+    # sensors that logged them. The small tables whose values the load point and policy figures print keep float64 so
+    # they print as they always have
+    match = _run_name_pattern.search(os.path.basename(path))
+    return "float32" if match and match.group(4) is None else "float64"
+
+
+def _file_columns(names_in_file, columns):
+    # Columns can be asked for by their name in the file or by the name si_conversions keeps them under
+    file_names = {kept: column for column, (kept, _) in si_conversions.items()}
+    return [column if column in names_in_file else file_names.get(column, column) for column in columns]
+
+
+def _convert_column(column, values, dtype):
+    # The name a column is kept under and its values converted and cast to dtype. TimeToEvent stays float64 whatever
+    # the dtype, so the event start, the completion time and every window boundary fall exactly where the log has them
+    name, factor = si_conversions.get(column, (column, None))
+    values = np.asarray(values, dtype=float)
+    if factor is not None:
+        values = factor * values
+    return name, np.ascontiguousarray(values, dtype=np.float64 if name == 'TimeToEvent' else dtype)
+
+
+class RunData:
+    # The signals of one data file, converted with si_conversions once as they are read and kept as contiguous arrays
+    # of one dtype: the run_dtype of the file by default, so a transient log takes half the memory of its parsed
+    # float64 columns. Files named like a transient log also carry its transient type, transient time and policy (None
+    # for the baseline control), and every file carries the hash of its contents, its column names and the seconds
+    # its TimeToEvent spans when it has one
+    def __init__(self, path, dtype=None):
+        self.path = os.path.normpath(path)
+        self.dtype = np.dtype(run_dtype(self.path) if dtype is None else dtype)
+        self.source_hash = file_hash(self.path)
+        self.file_names = read_column_names(self.path)
+        self.names = {}
+        self.signals = {}
+
+        match = _run_name_pattern.search(os.path.basename(self.path))
+        self.transient_type = match.group(1) if match else None
+        self.transient_time = int(match.group(2)) if match else None
+        self.policy = (int(match.group(3)[len("Policy"):])
+                       if match and match.group(3).startswith("Policy") else None)
+        self.duration = None
+
+    def add_columns(self, columns):
+        # Reads the columns not held yet and converts them, returning the names they are kept under. Columns can be
+        # asked for by their name in the file or by the name they are kept under
+        columns = _file_columns(self.file_names, columns)
+        missing = [column for column in columns if column not in self.names]
+        for column, values in _read_columns(self.path, missing, self.file_names).items():
+            name, values = _convert_column(column, values, self.dtype)
+            self.names[column] = name
+            self.signals[name] = values
+            if name == 'TimeToEvent' and not np.isnan(values).all():
+                self.duration = float(np.nanmax(values) - np.nanmin(values))
+        return [self.names[column] for column in columns]
+
+    def __getitem__(self, name):
+        return self.signals[name]
+
+    def frame(self, columns=None):
+        # The signals as a DataFrame, sharing their arrays. Like add_columns, it takes the names in the file or the
+        # names the signals are kept under
+        if columns is None:
+            columns = list(self.signals)
+        columns = [self.names.get(column, column) for column in columns]
+        return pd.DataFrame({column: self.signals[column] for column in columns}, columns=columns, copy=False)
+
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for values in self.signals.values())
+
+
+# Runs keyed by path and dtype, stored with the modification time they were read at
+_run_cache = {}
+
+
+def load_run(path, columns=None, dtype=None):
+    # A RunData holding at least the given columns (every column by default), read and converted once and kept until
+    # the file changes. Everything that reads the data files goes through here, in the run_dtype of each file unless
+    # told otherwise, so each file is held once. Columns load_csv parsed earlier are let go rather than kept beside it
+    path = os.path.normpath(path)
+    modified_time = os.path.getmtime(path)
+    inputs_read.add(path)
+    _csv_cache.pop(path, None)
+
+    key = (path, np.dtype(run_dtype(path) if dtype is None else dtype).str)
+    cached = _run_cache.get(key)
+    if cached is None or cached[0] != modified_time:
+        cached = (modified_time, RunData(path, dtype))
+        _run_cache[key] = cached
+    run = cached[1]
+    run.add_columns(run.file_names if columns is None else columns)
+    return run
+
+
+# The signal each transient type drives to its target, named after the steady state columns the targets come from. Both
+# are held in the units of the figures, so torques are compared in Nm
+transient_target_signals = {"Load": {"Torque": "Load"},
+                            "Speed": {"Speed": "Speed"},
+                            "SpeedLoad": {"Speed": "Speed", "Torque": "Load"}}
+
+# Completion times keyed by path, transient type and threshold, stored with the modification time they were found at
+_completion_time_cache = {}
+
+
+def transient_targets(transient_type):
+    # The last steady state point of each comparison is where its transient ends up
+    steady_state_data = load_run(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
+                                 columns=list(transient_target_signals[transient_type].values()))
+    return {driven_signal: steady_state_data[column][-1]
+            for driven_signal, column in transient_target_signals[transient_type].items()}
+
+
+def transient_initial_values(transient_type):
+    # And the first is where it starts from
+    steady_state_data = load_run(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
+                                 columns=list(transient_target_signals[transient_type].values()))
+    return {driven_signal: steady_state_data[column][0]
+            for driven_signal, column in transient_target_signals[transient_type].items()}
+
+
+def transient_completion_time(path, transient_type, completion_percent=98):
+    path = os.path.normpath(path)
+    modified_time = os.path.getmtime(path)
+    key = (path, transient_type, completion_percent)
+    targets = transient_targets(transient_type)
+    inputs_read.add(path)
+
+    cached = _completion_time_cache.get(key)
+    if cached is not None and cached[0] == modified_time:
+        return cached[1]
+
+    data_set = load_run(path, columns=['TimeToEvent'] + list(targets))
+    times = data_set['TimeToEvent']
+
+    # Signals can sit at their target before the event (the Speed transient runs at full load throughout), so only
+    # look from the event start on. The transient is complete once every driven signal has passed its threshold
+    event_start = np.searchsorted(times, 0.0)
+    completion_idx = event_start
+    for driven_signal, target in targets.items():
+        passed = data_set[driven_signal][event_start:] > target * completion_percent / 100
+        if not passed.any():
+            raise ValueError(driven_signal + " never reaches " + str(completion_percent) + "% of its target in " + path)
+        completion_idx = max(completion_idx, event_start + np.argmax(passed))
+
+    completion_time = times[completion_idx]
+    _completion_time_cache[key] = (modified_time, completion_time)
+    return completion_time
+
+
+def sample_percent_complete(runs, metrics, completion_times, percent_complete, time_offsets=None):
+    # Samples every metric of every run at the given fractions of that run's completion time, returning an array of
+    # runs x metrics x percent complete. Each run needs only one searchsorted over its time base for all of its metrics,
+    # and time_offsets shifts the sample times per metric (the emissions analyzers lag the event by about 0.1 s)
+    percent_complete = np.asarray(percent_complete, dtype=float)
+    if time_offsets is None:
+        time_offsets = np.zeros(len(metrics))
+    time_offsets = np.asarray(time_offsets, dtype=float)
+
+    samples = np.empty((len(runs), len(metrics), len(percent_complete)))
+    metric_rows = np.arange(len(metrics))[:, np.newaxis]
+    for run_idx, run in enumerate(runs):
+        times = run['TimeToEvent'].to_numpy(dtype=float)
+        values = run[metrics].to_numpy(dtype=float).T
+
+        # The logs end with a few rows that only carry PM analyzer readings
+        recorded = ~np.isnan(times)
+        times = times[recorded]
+        values = values[:, recorded]
+
+        sample_times = completion_times[run_idx] * percent_complete[np.newaxis, :] + time_offsets[:, np.newaxis]
+        if sample_times.min() < times[0] or sample_times.max() > times[-1]:
+            raise ValueError("Sample times fall outside the recorded time of run " + str(run_idx))
+
+        hi = np.clip(np.searchsorted(times, sample_times), 1, len(times) - 1)
+        lo = hi - 1
+        slopes = (values[metric_rows, hi] - values[metric_rows, lo]) / (times[hi] - times[lo])
+        samples[run_idx] = slopes * (sample_times - times[lo]) + values[metric_rows, lo]
+
+    return samples
+
+
+def preload_data(directory=r"./data/"):
+    # Reading everything up front means forked workers inherit the converted runs instead of each reading the files
+    # again, and fills the on-disk cache for workers that are spawned instead
+    for path in sorted(glob.glob(os.path.join(directory, "*.csv"))):
+        load_run(path)
+
+
+@contextlib.contextmanager
+def working_directory(directory):
+    # Everything reads from ./data/ and the figures are written to ./figures/, so another archive of runs, like a
+    # synthetic one, is used by working from inside it
+    previous = os.getcwd()
+    os.chdir(directory)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def clear_caches():
+    # Drops everything parsed this session. Files needed again are read again, from the on-disk cache where it has them
+    _csv_cache.clear()
+    _completion_time_cache.clear()
+    _policy_evaluation_cache.clear()
+    _steady_state_map_cache.clear()
+    _run_cache.clear()
+
+
+# The metrics tabulated at each load point. The brake specific ones are recorded per hp and reported per kW
+load_point_metrics = ["Boost", "EGRMass", "BSFC", "BSPM", "BSNO"]
+brake_specific_metrics = ["BSFC", "BSPM", "BSNO"]
+
+# The load points sit at these percentages of the transient, one row of the load point tables each
+load_point_percent_complete = [0.0, 25.0, 50.0, 75.0, 100.0]
+
+
+def available_policies(transient_type, directory=r"./data/"):
+    pattern = os.path.join(directory, transient_type + "Comparison_2SecondTransient_with_Policy*_LoadPoints.csv")
+    prefix = transient_type + "Comparison_2SecondTransient_with_Policy"
+    return sorted(int(os.path.basename(path)[len(prefix):-len("_LoadPoints.csv")]) for path in glob.glob(pattern))
+
+
+def load_point_runs(transient_type, transient_times=(2, 4, 6, 8, 10), policies=()):
+    # Load point tables keyed by the run labels the figures use in their legends and printouts
+    runs = {}
+    for time in transient_times:
+        runs[str(time) + "s"] = (r"./data/" + transient_type + "Comparison_" + str(time) +
+                                 "SecondTransient_with_BaselineControl_LoadPoints.csv")
+    for policy in policies:
+        runs["Policy " + str(policy)] = (r"./data/" + transient_type + "Comparison_2SecondTransient_with_Policy" +
+                                         str(policy) + "_LoadPoints.csv")
+    return runs
+
+
+def transient_runs(transient_type, transient_times=(2, 4, 6, 8, 10), policies=()):
+    # The transient logs of the same runs, under the same labels
+    return {run: path[:-len("_LoadPoints.csv")] + ".csv"
+            for run, path in load_point_runs(transient_type, transient_times, policies).items()}
+
+
+def summarize_load_points(transient_type, transient_times=(2, 4, 6, 8, 10), policies=()):
+    # Every run, metric and load point at once as one tidy table, with the per run means and standard deviations the
+    # load point figures print and how far each point is from the steady state at the same load
+    runs = load_point_runs(transient_type, transient_times, policies)
+    steady_states = load_run(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
+                             columns=load_point_metrics).frame(load_point_metrics).to_numpy(dtype=float).T
+
+    # runs x load points x metrics, moved to runs x metrics x load points
+    values = np.stack([load_run(path, columns=load_point_metrics).frame(load_point_metrics).to_numpy(dtype=float)
+                       for path in runs.values()]).transpose(0, 2, 1)
+
+    run_count, metric_count, point_count = values.shape
+    steady_state_means = steady_states.mean(axis=1)
+    return pd.DataFrame({
+        "transient_type": transient_type,
+        "run": np.repeat(list(runs), metric_count * point_count),
+        "metric": np.tile(np.repeat(load_point_metrics, point_count), run_count),
+        "percent_complete": np.tile(load_point_percent_complete, run_count * metric_count),
+        "value": values.ravel(),
+        "steady_state": np.tile(steady_states.ravel(), run_count),
+        "delta": (values - steady_states).ravel(),
+        "run_mean": np.repeat(values.mean(axis=2).ravel(), point_count),
+        "run_std": np.repeat(values.std(axis=2).ravel(), point_count),
+        "steady_state_mean": np.tile(np.repeat(steady_state_means, point_count), run_count),
+        "mean_delta": np.repeat((values.mean(axis=2) - steady_state_means).ravel(), point_count)})
+
+
+# The transient log column each load point metric is taken from
+load_point_columns = {"Boost": "Boost (kPa)", "EGRMass": "EGR Meter", "BSFC": "BSFC", "BSPM": "BSPM", "BSNO": "BSNO"}
+
+# Load points average this many seconds of the log centred on the time they are reached
+load_point_window = 0.5
+
+# Except the first and last, which are the steady states either side of the transient and, like the baseline control
+# tables made by hand, average several seconds of them: the ten ending just before the event starts, in seconds from
+# the event start, and five once boost and the emissions have settled at the target, in seconds from the completion
+# time. The hand-made tables took the settled window at the same time after the event whatever the transient time,
+# and these land within a few percent of them for Boost, EGR and BSFC and within 15% for BSPM and BSNO
+load_point_initial_window = (-10.9, -0.8)
+load_point_settled_window = (5.0, 10.0)
+
+# The hand-made policy tables instead sample every policy at the same moments, in seconds from the event start, rather
+# than where its own load points fall, so the policies of the same 2 s transient are compared at the same times. Tables
+# derived for policy logs sample them too, to sit beside the shipped ones
+policy_load_point_times = [-0.4, 1.1, 1.6, 2.1, 6.5]
+
+# Molar masses in g/mol of NO and of the exhaust, taken as air. A ppm by volume of NO in an exhaust flow in kg/hr is
+# this many g/hr, which lands within a few percent of the BSNO the steady state tables give at the same points
+no_molar_mass = 30.006
+exhaust_molar_mass = 28.97
+
+# Density of the exhaust in kg/m^3 at standard conditions, taken as air. The PM analyzer's readings are mg/m^3 whatever
+# the header of the logs says: the steady state tables give RawPM, the intake and fuel flows and BSPM at every point,
+# and the BSPM they log is 2.1 (Load) and 2.9 (Speed, SpeedLoad) times what RawPM comes to read as mg/m^3 at this
+# density, at every point alike, but 2100 and 2900 times what it comes to read as ug/m^3
+exhaust_density = 1.293
+
+# What the cycle totals integrate, as the product of columns of a run and a factor giving a rate per hour: the fuel in
+# g/hr, the NO and PM carried by the exhaust flow in g/hr, and the power from torque and speed in kW. None of these
+# can run backwards, so the small negative readings of an idle analyzer or a motored engine count as nothing
+cycle_rates = {"Fuel (g)": (["Cart Fuel Flow (kg/hr)"], 1000.0),
+               "NO (g)": (["NO Raw (ppm)", "Exhaust (kg/hr)"], 1e-3 * no_molar_mass / exhaust_molar_mass),
+               "PM (g)": (["PM Raw (mg/m^3)", "Exhaust (kg/hr)"], 1e-3 / exhaust_density),
+               "Work (kWh)": (["Torque (Nm)", "Speed (rpm)"], 2 * math.pi / 60 / 1000)}
+
+# The brake specific totals, as each mass over the work
+cycle_brake_specific = {"BSFC (g/kWh)": "Fuel (g)", "BSNO (g/kWh)": "NO (g)", "BSPM (g/kWh)": "PM (g)"}
+
+
+def _rate_columns(rates):
+    return sorted({column for columns, _ in rates.values() for column in columns})
+
+
+def _rate_values(data, rates):
+    values = np.ones((len(data), len(rates)))
+    for idx, (columns, factor) in enumerate(rates.values()):
+        for column in columns:
+            values[:, idx] *= data[column].to_numpy(dtype=float)
+        values[:, idx] *= factor
+    return np.maximum(values, 0.0)
+
+
+def _trapezoid_increments(times, values, previous_time, previous_values):
+    # The amount added by the interval leading up to each row. Intervals where a rate is missing (the PM analyzer stops
+    # a few samples before the others) or where the log steps back in time add nothing
+    times = np.concatenate([[previous_time], times])
+    values = np.concatenate([previous_values[np.newaxis, :], values])
+    increments = (values[1:] + values[:-1]) / 2 * np.maximum(np.diff(times), 0)[:, np.newaxis] / 3600
+    return np.where(np.isnan(increments), 0.0, increments)
+
+
+def _running_sums(start, values):
+    # Sums continuing from start, added one row at a time in the same order however the rows are split into chunks
+    return np.cumsum(np.concatenate([start[np.newaxis, :], values]), axis=0)
+
+
+def load_point_windows(centres, percent_complete=load_point_percent_complete, window=load_point_window):
+    # The start and end times of the stretch of the log each load point averages. The 0% point is reached at the event
+    # start and the 100% point at the completion time, which the initial and settled windows are anchored to
+    centres = np.asarray(centres, dtype=float)
+    percent_complete = np.asarray(percent_complete, dtype=float)
+    starts, ends = centres - window / 2, centres + window / 2
+
+    initial = percent_complete <= 0
+    starts[initial] = centres[initial] + load_point_initial_window[0]
+    ends[initial] = centres[initial] + load_point_initial_window[1]
+    settled = percent_complete >= 100
+    starts[settled] = centres[settled] + load_point_settled_window[0]
+    ends[settled] = centres[settled] + load_point_settled_window[1]
+    return starts, ends
+
+
+def _load_points_reached(data, times, percent_complete, completion_percent, initial_values, targets):
+    # For each driven signal, rows x load points, true from the event start on wherever the signal has covered that
+    # share of its step. 100% is the test transient_completion_time makes, the signal passing completion_percent of
+    # its target, so the last load point falls exactly at the completion time
+    fractions = np.asarray(percent_complete, dtype=float) / 100
+    complete = fractions >= 1.0
+    after_start = (times >= 0.0)[:, np.newaxis]
+    reached = {}
+    for driven_signal, target in targets.items():
+        values = data[driven_signal].to_numpy(dtype=float)[:, np.newaxis]
+        progress = (values - initial_values[driven_signal]) / (target - initial_values[driven_signal])
+        reached[driven_signal] = after_start & np.where(complete, values > target * completion_percent / 100,
+                                                        (progress >= fractions) | (fractions == 0))
+    return reached
+
+
+def load_point_times(path, transient_type, percent_complete=load_point_percent_complete, completion_percent=98):
+    # A load point is reached once every driven signal has covered that share of its step from the first steady state
+    # point to the last, with 0% being the event itself. The signals only creep up on their targets at the end, so
+    # 100% is reached at the completion time transient_completion_time gives for the same completion_percent
+    initial_values = transient_initial_values(transient_type)
+    targets = transient_targets(transient_type)
+    data = load_run(path, columns=['TimeToEvent'] + list(targets)).frame(['TimeToEvent'] + list(targets))
+    data = data[~data['TimeToEvent'].isna()]
+    times = data['TimeToEvent'].to_numpy(dtype=float)
+
+    reached = _load_points_reached(data, times, percent_complete, completion_percent, initial_values, targets)
+    if not all(signal_reached.any(axis=0).all() for signal_reached in reached.values()):
+        raise ValueError("The transient never reaches all of its load points in " + path)
+    # Like the completion time, each point is when the last of the signals first gets there
+    return np.max([times[np.argmax(signal_reached, axis=0)] for signal_reached in reached.values()], axis=0)
+
+
+def cumulative_integral(times, rates):
+    # Trapezoidal running integral of rates per hour over a time base in seconds, zero at the first row
+    rates = np.asarray(rates, dtype=float)
+    increments = _trapezoid_increments(times[1:], rates[1:], times[0], rates[0])
+    return _running_sums(np.zeros(rates.shape[1]), increments)
+
+
+def load_point_averages(times, values, centres, window=load_point_window, percent_complete=load_point_percent_complete):
+    # Mean of each column of values over the window of each load point, as metrics x load points. Every window is a
+    # difference of two running sums, so the cost does not depend on how long the windows are
+    starts, ends = load_point_windows(centres, percent_complete, window)
+    lo = np.searchsorted(times, starts, side="left")
+    hi = np.searchsorted(times, ends, side="right")
+    if np.any(hi == lo):
+        raise ValueError("A load point window holds no samples")
+
+    sums = _running_sums(np.zeros(values.shape[1]), values)
+    return ((sums[hi] - sums[lo]) / (hi - lo)[:, np.newaxis]).T
+
+
+def transient_statistics(path, transient_type, metrics, percent_complete=load_point_percent_complete,
+                         time_offsets=None, window=load_point_window, rates=None):
+    # Everything the figures take from one transient log, read in full. stream_transient_statistics gives exactly the
+    # same numbers without holding the log in memory
+    if rates is None:
+        rates = cycle_rates
+    rate_columns = _rate_columns(rates)
+    columns = list(dict.fromkeys(['TimeToEvent'] + metrics + rate_columns))
+    data = load_run(path, columns=columns).frame(columns)
+    data = data[~data['TimeToEvent'].isna()]
+    times = data['TimeToEvent'].to_numpy(dtype=float)
+
+    completion_time = transient_completion_time(path, transient_type)
+    samples = sample_percent_complete([data], metrics, [completion_time],
+                                      np.asarray(percent_complete, dtype=float) / 100, time_offsets)[0]
+    centres = load_point_times(path, transient_type, percent_complete)
+    averages = load_point_averages(times, data[metrics].to_numpy(dtype=float), centres, window, percent_complete)
+
+    cumulative = cumulative_integral(times, _rate_values(data, rates))
+    event_start, completion_idx = np.searchsorted(times, [0.0, completion_time])
+    return {"completion_time": completion_time,
+            "percent_complete_samples": samples,
+            "load_point_times": centres,
+            "load_point_averages": averages,
+            "transient_totals": cumulative[completion_idx] - cumulative[event_start],
+            "cumulative_totals": cumulative[-1]}
+
+
+def read_csv_chunks(path, columns, chunk_rows=100000):
+    names = read_column_names(path)
+    for column in columns:
+        if column not in names:
+            raise KeyError(column + " is not a column of " + path)
+
+    positions = sorted(names.index(column) for column in columns)
+    for chunk in pd.read_csv(path, header=0, skipinitialspace=True, usecols=positions, chunksize=chunk_rows):
+        chunk.columns = [names[position] for position in positions]
+        yield chunk
+
+
+def _recorded_chunks(path, columns, chunk_rows):
+    # The recorded rows of a log, converted and cast the way load_run holds them, so what is streamed comes to exactly
+    # what is loaded
+    columns = _file_columns(read_column_names(path), ['TimeToEvent'] + [column for column in columns
+                                                                        if column != 'TimeToEvent'])
+    dtype = run_dtype(path)
+    for chunk in read_csv_chunks(path, columns, chunk_rows):
+        chunk = pd.DataFrame(dict(_convert_column(column, chunk[column], dtype) for column in chunk.columns))
+        chunk = chunk[~np.isnan(chunk['TimeToEvent'].to_numpy())]
+        if len(chunk):
+            yield chunk, chunk['TimeToEvent'].to_numpy(dtype=float)
+
+
+def stream_completion_time(path, transient_type, completion_percent=98, chunk_rows=100000):
+    # Same as transient_completion_time, but reads only as far as the transient completes
+    targets = transient_targets(transient_type)
+    reached = {}
+    for chunk, times in _recorded_chunks(path, list(targets), chunk_rows):
+        after_start = times >= 0.0
+        for driven_signal, target in targets.items():
+            passed = after_start & (chunk[driven_signal].to_numpy() > target * completion_percent / 100)
+            if driven_signal not in reached and passed.any():
+                reached[driven_signal] = times[np.argmax(passed)]
+        if len(reached) == len(targets):
+            return max(reached.values())
+
+    driven_signal = next(driven_signal for driven_signal in targets if driven_signal not in reached)
+    raise ValueError(driven_signal + " never reaches " + str(completion_percent) + "% of its target in " + path)
+
+
+def stream_load_point_times(path, transient_type, percent_complete=load_point_percent_complete, completion_percent=98,
+                            chunk_rows=100000):
+    # Same as load_point_times, reading only as far as the last load point
+    initial_values = transient_initial_values(transient_type)
+    targets = transient_targets(transient_type)
+    first_times = np.full((len(targets), len(percent_complete)), np.nan)
+    for chunk, times in _recorded_chunks(path, list(targets), chunk_rows):
+        reached = _load_points_reached(chunk, times, percent_complete, completion_percent, initial_values, targets)
+        for idx, signal_reached in enumerate(reached.values()):
+            found = np.isnan(first_times[idx]) & signal_reached.any(axis=0)
+            first_times[idx, found] = times[np.argmax(signal_reached, axis=0)][found]
+        if not np.isnan(first_times).any():
+            return first_times.max(axis=0)
+
+    raise ValueError("The transient never reaches all of its load points in " + path)
+
+
+def stream_transient_statistics(path, transient_type, metrics, percent_complete=load_point_percent_complete,
+                                time_offsets=None, window=load_point_window, rates=None, chunk_rows=100000):
+    # transient_statistics for logs too large to load. The file is read in chunks of chunk_rows rows, twice up to the
+    # completion of the transient and then once in full, and all that is kept between chunks is the last row, the
+    # running sums and the values picked out so far
+    if rates is None:
+        rates = cycle_rates
+    if chunk_rows < 2:
+        raise ValueError("Chunks need at least two rows")
+    if time_offsets is None:
+        time_offsets = np.zeros(len(metrics))
+    rate_columns = _rate_columns(rates)
+    completion_time = stream_completion_time(path, transient_type, chunk_rows=chunk_rows)
+
+    # Sample times flattened to metrics x percent complete, with the metric each one interpolates
+    fractions = np.asarray(percent_complete, dtype=float) / 100
+    sample_times = (completion_time * fractions[np.newaxis, :] +
+                    np.asarray(time_offsets, dtype=float)[:, np.newaxis]).ravel()
+    sample_metrics = np.repeat(np.arange(len(metrics)), len(percent_complete))
+    samples = np.full(len(sample_times), np.nan)
+
+    centres = stream_load_point_times(path, transient_type, percent_complete, chunk_rows=chunk_rows)
+    starts, ends = load_point_windows(centres, percent_complete, window)
+    bounds = [(starts, "left"), (ends, "right")]
+    bound_sums = [np.full((len(percent_complete), len(metrics)), np.nan) for _ in bounds]
+    bound_rows = [np.full(len(percent_complete), -1) for _ in bounds]
+    totals_at = np.full((2, len(rates)), np.nan)
+
+    row_offset = 0
+    previous_time, previous_values = np.nan, np.full(len(metrics), np.nan)
+    previous_rates = np.full(len(rates), np.nan)
+    sums = np.zeros(len(metrics))
+    cumulative = np.zeros(len(rates))
+    first_time = np.nan
+    for chunk, times in _recorded_chunks(path, list(dict.fromkeys(metrics + rate_columns)), chunk_rows):
+        values = chunk[metrics].to_numpy(dtype=float)
+        rate_values = _rate_values(chunk, rates)
+        if row_offset == 0:
+            first_time = times[0]
+
+        # The rows bracketing each sample time, the same rows a searchsorted over the whole log would pick
+        pending = np.isnan(samples)
+        positions = np.searchsorted(times, sample_times[pending])
+        found = positions < len(times)
+        if row_offset == 0:
+            positions = np.maximum(positions, 1)
+        idx = np.flatnonzero(pending)[found]
+        positions = positions[found]
+        hi_times, hi_values = times[positions], values[positions, sample_metrics[idx]]
+        lo_times = np.where(positions > 0, times[positions - 1], previous_time)
+        lo_values = np.where(positions > 0, values[positions - 1, sample_metrics[idx]],
+                             previous_values[sample_metrics[idx]])
+        slopes = (hi_values - lo_values) / (hi_times - lo_times)
+        samples[idx] = slopes * (sample_times[idx] - lo_times) + lo_values
+
+        chunk_sums = _running_sums(sums, values)
+        for (bound_times, side), bound_sum, bound_row in zip(bounds, bound_sums, bound_rows):
+            positions = np.searchsorted(times, bound_times, side=side)
+            found = (bound_row < 0) & (positions < len(times))
+            bound_sum[found] = chunk_sums[positions[found]]
+            bound_row[found] = row_offset + positions[found]
+        sums = chunk_sums[-1]
+
+        if row_offset == 0:
+            increments = _trapezoid_increments(times[1:], rate_values[1:], times[0], rate_values[0])
+            chunk_cumulative = _running_sums(cumulative, increments)
+        else:
+            increments = _trapezoid_increments(times, rate_values, previous_time, previous_rates)
+            chunk_cumulative = _running_sums(cumulative, increments)[1:]
+        for idx, boundary in enumerate([0.0, completion_time]):
+            position = np.searchsorted(times, boundary)
+            if np.isnan(totals_at[idx, 0]) and position < len(times):
+                totals_at[idx] = chunk_cumulative[position]
+        cumulative = chunk_cumulative[-1]
+
+        previous_time, previous_values, previous_rates = times[-1], values[-1], rate_values[-1]
+        row_offset += len(times)
+
+    if np.isnan(samples).any() or sample_times.min() < first_time:
+        raise ValueError("Sample times fall outside the recorded time of " + path)
+    for bound_sum, bound_row in zip(bound_sums, bound_rows):
+        bound_sum[bound_row < 0] = sums
+        bound_row[bound_row < 0] = row_offset
+    if np.any(bound_rows[1] == bound_rows[0]):
+        raise ValueError("A load point window holds no samples")
+
+    return {"completion_time": completion_time,
+            "percent_complete_samples": samples.reshape(len(metrics), len(percent_complete)),
+            "load_point_times": centres,
+            "load_point_averages": ((bound_sums[1] - bound_sums[0]) /
+                                    (bound_rows[1] - bound_rows[0])[:, np.newaxis]).T,
+            "transient_totals": totals_at[1] - totals_at[0],
+            "cumulative_totals": cumulative}
+
+
+def _file_units(column, values):
+    # Undoes the conversion si_conversions gives a column
+    _, factor = si_conversions.get(column, (column, None))
+    values = np.asarray(values, dtype=float)
+    return values if factor is None else values / factor
+
+
+def load_point_table_path(path):
+    return path[:-len(".csv")] + "_LoadPoints.csv"
+
+
+def extract_load_points(path, transient_type, window=load_point_window):
+    # Builds a load point table from a transient log instead of a spreadsheet: each row averages the window of one load
+    # point, or for a policy log samples one of policy_load_point_times, and is labelled with the load of the steady
+    # state point it compares against
+    columns = list(load_point_columns.values())
+    data = load_run(path, columns=['TimeToEvent'] + columns).frame(['TimeToEvent'] + columns)
+    data = data[~data['TimeToEvent'].isna()]
+    times = data['TimeToEvent'].to_numpy(dtype=float)
+    steady_state_data = load_run(r"./data/" + transient_type + "Comparison_SteadyStates.csv", columns=['Load'])
+
+    match = _run_name_pattern.search(os.path.basename(path))
+    if match and match.group(3).startswith("Policy"):
+        sample_times = times[np.searchsorted(times, 0.0)] + np.asarray(policy_load_point_times)
+        values = np.stack([np.interp(sample_times, times, data[column].to_numpy(dtype=float)) for column in columns])
+    else:
+        values = load_point_averages(times, data[columns].to_numpy(dtype=float), load_point_times(path, transient_type),
+                                     window)
+    # The runs hold everything in the units of the figures, and the tables are written in the units of the logs
+    table = pd.DataFrame({"Load": _file_units('Load', steady_state_data['Load'])})
+    for idx, (name, column) in enumerate(load_point_columns.items()):
+        table[name] = _file_units(column, values[idx])
+    return table
+
+
+def transient_logs(transient_type, directory=r"./data/"):
+    pattern = os.path.join(directory, transient_type + "Comparison_*SecondTransient_with_*.csv")
+    return sorted(path for path in glob.glob(pattern) if not path.endswith("_LoadPoints.csv"))
+
+
+def derive_load_points(transient_type, directory=r"./data/", overwrite=False):
+    # Writes the load point table of every log of this transient that has none yet, so a new policy run can be plotted
+    # as soon as its log is in the data directory. Tables already there are left alone unless overwrite is set
+    written = []
+    for path in transient_logs(transient_type, directory):
+        table_path = load_point_table_path(path)
+        if overwrite or not os.path.exists(table_path):
+            # Ten significant digits, like the tables made by hand, which also hides the last bits of rounding the
+            # running sums leave behind
+            extract_load_points(path, transient_type).to_csv(table_path, index=False, float_format="%.10g")
+            written.append(table_path)
+    return written
+
+
+def policy_log_path(transient_type, policy):
+    return r"./data/" + transient_type + "Comparison_2SecondTransient_with_Policy" + str(policy) + ".csv"
+
+
+def logged_policies(transient_type, directory=r"./data/"):
+    # Every policy with a transient log, whether or not its load point table has been derived yet
+    prefix = transient_type + "Comparison_2SecondTransient_with_Policy"
+    return sorted(int(os.path.basename(path)[len(prefix):-len(".csv")])
+                  for path in transient_logs(transient_type, directory) if os.path.basename(path).startswith(prefix))
+
+
+# Policy evaluations keyed by transient type, logs and percent complete points, stored with the modification times of
+# the logs and steady states they were worked out from
+_policy_evaluation_cache = {}
+
+
+def evaluate_policies(transient_type, policies, percent_complete=load_point_percent_complete):
+    # Every load point metric of every policy at each percent complete point, as policies x metrics x percent complete
+    # in the units the figures report in, with the brake specific metrics per kWh. Each log is read once for all of the
+    # metrics and every policy is sampled in the same pass, so the five policy figures and the ranking share one
+    # evaluation instead of each reading the logs again
+    paths = [os.path.normpath(policy_log_path(transient_type, policy)) for policy in policies]
+    inputs = paths + [os.path.normpath(r"./data/" + transient_type + "Comparison_SteadyStates.csv")]
+    modified_times = [os.path.getmtime(path) for path in inputs]
+    key = (transient_type, tuple(paths), tuple(percent_complete))
+    inputs_read.update(inputs)
+
+    cached = _policy_evaluation_cache.get(key)
+    if cached is not None and cached[0] == modified_times:
+        return cached[1]
+
+    columns = list(load_point_columns.values())
+    runs = [load_run(path, columns=['TimeToEvent'] + columns).frame(['TimeToEvent'] + columns)
+            for path in paths]
+    completion_times = [transient_completion_time(path, transient_type) for path in paths]
+    samples = sample_percent_complete(runs, columns, completion_times,
+                                      np.asarray(percent_complete, dtype=float) / 100)
+
+    # Every caller gets the same array, so none of them may change it
+    samples.setflags(write=False)
+    _policy_evaluation_cache[key] = (modified_times, samples)
+    return samples
+
+
+def _policy_values(transient_type, policies):
+    # The policies' samples and the steady states at the same loads, with the brake specific metrics per kWh
+    steady_state_data = load_run(r"./data/" + transient_type + "Comparison_SteadyStates.csv",
+                                 columns=load_point_metrics).frame(load_point_metrics)
+    return evaluate_policies(transient_type, policies), steady_state_data.to_numpy(dtype=float).T
+
+
+def _policy_scores(values, steady_states, rank_by):
+    # The geometric mean over the ranked metrics and load points of each value over the steady state value at the same
+    # load. One is as good as running at steady state, every metric counts the same however large its units, and a
+    # PM spike fifty times steady state does not drown out everything else the way it would in an arithmetic mean
+    for metric in rank_by:
+        if metric not in brake_specific_metrics:
+            raise ValueError("Policies are only ranked on brake specific metrics, where lower is better, not " + metric)
+    rows = [load_point_metrics.index(metric) for metric in rank_by]
+    return np.exp(np.log(values[:, rows] / steady_states[rows]).mean(axis=(1, 2)))
+
+
+def rank_policies(transient_type, policies, rank_by=brake_specific_metrics):
+    # The policies best first, with their scores
+    values, steady_states = _policy_values(transient_type, policies)
+    scores = _policy_scores(values, steady_states, rank_by)
+    order = np.argsort(scores, kind="stable")
+    return [policies[idx] for idx in order], scores[order]
+
+
+def summarize_policies(transient_type, policies, rank_by=brake_specific_metrics):
+    # Every policy, metric and percent complete point as one tidy table, best policy first. The columns follow
+    # summarize_load_points, with the rank and score the policies are ordered by and the ratio to steady state the
+    # score averages
+    values, steady_states = _policy_values(transient_type, policies)
+    scores = _policy_scores(values, steady_states, rank_by)
+    order = np.argsort(scores, kind="stable")
+    values = values[order]
+
+    policy_count, metric_count, point_count = values.shape
+    steady_state_means = steady_states.mean(axis=1)
+    return pd.DataFrame({
+        "transient_type": transient_type,
+        "policy": np.repeat(np.asarray(policies)[order], metric_count * point_count),
+        "rank": np.repeat(np.arange(1, policy_count + 1), metric_count * point_count),
+        "score": np.repeat(scores[order], metric_count * point_count),
+        "metric": np.tile(np.repeat(load_point_metrics, point_count), policy_count),
+        "percent_complete": np.tile(load_point_percent_complete, policy_count * metric_count),
+        "value": values.ravel(),
+        "steady_state": np.tile(steady_states.ravel(), policy_count),
+        "delta": (values - steady_states).ravel(),
+        "ratio": (values / steady_states).ravel(),
+        "policy_mean": np.repeat(values.mean(axis=2).ravel(), point_count),
+        "steady_state_mean": np.tile(np.repeat(steady_state_means, point_count), policy_count),
+        "mean_delta": np.repeat((values.mean(axis=2) - steady_state_means).ravel(), point_count)})
+
+
+# What a policy trades off, fuel against NO and PM, lower being better for each. Over the transient they come to the
+# brake specific values, each mass over the work, and the masses themselves. Both are the cycle totals of
+# integrate_runs
+pareto_objectives = {"average": list(cycle_brake_specific),
+                     "cumulative": list(cycle_brake_specific.values())}
+
+
+def policy_objectives(transient_type, policies, measure="average"):
+    # policies x objectives, in the order of pareto_objectives[measure]
+    if measure not in pareto_objectives:
+        raise ValueError("Objectives are either the average or the cumulative values over the transient, not " +
+                         str(measure))
+
+    totals, _ = integrate_runs([policy_log_path(transient_type, policy) for policy in policies], transient_type)
+    names = list(cycle_rates)
+    masses = totals[:, [names.index(mass) for mass in cycle_brake_specific.values()]]
+    if measure == "cumulative":
+        return masses
+    work = totals[:, [names.index("Work (kWh)")]]
+    return np.where(work > 0, masses / np.where(work > 0, work, 1.0), np.nan)
+
+
+def pareto_front(objectives):
+    # True for the rows no other row dominates, that is none is at least as low in every column and lower in one, for
+    # two or three columns. This is Kung's skyline: after sorting on the first column, a row is dominated exactly when
+    # an earlier row is at least as low in the other two. The rows kept so far are held in a Fenwick tree over the
+    # ranks of the second column, giving the lowest third column of those at or below each rank, so checking a row and
+    # adding it each take O(log n) and the whole front O(n log n) rather than comparing every pair, which matters with
+    # thousands of policies
+    objectives = np.asarray(objectives, dtype=float)
+    if objectives.ndim != 2 or objectives.shape[1] not in (2, 3):
+        raise ValueError("The Pareto front is found over two or three objectives")
+    if np.isnan(objectives).any():
+        raise ValueError("Objectives cannot be missing")
+    if objectives.shape[1] == 2:
+        objectives = np.column_stack([objectives, np.zeros(len(objectives))])
+
+    # Identical rows do not dominate each other, so each is decided once
+    unique_rows, row_groups = np.unique(objectives, axis=0, return_inverse=True)
+    non_dominated = np.zeros(len(unique_rows), dtype=bool)
+    second_ranks = np.unique(unique_rows[:, 1], return_inverse=True)[1].ravel() + 1
+    lowest_thirds = [math.inf] * (second_ranks.max(initial=0) + 1)
+    # np.unique sorts the rows lexicographically, which is the order the sweep needs
+    for idx, (rank, third) in enumerate(zip(second_ranks.tolist(), unique_rows[:, 2].tolist())):
+        position, lowest = rank, math.inf
+        while position > 0:
+            lowest = min(lowest, lowest_thirds[position])
+            position -= position & -position
+        if lowest <= third:
+            continue
+        non_dominated[idx] = True
+
+        position = rank
+        while position < len(lowest_thirds):
+            lowest_thirds[position] = min(lowest_thirds[position], third)
+            position += position & -position
+    return non_dominated[row_groups.ravel()]
+
+
+def pareto_ranks(objectives):
+    # Which front each row is on: 1 for the Pareto front, 2 for the front of what is left without it, and so on. Rows
+    # missing an objective, like a policy that did no work, cannot be compared with the others and come after the
+    # last front
+    objectives = np.asarray(objectives, dtype=float)
+    ranks = np.zeros(len(objectives), dtype=int)
+    remaining = np.flatnonzero(~np.isnan(objectives).any(axis=1))
+    front = 0
+    while len(remaining):
+        front += 1
+        on_front = pareto_front(objectives[remaining])
+        ranks[remaining[on_front]] = front
+        remaining = remaining[~on_front]
+    ranks[ranks == 0] = front + 1
+    return ranks
+
+
+def rank_pareto_policies(transient_type, policies, measure="average"):
+    # One row per policy, front by front. Within a front no policy is better at everything than another, so they are
+    # ordered by the geometric mean of each objective over the best any policy reaches, the same kind of score
+    # rank_policies uses against steady state
+    objectives = policy_objectives(transient_type, policies, measure)
+    fronts = pareto_ranks(objectives)
+    with warnings.catch_warnings():
+        # Policies missing an objective score NaN and are left where their front puts them, last
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        scores = np.exp(np.log(objectives / np.nanmin(objectives, axis=0)).mean(axis=1))
+    order = np.lexsort((scores, fronts))
+
+    table = pd.DataFrame({"transient_type": transient_type,
+                          "policy": np.asarray(policies)[order],
+                          "rank": np.arange(1, len(policies) + 1),
+                          "front": fronts[order],
+                          "score": scores[order]})
+    for idx, name in enumerate(pareto_objectives[measure]):
+        table[name] = objectives[order, idx]
+    return table
+
+
+def integrate_runs(paths, transient_type, rates=None):
+    # The integral of each rate over the transient (from the event to its completion time) and over the whole log of
+    # every run, as two arrays of runs x rates. The runs are laid end to end so the trapezoids and the running sum
+    # over all of them are each one vectorized operation, with the interval between one run and the next left out
+    if rates is None:
+        rates = cycle_rates
+    columns = _rate_columns(rates)
+
+    times, values, bounds = [], [], [0]
+    interval_rows = np.empty((len(paths), 2), dtype=int)
+    for idx, path in enumerate(paths):
+        data = load_run(path, columns=['TimeToEvent'] + columns).frame(['TimeToEvent'] + columns)
+        data = data[~data['TimeToEvent'].isna()]
+        run_times = data['TimeToEvent'].to_numpy(dtype=float)
+        interval_rows[idx] = bounds[-1] + np.searchsorted(run_times, [0.0, transient_completion_time(path,
+                                                                                                    transient_type)])
+        times.append(run_times)
+        values.append(_rate_values(data, rates))
+        bounds.append(bounds[-1] + len(run_times))
+
+    times = np.concatenate(times)
+    values = np.concatenate(values)
+    increments = _trapezoid_increments(times[1:], values[1:], times[0], values[0])
+    increments[np.asarray(bounds[1:-1], dtype=int) - 1] = 0.0
+    cumulative = _running_sums(np.zeros(len(rates)), increments)
+
+    starts, ends = np.asarray(bounds[:-1]), np.asarray(bounds[1:]) - 1
+    return (cumulative[interval_rows[:, 1]] - cumulative[interval_rows[:, 0]],
+            cumulative[ends] - cumulative[starts])
+
+
+def summarize_cycle_totals(transient_type, transient_times=(2, 4, 6, 8, 10), policies=()):
+    # The fuel, NO, PM and work of each run over its transient and over its whole log, and the brake specific values
+    # they come to. Unlike averaging the logged brake specific columns, which swing to thousands near zero power, these
+    # weight every moment by the work done in it
+    runs = transient_runs(transient_type, transient_times, policies)
+    intervals = integrate_runs(list(runs.values()), transient_type)
+
+    tables = []
+    for interval, totals in zip(["transient", "log"], intervals):
+        table = pd.DataFrame({"transient_type": transient_type, "run": list(runs), "interval": interval})
+        for idx, name in enumerate(cycle_rates):
+            table[name] = totals[:, idx]
+        work = table["Work (kWh)"].to_numpy()
+        for name, mass in cycle_brake_specific.items():
+            table[name] = np.where(work > 0, table[mass].to_numpy() / np.where(work > 0, work, 1.0), np.nan)
+        tables.append(table)
+    return pd.concat(tables, ignore_index=True)
+
+
+class SteadyStateMap:
+    # The steady state points of a comparison as a map over speed and torque, looked up for every metric at once. The
+    # points of each comparison lie along the path of its transient, so the map interpolates along that path and a
+    # sample is compared with the nearest point on it, as long as it is within tolerance of the path. Distances are in
+    # shares of the map's extent along each axis (its mean where it has none, so 5% of 1200 rpm for the Load map).
+    # Anywhere further away, like idle or motoring, there is no steady state to compare with and the map gives NaN.
+    # Points that do cover an area are interpolated linearly over their triangulation instead
+    def __init__(self, speeds, torques, values, metrics, tolerance=0.05):
+        points = np.column_stack([speeds, torques]).astype(float)
+        values = np.asarray(values, dtype=float)
+        if len(points) < 2:
+            raise ValueError("A steady state map needs at least two points")
+        self.metrics = list(metrics)
+        self.tolerance = tolerance
+
+        spans = np.ptp(points, axis=0)
+        self._scale = np.where(spans > 0, spans, np.abs(points.mean(axis=0)))
+        self._scale[self._scale == 0] = 1.0
+        normalized = points / self._scale
+        self._origin = normalized.mean(axis=0)
+        _, singular_values, directions = np.linalg.svd(normalized - self._origin, full_matrices=False)
+        self._direction = directions[0]
+
+        if len(points) > 2 and singular_values[1] > 1e-9 * singular_values[0]:
+            triangulation = mtri.Triangulation(normalized[:, 0], normalized[:, 1])
+            self._interpolators = [mtri.LinearTriInterpolator(triangulation, column) for column in values.T]
+        else:
+            self._interpolators = None
+            positions = (normalized - self._origin) @ self._direction
+            order = np.argsort(positions, kind="stable")
+            self._positions = positions[order]
+            self._values = values[order].T
+
+    def __call__(self, speed, torque):
+        # metrics x the shape of speed and torque
+        speed, torque = np.broadcast_arrays(np.asarray(speed, dtype=float), np.asarray(torque, dtype=float))
+        normalized = np.column_stack([speed.ravel(), torque.ravel()]) / self._scale
+
+        if self._interpolators is not None:
+            result = np.stack([np.ma.filled(interpolator(normalized[:, 0], normalized[:, 1]).astype(float), np.nan)
+                               for interpolator in self._interpolators])
+        else:
+            centred = normalized - self._origin
+            positions = centred @ self._direction
+            distances = np.abs(centred @ np.array([-self._direction[1], self._direction[0]]))
+
+            hi = np.clip(np.searchsorted(self._positions, positions), 1, len(self._positions) - 1)
+            lo = hi - 1
+            widths = self._positions[hi] - self._positions[lo]
+            weights = np.clip((positions - self._positions[lo]) / np.where(widths > 0, widths, 1.0), 0.0, 1.0)
+            result = self._values[:, lo] + weights * (self._values[:, hi] - self._values[:, lo])
+            result[:, (distances > self.tolerance) | (positions < self._positions[0] - self.tolerance) |
+                   (positions > self._positions[-1] + self.tolerance)] = np.nan
+        return result.reshape((len(self.metrics),) + speed.shape)
+
+
+# Steady state maps keyed by path and metrics, stored with the modification time they were built at
+_steady_state_map_cache = {}
+
+
+def steady_state_map(transient_type, metrics=load_point_metrics):
+    # The map of a comparison's steady states over speed in rpm and torque in Nm, in the units the figures report in,
+    # built once for as long as the file is unchanged
+    path = os.path.normpath(r"./data/" + transient_type + "Comparison_SteadyStates.csv")
+    modified_time = os.path.getmtime(path)
+    key = (path, tuple(metrics))
+    inputs_read.add(path)
+
+    cached = _steady_state_map_cache.get(key)
+    if cached is not None and cached[0] == modified_time:
+        return cached[1]
+
+    data = load_run(path, columns=['Speed', 'Load'] + list(metrics)).frame(['Speed', 'Load'] + list(metrics))
+    steady_states = SteadyStateMap(data['Speed'], data['Load'], data[list(metrics)], metrics)
+    _steady_state_map_cache[key] = (modified_time, steady_states)
+    return steady_states
+
+
+def steady_state_deviation(path, transient_type, metrics=load_point_metrics):
+    # Every recorded sample of a log next to the steady state value at its speed and torque and the difference, in the
+    # units the figures report in. The comparison covers the whole trace rather than five load points, with NaN
+    # wherever the engine is away from the steady states
+    columns = ['TimeToEvent', 'Speed (rpm)', 'Torque (lb-ft)'] + [load_point_columns[metric] for metric in metrics]
+    data = load_run(path, columns=columns).frame(columns)
+    data = data[~data['TimeToEvent'].isna()]
+
+    values = data.iloc[:, 3:].to_numpy(dtype=float).T
+    steady_states = steady_state_map(transient_type, metrics)(data['Speed (rpm)'].to_numpy(dtype=float),
+                                                               data['Torque (Nm)'].to_numpy(dtype=float))
+
+    table = pd.DataFrame({column: data[column].to_numpy() for column in ['TimeToEvent', 'Speed (rpm)', 'Torque (Nm)']})
+    for idx, metric in enumerate(metrics):
+        table[metric] = values[idx]
+        table[metric + " steady state"] = steady_states[idx]
+        table[metric + " delta"] = values[idx] - steady_states[idx]
+    return table
+
+
+def summarize_steady_state_deviation(transient_type, transient_times=(2, 4, 6, 8, 10), policies=(),
+                                     metrics=load_point_metrics):
+    # How far each run strays from steady state over the transient, from the event to its completion: the share of
+    # its samples near enough to the steady states to compare, and the mean, RMS and mean relative difference of those
+    rows = []
+    for run, path in transient_runs(transient_type, transient_times, policies).items():
+        table = steady_state_deviation(path, transient_type, metrics)
+        times = table['TimeToEvent'].to_numpy(dtype=float)
+        during = (times >= 0.0) & (times <= transient_completion_time(path, transient_type))
+        for metric in metrics:
+            deltas = table[metric + " delta"].to_numpy(dtype=float)[during]
+            compared = ~np.isnan(deltas)
+            relative = deltas[compared] / table[metric + " steady state"].to_numpy(dtype=float)[during][compared]
+            rows.append({"transient_type": transient_type, "run": run, "metric": metric,
+                         "samples": int(during.sum()), "compared": float(compared.mean()) if len(compared) else 0.0,
+                         "mean_delta": float(np.mean(deltas[compared])) if compared.any() else np.nan,
+                         "rms_delta": float(np.sqrt(np.mean(deltas[compared] ** 2))) if compared.any() else np.nan,
+                         "mean_relative_delta": float(np.mean(relative)) if compared.any() else np.nan})
+    return pd.DataFrame(rows)
+
+
+def resample_runs(runs, signals, sample_times):
+    # Every signal of every run linearly interpolated at the sample times, as runs x signals x samples, NaN wherever a
+    # run was not recording. sample_times is either one grid shared by all the runs or one row of times per run. The
+    # runs are laid end to end on one time axis, each shifted clear of the one before, so a single searchsorted finds
+    # the bracketing rows of every sample of every run and the interpolation is one array operation
+    times, values, bounds = [], [], [0]
+    for run in runs:
+        run_times = np.asarray(run['TimeToEvent'], dtype=float)
+        recorded = ~np.isnan(run_times)
+        times.append(run_times[recorded])
+        values.append(np.stack([np.asarray(run[signal], dtype=float)[recorded] for signal in signals]))
+        bounds.append(bounds[-1] + recorded.sum())
+
+    sample_times = np.broadcast_to(np.asarray(sample_times, dtype=float), (len(runs), np.shape(sample_times)[-1]))
+    starts = np.array([run_times[0] for run_times in times])
+    ends = np.array([run_times[-1] for run_times in times])
+    shifts = np.concatenate([[0.0], np.cumsum(ends - starts + 1.0)[:-1]]) - starts
+    times, values = np.concatenate(times), np.concatenate(values, axis=1)
+    first, last = np.asarray(bounds[:-1])[:, np.newaxis], np.asarray(bounds[1:])[:, np.newaxis] - 1
+
+    # The rows are only located on the shifted axis. The weights come from the recorded times themselves
+    hi = np.clip(np.searchsorted(times + np.repeat(shifts, np.diff(bounds)), sample_times + shifts[:, np.newaxis]),
+                 first + 1, last)
+    lo = hi - 1
+    weights = (sample_times - times[lo]) / (times[hi] - times[lo])
+    samples = values[:, lo] + weights * (values[:, hi] - values[:, lo])
+
+    outside = (sample_times < starts[:, np.newaxis]) | (sample_times > ends[:, np.newaxis])
+    samples[:, outside] = np.nan
+    return samples.transpose(1, 0, 2)
+
+
+def resample_to_time(runs, signals, start, end, step):
+    # The runs on a shared uniform grid of time from the event, in seconds
+    grid = start + step * np.arange(int(np.floor((end - start) / step + 1e-9)) + 1)
+    return grid, resample_runs(runs, signals, grid)
+
+
+def resample_to_progress(runs, signals, completion_times, samples=101):
+    # The runs on a shared grid of 0 to 100% of their own completion times, so transients of different lengths line up
+    # from event to completion
+    grid = np.linspace(0.0, 100.0, samples)
+    return grid, resample_runs(runs, signals, np.asarray(completion_times, dtype=float)[:, np.newaxis] * grid / 100)
+
+
+def ensemble_statistics(samples):
+    # The mean, standard deviation, minimum and maximum over the runs of resampled signals, as signals x samples each,
+    # ignoring the runs that were not recording. Differences from a baseline run are samples - samples[idx]
+    with warnings.catch_warnings():
+        # Samples no run covers stay NaN without a warning about it
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        return {"mean": np.nanmean(samples, axis=0), "std": np.nanstd(samples, axis=0),
+                "min": np.nanmin(samples, axis=0), "max": np.nanmax(samples, axis=0)}
+
+
+def write_table(table, path=None):
+    # JSON when the file name asks for it, CSV otherwise, and CSV on stdout without a file
+    if path is None:
+        table.to_csv(sys.stdout, index=False)
+    elif path.endswith(".json"):
+        table.to_json(path, orient="records", indent=1, double_precision=15)
+    else:
+        table.to_csv(path, index=False)
+
+
+if __name__ == '__main__':
+    # Stop quietly when the output is piped into something like head that closes it early, the way other command
+    # line tools do, instead of ending on a BrokenPipeError
+    if hasattr(signal, "SIGPIPE"):
+        signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+    parser = argparse.ArgumentParser(description="Works with the transient data without drawing any figures")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    summary_parser = commands.add_parser("summary", help="tabulate the load point statistics of every run")
+    summary_parser.add_argument("--transient-type", default="Load",
+                                help="the transient whose load point tables are summarized (default: Load)")
+    summary_parser.add_argument("--transient-times", type=int, nargs="*", default=[2, 4, 6, 8, 10],
+                                help="baseline control transient times in seconds (default: 2 4 6 8 10)")
+    summary_parser.add_argument("--policies", type=int, nargs="*", default=None,
+                                help="policies to include (default: every policy with a load point table)")
+    summary_parser.add_argument("--output", help="write the table to this .csv or .json file instead of stdout")
+
+    stream_parser = commands.add_parser("stream", help="compute the statistics of a transient log chunk by chunk")
+    stream_parser.add_argument("path", help="the transient log to read")
+    stream_parser.add_argument("--transient-type", default="Load", help="Load, Speed or SpeedLoad (default: Load)")
+    stream_parser.add_argument("--chunk-rows", type=int, default=100000,
+                               help="rows read at a time, which bounds the memory used (default: 100000)")
+    stream_parser.add_argument("--output", help="write the statistics to this JSON file instead of stdout")
+
+    policies_parser = commands.add_parser("policies", help="rank the policies and tabulate every metric of each")
+    policies_parser.add_argument("--transient-type", default="Load",
+                                 help="the transient whose policy logs are evaluated (default: Load)")
+    policies_parser.add_argument("--policies", type=int, nargs="*", default=None,
+                                 help="policies to include (default: every policy with a transient log)")
+    policies_parser.add_argument("--rank-by", nargs="+", choices=brake_specific_metrics, default=brake_specific_metrics,
+                                 help="metrics the policies are ranked on by their ratio to steady state "
+                                      "(default: BSFC BSPM BSNO)")
+    policies_parser.add_argument("--top", type=int, default=None,
+                                 help="only tabulate this many of the best policies")
+    policies_parser.add_argument("--output", help="write the table to this .csv or .json file instead of stdout")
+
+    pareto_parser = commands.add_parser("pareto", help="rank the policies by the fuel and emissions they trade off")
+    pareto_parser.add_argument("--transient-type", default="Load",
+                               help="the transient whose policy logs are evaluated (default: Load)")
+    pareto_parser.add_argument("--policies", type=int, nargs="*", default=None,
+                               help="policies to include (default: every policy with a transient log)")
+    pareto_parser.add_argument("--measure", choices=list(pareto_objectives), default="average",
+                               help="compare BSFC, BSNO and BSPM over the transient, or the fuel, NO and PM it adds "
+                                    "up to (default: average)")
+    pareto_parser.add_argument("--front-only", action="store_true", help="only list the policies on the Pareto front")
+    pareto_parser.add_argument("--output", help="write the table to this .csv or .json file instead of stdout")
+
+    deviation_parser = commands.add_parser("deviation", help="compare every sample of the runs with the steady states")
+    deviation_parser.add_argument("path", nargs="?",
+                                  help="tabulate every sample of this transient log instead of summarizing the runs")
+    deviation_parser.add_argument("--transient-type", default="Load",
+                                  help="the transient whose steady states are compared with (default: Load)")
+    deviation_parser.add_argument("--transient-times", type=int, nargs="*", default=[2, 4, 6, 8, 10],
+                                  help="baseline control transient times in seconds (default: 2 4 6 8 10)")
+    deviation_parser.add_argument("--policies", type=int, nargs="*", default=None,
+                                  help="policies to include (default: every policy with a load point table)")
+    deviation_parser.add_argument("--output", help="write the table to this .csv or .json file instead of stdout")
+
+    totals_parser = commands.add_parser("totals", help="integrate the fuel, emissions and work of every run")
+    totals_parser.add_argument("--transient-type", default="Load",
+                               help="the transient whose logs are integrated (default: Load)")
+    totals_parser.add_argument("--transient-times", type=int, nargs="*", default=[2, 4, 6, 8, 10],
+                               help="baseline control transient times in seconds (default: 2 4 6 8 10)")
+    totals_parser.add_argument("--policies", type=int, nargs="*", default=None,
+                               help="policies to include (default: every policy with a load point table)")
+    totals_parser.add_argument("--output", help="write the table to this .csv or .json file instead of stdout")
+
+    resample_parser = commands.add_parser("resample", help="put the runs on a common time or progress grid")
+    resample_parser.add_argument("--transient-type", default="Load",
+                                 help="the transient whose logs are resampled (default: Load)")
+    resample_parser.add_argument("--transient-times", type=int, nargs="*", default=[2, 4, 6, 8, 10],
+                                 help="baseline control transient times in seconds (default: 2 4 6 8 10)")
+    resample_parser.add_argument("--policies", type=int, nargs="*", default=None,
+                                 help="policies to include (default: every policy with a load point table)")
+    resample_parser.add_argument("--signals", nargs="+", default=list(load_point_columns.values()),
+                                 help="log columns to resample, converted to the units of the figures (default: the "
+                                      "load point metrics' columns)")
+    resample_parser.add_argument("--grid", choices=["time", "progress"], default="time",
+                                 help="seconds from the event, or percent of each run's completion time "
+                                      "(default: time)")
+    resample_parser.add_argument("--start", type=float, default=-5.0, help="first time of the time grid (default: -5)")
+    resample_parser.add_argument("--end", type=float, default=15.0, help="last time of the time grid (default: 15)")
+    resample_parser.add_argument("--step", type=float, default=0.1,
+                                 help="seconds between the samples of the time grid (default: 0.1)")
+    resample_parser.add_argument("--samples", type=int, default=101,
+                                 help="points from 0 to 100% on the progress grid (default: 101)")
+    resample_parser.add_argument("--output",
+                                 help="write the samples to this .npz file as a runs x signals x samples array, or to "
+                                      "a .csv or .json table, instead of stdout")
+
+    load_points_parser = commands.add_parser("load-points", help="write the missing load point tables from the logs")
+    load_points_parser.add_argument("--transient-type", default="Load",
+                                    help="the transient whose logs are read (default: Load)")
+    load_points_parser.add_argument("--overwrite", action="store_true",
+                                    help="replace the tables that already exist as well")
+    arguments = parser.parse_args()
+
+    if arguments.command == "summary":
+        policies = arguments.policies
+        if policies is None:
+            policies = available_policies(arguments.transient_type)
+        write_table(summarize_load_points(arguments.transient_type, arguments.transient_times, policies),
+                    arguments.output)
+
+    elif arguments.command == "stream":
+        # The emissions analyzers lag the event by about 0.1 s, the same offset the figures sample them with
+        offsets = [0.1 if name in brake_specific_metrics else 0.0 for name in load_point_columns]
+        statistics = stream_transient_statistics(arguments.path, arguments.transient_type,
+                                                 list(load_point_columns.values()), time_offsets=offsets,
+                                                 chunk_rows=arguments.chunk_rows)
+        results = {"path": arguments.path,
+                   "completion_time": float(statistics["completion_time"]),
+                   "load_points": [{"metric": name, "percent_complete": percent,
+                                    "sample": float(statistics["percent_complete_samples"][metric_idx, point_idx]),
+                                    "average": float(statistics["load_point_averages"][metric_idx, point_idx])}
+                                   for metric_idx, name in enumerate(load_point_columns)
+                                   for point_idx, percent in enumerate(load_point_percent_complete)],
+                   "transient_totals": dict(zip(cycle_rates, statistics["transient_totals"].tolist())),
+                   "cumulative_totals": dict(zip(cycle_rates, statistics["cumulative_totals"].tolist()))}
+        if arguments.output:
+            with open(arguments.output, "w") as file:
+                json.dump(results, file, indent=1)
+        else:
+            print(json.dumps(results, indent=1))
+
+    elif arguments.command == "policies":
+        policies = arguments.policies
+        if policies is None:
+            policies = logged_policies(arguments.transient_type)
+        table = summarize_policies(arguments.transient_type, policies, arguments.rank_by)
+        if arguments.top is not None:
+            table = table[table["rank"] <= arguments.top]
+        write_table(table, arguments.output)
+
+    elif arguments.command == "pareto":
+        policies = arguments.policies
+        if policies is None:
+            policies = logged_policies(arguments.transient_type)
+        table = rank_pareto_policies(arguments.transient_type, policies, arguments.measure)
+        if arguments.front_only:
+            table = table[table["front"] == 1]
+        write_table(table, arguments.output)
+
+    elif arguments.command == "deviation":
+        if arguments.path is not None:
+            table = steady_state_deviation(arguments.path, arguments.transient_type)
+        else:
+            policies = arguments.policies
+            if policies is None:
+                policies = available_policies(arguments.transient_type)
+            table = summarize_steady_state_deviation(arguments.transient_type, arguments.transient_times, policies)
+        write_table(table, arguments.output)
+
+    elif arguments.command == "totals":
+        policies = arguments.policies
+        if policies is None:
+            policies = available_policies(arguments.transient_type)
+        write_table(summarize_cycle_totals(arguments.transient_type, arguments.transient_times, policies),
+                    arguments.output)
+
+    elif arguments.command == "resample":
+        policies = arguments.policies
+        if policies is None:
+            policies = available_policies(arguments.transient_type)
+        runs = transient_runs(arguments.transient_type, arguments.transient_times, policies)
+        # The signals come out in the units of the figures, under the names they are kept under
+        signals = [si_conversions.get(signal, (signal, None))[0] for signal in arguments.signals]
+        data = [load_run(path, columns=['TimeToEvent'] + signals).frame(['TimeToEvent'] + signals)
+                for path in runs.values()]
+        if arguments.grid == "time":
+            grid, samples = resample_to_time(data, signals, arguments.start, arguments.end, arguments.step)
+        else:
+            completion_times = [transient_completion_time(path, arguments.transient_type) for path in runs.values()]
+            grid, samples = resample_to_progress(data, signals, completion_times, arguments.samples)
+
+        if arguments.output and arguments.output.endswith(".npz"):
+            np.savez(arguments.output, samples=samples, grid=grid, runs=list(runs), signals=signals)
+        else:
+            write_table(pd.DataFrame({"run": np.repeat(list(runs), len(signals) * len(grid)),
+                                      "signal": np.tile(np.repeat(signals, len(grid)), len(runs)),
+                                      arguments.grid: np.tile(grid, len(runs) * len(signals)),
+                                      "value": samples.ravel()}), arguments.output)
+
+    elif arguments.command == "load-points":
+        for table_path in derive_load_points(arguments.transient_type, overwrite=arguments.overwrite):
+            print(table_path)